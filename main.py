@@ -2,9 +2,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import random
-import time
-import json
+import logging
 
+from src.utils.animations import animate_text, create_gradient as draw_gradient
+from src.utils.frame_clock import AnimationScheduler
+from src.utils.hit_test import hit, make_shape
+from src.utils.layers import CanvasLayers
+from src.utils.log import setup_logging, shutdown_logging
+from src.utils.persistence import WriteBehindStore
+from src.utils.settings import PERSIST
+from src.utils.precision_timer import PrecisionScheduler
+from src.utils.state import StateStore
+from src.utils.timing import ReactionTimer
+
+logger = logging.getLogger("reaction_trainer")
 
 
 class ReactionTrainer:
@@ -26,8 +37,7 @@ class ReactionTrainer:
 
         # Настройки анимации
         self.animation_speed = 10  # мс между кадрами
-        self.animation_steps = 10  # количество кадров
-        self.current_animation = None
+        self.animation_duration = 100  # длительность появления, мс
         
         # Настройки приложения
         self.best_score = 0
@@ -36,12 +46,24 @@ class ReactionTrainer:
         self.difficulty = "medium"
         self.game_active = False
         self.reaction_time = 0
-        self.start_time = 0
+        # Таймер реакции по perf_counter_ns с поправкой на очередь событий
+        self.reaction_timer = ReactionTimer()
+        self.last_timing = None
+        self.stimulus_geometry = None
         self.first_run = True
 
-        # Загрузка лучшего счета
+        # Загрузка лучшего счета; запись идет в фоновом потоке
+        self.store = WriteBehindStore(PERSIST["file"])
         self.load_best_score()
 
+        # Наблюдаемое состояние для подписей меню и игрового поля
+        self.state = StateStore(
+            mode=self.game_mode,
+            difficulty=self.difficulty,
+            best_score=self.best_score,
+            current_score=self.current_score
+        )
+
         # Создание интерфейса
         self.create_menu()
         self.create_game_field()
@@ -56,25 +78,18 @@ class ReactionTrainer:
 
     def load_best_score(self):
         """Загружает лучший счет из файла"""
-        try:
-            with open('best_score.json', 'r') as f:
-                data = json.load(f)
-                self.best_score = data.get('best_score', 0)
-                self.game_mode = data.get('game_mode', "color")
-                self.difficulty = data.get('difficulty', "medium")
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.best_score = 0
-            self.game_mode = "color"
-            self.difficulty = "medium"
+        data = self.store.load()
+        self.best_score = data.get('best_score', 0)
+        self.game_mode = data.get('game_mode', "color")
+        self.difficulty = data.get('difficulty', "medium")
 
     def save_best_score(self):
-        """Сохраняет лучший счет и настройки в файл"""
-        with open('best_score.json', 'w') as f:
-            json.dump({
-                'best_score': self.best_score,
-                'game_mode': self.game_mode,
-                'difficulty': self.difficulty
-            }, f)
+        """Сохраняет лучший счет и настройки (запись в файл отложенная)"""
+        self.store.update(
+            best_score=self.best_score,
+            game_mode=self.game_mode,
+            difficulty=self.difficulty
+        )
 
     def create_menu(self):
         """Создает меню приложения согласно прототипу Рисунок 5"""
@@ -126,26 +141,35 @@ class ReactionTrainer:
         settings_frame = tk.Frame(self.menu_frame, bg=self.colors['bg'])
         settings_frame.pack(pady=20)
 
+        mode_var = tk.StringVar(self.menu_frame)
+        self.state.bind_var("mode", mode_var, lambda mode: f"Режим: {self.get_mode_name()}")
         tk.Label(
             settings_frame,
-            text=f"Режим: {self.get_mode_name()}",
+            textvariable=mode_var,
             font=("Helvetica", 12),
             bg=self.colors['bg'],
             fg=self.colors['text']
         ).pack(side="left", padx=10)
 
+        difficulty_var = tk.StringVar(self.menu_frame)
+        self.state.bind_var(
+            "difficulty", difficulty_var,
+            lambda difficulty: f"Сложность: {self.get_difficulty_name()}"
+        )
         tk.Label(
             settings_frame,
-            text=f"Сложность: {self.get_difficulty_name()}",
+            textvariable=difficulty_var,
             font=("Helvetica", 12),
             bg=self.colors['bg'],
             fg=self.colors['text']
         ).pack(side="right", padx=10)
 
         # Лучший результат
+        menu_best_var = tk.StringVar(self.menu_frame)
+        self.state.bind_var("best_score", menu_best_var, "Лучший результат: {}".format)
         tk.Label(
             self.menu_frame,
-            text=f"Лучший результат: {self.best_score}",
+            textvariable=menu_best_var,
             font=("Helvetica", 16, "bold"),
             bg=self.colors['bg'],
             fg=self.colors['secondary']
@@ -160,9 +184,11 @@ class ReactionTrainer:
         score_panel.pack(fill="x", padx=20, pady=5)
 
         # Лучший счет (элемент 2)
+        best_var = tk.StringVar(score_panel)
+        self.state.bind_var("best_score", best_var, "Лучший: {}".format)
         self.best_score_label = tk.Label(
             score_panel,
-            text=f"Лучший: {self.best_score}",
+            textvariable=best_var,
             font=("Helvetica", 14, "bold"),
             bg=self.colors['bg'],
             fg=self.colors['text']
@@ -170,9 +196,11 @@ class ReactionTrainer:
         self.best_score_label.pack(side="left", padx=10)
 
         # Текущий счет (элемент 3)
+        current_var = tk.StringVar(score_panel)
+        self.state.bind_var("current_score", current_var, "Текущий: {}".format)
         self.current_score_label = tk.Label(
             score_panel,
-            text=f"Текущий: {self.current_score}",
+            textvariable=current_var,
             font=("Helvetica", 14, "bold"),
             bg=self.colors['bg'],
             fg=self.colors['text']
@@ -196,6 +224,25 @@ class ReactionTrainer:
         )
         self.game_canvas.pack(expand=True, fill="both")
         self.game_canvas.bind("<Button-1>", self.reaction_click)
+        self.game_canvas.bind(
+            "<Motion>", lambda e: self.reaction_timer.event_clock.observe(e.time)
+        )
+
+        # Слои холста: фон рисуется один раз и при изменении размеров
+        self.layers = CanvasLayers(self.game_canvas)
+        self.layers.register("background", lambda: self.layers.add(
+            "background",
+            self.create_gradient(self.game_canvas, self.colors['bg'], self.colors['primary'])
+        ))
+        self.game_canvas.bind("<Configure>", self.on_canvas_resize)
+
+        # Все анимации холста продвигаются одним таймером на кадр
+        self.animator = AnimationScheduler(self.game_canvas, self.animation_speed)
+
+        # Точный планировщик задержки перед стимулом
+        self.precision = PrecisionScheduler(self.root)
+        self.precision.calibrate()
+        self.stimulus_id = None
 
         # Кнопка выхода в меню (элемент 4)
         menu_button = tk.Button(
@@ -215,6 +262,11 @@ class ReactionTrainer:
         # Принудительное обновление размеров
         self.game_canvas.update()
 
+    def on_canvas_resize(self, event):
+        """Перерисовывает фон при изменении размеров холста"""
+        self.layers.invalidate("background")
+        self.layers.refresh()
+
     def get_mode_name(self):
         """Возвращает читаемое название режима"""
         names = {
@@ -247,17 +299,12 @@ class ReactionTrainer:
 
     def update_menu_info(self):
         """Обновляет информацию в меню"""
-        # Обновляем информацию о режиме и сложности в меню
-        for widget in self.menu_frame.winfo_children():
-            if isinstance(widget, tk.Frame) and widget.winfo_children():
-                for child in widget.winfo_children():
-                    if isinstance(child, tk.Label):
-                        if "Режим:" in child.cget("text"):
-                            child.config(text=f"Режим: {self.get_mode_name()}")
-                        elif "Сложность:" in child.cget("text"):
-                            child.config(text=f"Сложность: {self.get_difficulty_name()}")
-                        elif "Лучший результат:" in child.cget("text"):
-                            child.config(text=f"Лучший результат: {self.best_score}")
+        # Подписи меню обновятся только для изменившихся значений
+        self.state.update(
+            mode=self.game_mode,
+            difficulty=self.difficulty,
+            best_score=self.best_score
+        )
 
     def show_instructions(self):
         """Показывает инструкцию к игре"""
@@ -460,12 +507,14 @@ class ReactionTrainer:
         self.game_active = True
         
         # Показать сообщение о начале игры
-        self.game_canvas.create_text(
+        self.layers.clear("stimulus", "fx")
+        self.layers.add("fx", self.game_canvas.create_text(
             300, 200,
             text="Приготовьтесь!\nИгра начнется через 2 секунды...",
             font=("Arial", 16),
+            fill=self.colors['text'],
             justify="center"
-        )
+        ))
         self.root.update()
         
         # Задержка перед первым стимулом
@@ -477,12 +526,14 @@ class ReactionTrainer:
         self.game_active = True
         
         # Показать сообщение о продолжении игры
-        self.game_canvas.create_text(
+        self.layers.clear("stimulus", "fx")
+        self.layers.add("fx", self.game_canvas.create_text(
             300, 200,
             text="Приготовьтесь!\nИгра продолжится через 2 секунды...",
             font=("Arial", 16),
+            fill=self.colors['text'],
             justify="center"
-        )
+        ))
         self.root.update()
         
         # Задержка перед следующим стимулом
@@ -491,17 +542,20 @@ class ReactionTrainer:
     def stop_game(self):
         """Останавливает игру"""
         self.game_active = False
-        if hasattr(self, 'stimulus_id'):
-            self.root.after_cancel(self.stimulus_id)
+        self.animator.cancel_all()
+        self.reaction_timer.reset()
+        self.precision.cancel(self.stimulus_id)
+        self.stimulus_id = None
 
     def schedule_stimulus(self):
         """Запланировать появление стимула"""
         if not self.game_active:
             return
 
-        # Очистить холст
-        self.game_canvas.delete("all")
-        self.game_canvas.config(bg="white")
+        # Убрать стимул и результат, фон остается на месте
+        self.animator.cancel_owner("stimulus")
+        self.animator.cancel_owner("fx")
+        self.layers.clear("stimulus", "fx")
 
         # Определить задержку в зависимости от сложности
         if self.difficulty == "easy":
@@ -512,65 +566,46 @@ class ReactionTrainer:
             delay = random.randint(1000, 2000)  # 1-2 секунды
 
         # Запланировать появление стимула
-        self.stimulus_id = self.root.after(delay, self.show_stimulus)
+        self.stimulus_id = self.precision.schedule(delay, self.show_stimulus)
 
     def create_gradient(self, canvas, color1, color2):
         """Создает градиентный фон"""
         try:
-            print(f"Creating gradient with colors {color1} and {color2}")
             width = canvas.winfo_width()
             height = canvas.winfo_height()
-            print(f"Canvas dimensions: {width}x{height}")
+            logger.debug("creating gradient %s -> %s, canvas %dx%d",
+                         color1, color2, width, height)
             
             if width <= 1 or height <= 1:  # Проверка размеров
-                print("Warning: Canvas dimensions too small, waiting for proper initialization")
+                logger.warning("canvas %dx%d too small, forcing update", width, height)
                 self.root.update()  # Принудительное обновление
-                width = canvas.winfo_width()
-                height = canvas.winfo_height()
-                print(f"Updated canvas dimensions: {width}x{height}")
             
-            for i in range(height):
-                # Вычисляем цвет для текущей строки
-                ratio = i / height
-                r1, g1, b1 = [int(color1[i:i+2], 16) for i in (1, 3, 5)]
-                r2, g2, b2 = [int(color2[i:i+2], 16) for i in (1, 3, 5)]
-                r = int(r1 * (1 - ratio) + r2 * ratio)
-                g = int(g1 * (1 - ratio) + g2 * ratio)
-                b = int(b1 * (1 - ratio) + b2 * ratio)
-                color = f'#{r:02x}{g:02x}{b:02x}'
-                canvas.create_line(0, i, width, i, fill=color)
-        except Exception as e:
-            print(f"Error in create_gradient: {e}")
-            import traceback
-            print(traceback.format_exc())
+            # Градиент рисуется одним закэшированным изображением
+            return draw_gradient(canvas, color1, color2)
+        except Exception:
+            logger.exception("create_gradient failed")
 
     def animate_shape(self, shape_id, start_scale=0.1, end_scale=1.0):
         """Анимация появления фигуры"""
         try:
-            print(f"Starting shape animation for ID: {shape_id}")
             if not shape_id:
-                print("No shape ID provided")
+                logger.warning("animate_shape called without a shape id")
                 return
                 
             coords = self.game_canvas.coords(shape_id)
             if not coords:
-                print("No coordinates found for shape")
+                logger.warning("shape %s has no coordinates", shape_id)
                 return
                 
-            print(f"Initial coordinates: {coords}")
             # Находим центр фигуры
             center_x = sum(coords[::2]) / len(coords[::2])
             center_y = sum(coords[1::2]) / len(coords[1::2])
-            print(f"Center point: ({center_x}, {center_y})")
+            logger.debug("animating shape %s from %s, center (%.1f, %.1f)",
+                         shape_id, coords, center_x, center_y)
             
-            def animate_step(step):
+            def animate_step(progress):
                 try:
-                    if not self.game_active:
-                        print("Game not active, stopping animation")
-                        return
-                        
-                    scale = start_scale + (end_scale - start_scale) * (step / self.animation_steps)
-                    print(f"Animation step {step}, scale: {scale}")
+                    scale = start_scale + (end_scale - start_scale) * progress
                     
                     # Масштабируем координаты относительно центра
                     new_coords = []
@@ -580,29 +615,22 @@ class ReactionTrainer:
                         new_coords.extend([x, y])
                         
                     self.game_canvas.coords(shape_id, *new_coords)
-                    print(f"New coordinates: {new_coords}")
-                    
-                    if step < self.animation_steps:
-                        self.current_animation = self.root.after(
-                            self.animation_speed,
-                            lambda: animate_step(step + 1)
-                        )
-                except Exception as e:
-                    print(f"Error in animation step: {e}")
-                    import traceback
-                    print(traceback.format_exc())
+                    # Вызывается каждый кадр: без отладки обходимся одной проверкой
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("animation progress=%.3f scale=%.3f coords=%s",
+                                     progress, scale, new_coords)
+                except Exception:
+                    logger.exception("animation step failed")
             
-            animate_step(0)
+            self.animator.add(animate_step, self.animation_duration, owner="stimulus")
             
-        except Exception as e:
-            print(f"Error in animate_shape: {e}")
-            import traceback
-            print(traceback.format_exc())
+        except Exception:
+            logger.exception("animate_shape failed")
 
     def create_flash_effect(self, x, y):
         """Создает эффект вспышки при клике"""
         try:
-            print("Creating flash effect")
+            logger.debug("flash effect at (%d, %d)", x, y)
             # Создаем несколько концентрических кругов для эффекта вспышки
             rings = []
             max_radius = 50
@@ -617,59 +645,52 @@ class ReactionTrainer:
                     outline="",
                     width=2
                 )
+                self.layers.add("fx", ring)
                 rings.append(ring)
             
-            def fade_step(step, rings):
-                if step >= 10 or not rings:
-                    for ring in rings:
-                        self.game_canvas.delete(ring)
-                    return
-                
+            def fade_step(progress):
                 # Изменяем размер колец
                 for i, ring in enumerate(rings):
-                    radius = max_radius * (1 - i/num_rings) * (1 + step/10)
+                    radius = max_radius * (1 - i/num_rings) * (1 + progress)
                     self.game_canvas.coords(
                         ring,
                         x - radius, y - radius,
                         x + radius, y + radius
                     )
-                
-                self.root.after(20, lambda: fade_step(step + 1, rings))
             
-            fade_step(0, rings)
-            print("Flash effect created")
+            def remove_rings():
+                for ring in rings:
+                    self.game_canvas.delete(ring)
+            
+            self.animator.add(fade_step, 200, owner="fx", on_complete=remove_rings)
             
-        except Exception as e:
-            print(f"Error in create_flash_effect: {e}")
-            import traceback
-            print(traceback.format_exc())
+        except Exception:
+            logger.exception("create_flash_effect failed")
 
     def show_stimulus(self):
         """Показывает стимул в зависимости от режима"""
         try:
             if not self.game_active:
-                print("Game not active, skipping stimulus")
+                logger.debug("game not active, skipping stimulus")
                 return
 
-            print("Showing stimulus")
-            # Очистить холст и создать градиентный фон
-            self.game_canvas.delete("all")
-            print("Canvas cleared")
+            # Очистить только слои стимула и эффектов
+            self.animator.cancel_owner("stimulus")
+            self.animator.cancel_owner("fx")
+            self.layers.clear("stimulus", "fx")
             
             # Получить размеры холста
             canvas_width = self.game_canvas.winfo_width()
             canvas_height = self.game_canvas.winfo_height()
-            print(f"Canvas size: {canvas_width}x{canvas_height}")
             
             if canvas_width <= 1 or canvas_height <= 1:
-                print("Canvas not properly initialized, forcing update")
+                logger.warning("canvas %dx%d not initialized, forcing update",
+                               canvas_width, canvas_height)
                 self.root.update()
                 canvas_width = self.game_canvas.winfo_width()
                 canvas_height = self.game_canvas.winfo_height()
-                print(f"Updated canvas size: {canvas_width}x{canvas_height}")
 
-            self.create_gradient(self.game_canvas, self.colors['bg'], self.colors['primary'])
-            print("Gradient created")
+            self.layers.refresh()
 
             # Размеры фигур
             shape_size = 100
@@ -677,12 +698,14 @@ class ReactionTrainer:
             # Случайные координаты
             x = random.randint(shape_size, canvas_width - shape_size)
             y = random.randint(shape_size, canvas_height - shape_size)
-            print(f"Shape position: ({x}, {y})")
 
             # Показать стимул в зависимости от режима
             shape_id = None
+            box = [
+                x - shape_size//2, y - shape_size//2,
+                x + shape_size//2, y + shape_size//2
+            ]
             if self.game_mode == "color":
-                print("Creating color stimulus (rectangle)")
                 shape_id = self.game_canvas.create_rectangle(
                     x - shape_size//2, y - shape_size//2,
                     x + shape_size//2, y + shape_size//2,
@@ -690,8 +713,8 @@ class ReactionTrainer:
                     outline="",
                     tags="stimulus"
                 )
+                self.stimulus_geometry = make_shape("rectangle", box)
             elif self.game_mode == "shape":
-                print("Creating shape stimulus (oval)")
                 shape_id = self.game_canvas.create_oval(
                     x - shape_size//2, y - shape_size//2,
                     x + shape_size//2, y + shape_size//2,
@@ -699,8 +722,8 @@ class ReactionTrainer:
                     outline="",
                     tags="stimulus"
                 )
+                self.stimulus_geometry = make_shape("oval", box)
             else:  # sound
-                print("Creating sound stimulus (triangle)")
                 points = [
                     x, y - shape_size//2,
                     x - shape_size//2, y + shape_size//2,
@@ -712,35 +735,35 @@ class ReactionTrainer:
                     outline="",
                     tags="stimulus"
                 )
+                self.stimulus_geometry = make_shape("polygon", points)
                 self.root.bell()
 
-            print(f"Shape created with ID: {shape_id}")
+            self.layers.add("stimulus", shape_id)
+            logger.debug("stimulus shown mode=%s id=%s x=%d y=%d canvas=%dx%d",
+                         self.game_mode, shape_id, x, y, canvas_width, canvas_height)
             # Анимация появления
             self.animate_shape(shape_id)
-            print("Animation started")
             
             # Запомнить время появления стимула
-            self.start_time = time.time()
-            print("Stimulus display completed")
+            # Время появления отмечается после отрисовки стимула
+            self.reaction_timer.start_after_paint(self.game_canvas)
             
-        except Exception as e:
-            print(f"Error in show_stimulus: {e}")
-            import traceback
-            print(traceback.format_exc())
+        except Exception:
+            logger.exception("show_stimulus failed")
 
     def reaction_click(self, event):
         """Обработчик клика по игровому полю"""
-        if not self.game_active or self.start_time == 0:
+        if not self.game_active or not self.reaction_timer.running:
             return
 
-        # Проверить, кликнул ли пользователь по стимулу
-        clicked_items = self.game_canvas.find_withtag("current")
-        if clicked_items and "stimulus" in self.game_canvas.gettags(clicked_items[0]):
+        # Проверить попадание по геометрии стимула без обращений к Tk
+        if hit(self.stimulus_geometry, event.x, event.y):
             # Создать эффект вспышки
             self.create_flash_effect(event.x, event.y)
             
-            # Рассчитать время реакции
-            reaction_time = (time.time() - self.start_time) * 1000
+            # Рассчитать время реакции по моменту клика, а не обработки
+            self.last_timing = self.reaction_timer.stop(event.time)
+            reaction_time = self.last_timing.corrected_ms
             self.reaction_time = reaction_time
 
             # Начислить очки
@@ -763,16 +786,15 @@ class ReactionTrainer:
             # Показать результат с анимацией
             self.show_result_animation(reaction_time, points)
 
-            # Сбросить время начала
-            self.start_time = 0
+            # Сбросить стимул
+            self.stimulus_geometry = None
 
             # Запланировать следующий стимул
             self.root.after(1000, self.schedule_stimulus)
 
     def show_result_animation(self, reaction_time, points):
         """Показывает анимированный результат"""
-        self.game_canvas.delete("all")
-        self.create_gradient(self.game_canvas, self.colors['bg'], self.colors['primary'])
+        self.layers.clear("stimulus", "fx")
 
         # Создаем текст с результатом
         result_text = self.game_canvas.create_text(
@@ -783,33 +805,18 @@ class ReactionTrainer:
             justify="center",
             tags="result"
         )
+        self.layers.add("fx", result_text)
 
         # Анимация появления текста
-        self.game_canvas.scale(result_text, 300, 200, 0.1, 0.1)
-        
-        def animate_text(step):
-            if step <= 10:
-                scale = 0.1 + (1 - 0.1) * (step / 10)
-                self.game_canvas.scale(result_text, 300, 200, scale, scale)
-                self.root.after(20, lambda: animate_text(step + 1))
-        
-        animate_text(0)
+        self.animator.cancel_owner("fx")
+        animate_text(self.animator, result_text, 300, 200, owner="fx")
 
     def update_score_labels(self):
         """Обновляет метки с очками во всех окнах"""
-        self.current_score_label.config(text=f"Текущий: {self.current_score}")
-        self.best_score_label.config(text=f"Лучший: {self.best_score}")
-
-        # Обновить в меню, если оно существует
-        if hasattr(self, 'menu_frame'):
-            for widget in self.menu_frame.winfo_children():
-                if isinstance(widget, tk.Label):  # Check if widget is a Label
-                    try:
-                        widget_text = widget.cget("text")
-                        if isinstance(widget_text, str) and "Лучший результат:" in widget_text:
-                            widget.config(text=f"Лучший результат: {self.best_score}")
-                    except tk.TclError:
-                        continue  # Skip widgets that don't support text property
+        self.state.update(
+            current_score=self.current_score,
+            best_score=self.best_score
+        )
 
     def on_button_hover(self, button, entering):
         """Эффект при наведении на кнопку"""
@@ -826,31 +833,29 @@ class ReactionTrainer:
 
 
 if __name__ == "__main__":
+    setup_logging()
     try:
-        print("Creating main window...")
+        logger.info("creating main window")
         root = tk.Tk()
         root.withdraw()  # Hide window initially
-        print("Window created, configuring...")
         
         # Configure window
         root.title("Тренировка реакции")
         root.geometry("1000x800")
         root.resizable(False, False)
         
-        print("Creating application...")
+        logger.info("creating application")
         app = ReactionTrainer(root)
         
-        print("Showing window...")
         root.deiconify()  # Show window
         root.lift()  # Bring to front
         root.focus_force()  # Force focus
         
-        print("Starting main loop...")
+        logger.info("starting main loop")
         root.mainloop()
-        print("Main loop ended.")
-    except Exception as e:
-        import traceback
-        print(f"Error occurred: {e}")
-        print("Full traceback:")
-        print(traceback.format_exc())
-        input("Press Enter to exit...")
\ No newline at end of file
+        app.store.close()
+        logger.info("main loop ended")
+    except Exception:
+        logger.exception("application failed")
+        shutdown_logging()
+        input("Press Enter to exit...")
@@ -7,4 +7,8 @@ setup(
     install_requires=[
         'tkinter',
     ],
+    extras_require={
+        # Аналитика истории и ускорение цветовых переходов
+        'analytics': ['numpy'],
+    },
 ) 
\ No newline at end of file
@@ -2,27 +2,56 @@
 Модуль с игровым полем
 """
 import tkinter as tk
-import random
 import time
+from collections import deque
 from typing import Callable, Dict, List, Optional, Tuple
 from src.utils.colors import COLORS
+from src.components.hud import ScoreHud
+from src.components.multi_target import MultiTargetMode
+from src.components.perf_overlay import PerfOverlay
 from src.utils.animations import (
-    create_gradient, animate_shape,
-    create_flash_effect, animate_text
+    create_gradient, animate_shape, create_flash_effect
 )
-from src.utils.settings import GAME, WINDOW, LOCALIZATION
+from src.utils.engine import (
+    GameEngine, ScoreChanged, StimulusShown, TrialCompleted, calculate_points
+)
+from src.utils.frame_clock import AnimationScheduler
+from src.utils.lag_monitor import LagMonitor
+from src.utils.layers import CanvasLayers
+from src.utils.pool import CanvasItemPool
+from src.utils.precision_timer import PrecisionScheduler
+from src.utils.settings import GAME, MULTI_TARGET, WINDOW, LOCALIZATION
+from src.utils.state import StateStore
+from src.utils.stats import StatsBook
+from src.utils.timing import ReactionTimer, TrialTiming
+from src.utils.tracing import traced
+from src.utils.trial_store import TrialRecord, TrialSink
 
 
 class GameField:
-    def __init__(self, parent: tk.Tk, on_menu: Callable):
+    def __init__(self, parent: tk.Tk, on_menu: Callable, state: StateStore,
+                 lag_monitor: Optional[LagMonitor] = None,
+                 trial_sink: Optional[TrialSink] = None,
+                 stats: Optional[StatsBook] = None):
         """
         Инициализация игрового поля
         
         :param parent: Родительское окно
         :param on_menu: Функция для возврата в меню
+        :param state: Хранилище состояния игры
+        :param lag_monitor: Монитор задержек для пометки попыток
+        :param trial_sink: Хранилище истории попыток
+        :param stats: Потоковая статистика времени реакции
         """
         self.parent = parent
         self.on_menu = on_menu
+        self.state = state
+        self.lag_monitor = lag_monitor
+        self.trial_sink = trial_sink
+        self.stats = stats
+        # Идентификаторы игровой сессии и профиля для истории попыток
+        self.session_id = ""
+        self.profile_id = 0
         
         # Создание фрейма и канваса
         self.frame = tk.Frame(parent)
@@ -35,6 +64,41 @@ class GameField:
         )
         self.canvas.pack(expand=True, fill="both")
         
+        # Слои канваса: фон, стимул, эффекты, счет
+        self.layers = CanvasLayers(self.canvas)
+        self.layers.register("background", self._draw_background)
+        
+        # Пулы переиспользуемых элементов для стимулов и вспышек
+        self.shape_pool = CanvasItemPool(self.canvas, self.layers, "stimulus")
+        self.fx_pool = CanvasItemPool(self.canvas, self.layers, "fx")
+        
+        # Общий планировщик всех анимаций поля
+        self.animator = AnimationScheduler(self.canvas)
+        
+        # Индикатор счета
+        self.hud = ScoreHud(self.canvas, self.layers, self.animator, state)
+        
+        # Таймер реакции с поправкой на задержку очереди событий
+        self.timer = ReactionTimer()
+        self.last_timing: Optional[TrialTiming] = None
+        self.trial_timings = deque(maxlen=GAME["timing_history"])
+        
+        # Точный планировщик появления стимулов
+        self.precision = PrecisionScheduler(self.canvas)
+        self.precision.calibrate()
+        
+        # Игровая логика: поле только отрисовывает события движка
+        self.engine = GameEngine(self.timer.now_ns)
+        
+        # Режим множества мишеней
+        self.multi = MultiTargetMode(self.canvas, self.layers, self.timer.now_ns)
+        
+        # Оверлей производительности (по F3)
+        self.overlay = PerfOverlay(
+            self.canvas, self.layers, self.animator, lag_monitor,
+            lambda: self.last_timing
+        )
+        
         # Создание кнопки меню
         self.menu_button = tk.Button(
             self.frame,
@@ -48,22 +112,25 @@ class GameField:
         
         # Инициализация переменных
         self.current_shape = None
-        self.current_score = 0
-        self.best_score = 0
-        self.score_text = None
-        self.game_mode = "color"
-        self.difficulty = "medium"
-        self.animation_ids = []
         self.next_spawn_id = None
-        self.spawn_delay = GAME["spawn_delay"]["medium"]
-        self.last_spawn_time = 0
-        self.is_running = False
         
         # Привязка событий
         self.canvas.bind("<Button-1>", self.on_click)
+        # Движения мыши уточняют соответствие часов событий и perf_counter
+        self.canvas.bind("<Motion>", lambda e: self.timer.event_clock.observe(e.time))
         
-        # Создание градиентного фона
-        self.canvas.bind("<Configure>", lambda e: create_gradient(
+        # Перерисовка фона при изменении размеров
+        self.canvas.bind("<Configure>", self._on_resize)
+
+    def _on_resize(self, event: tk.Event) -> None:
+        """Перерисовывает фон при изменении размеров канваса"""
+        self.layers.invalidate("background")
+        self.layers.refresh()
+        self.hud.relayout(event.width)
+
+    def _draw_background(self) -> None:
+        """Рисует градиентный фон"""
+        self.layers.add("background", create_gradient(
             self.canvas, COLORS["gradient1"], COLORS["gradient2"]
         ))
 
@@ -78,199 +145,239 @@ class GameField:
         :param current_score: Текущий счет
         :param best_score: Лучший счет
         """
-        self.game_mode = mode
-        self.difficulty = difficulty
-        self.current_score = current_score
-        self.best_score = best_score
-        self.spawn_delay = GAME["spawn_delay"][difficulty]
-        self.is_running = True
-        
         # Очистка анимаций
         self.cleanup_animations()
         
-        # Обновление счета
-        self.update_score()
-        
-        # Запуск спавна объектов
-        self.spawn_shape()
+        # Запуск движка; в режиме множества мишеней спавном управляет multi
+        events = self.engine.start(mode, difficulty, current_score, best_score)
+        if mode == "multi":
+            self.multi.start(difficulty, *self.field_size(mode))
+        self.apply(events)
+
+    def field_size(self, mode: str) -> Tuple[int, int]:
+        """
+        Размер поля, в координатах которого появляются стимулы режима
+
+        :param mode: Режим игры
+        :return: Ширина и высота, пиксели
+        """
+        if mode != "multi":
+            return self.engine.width, self.engine.height
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        return (
+            width if width > 1 else WINDOW["width"],
+            height if height > 1 else WINDOW["height"]
+        )
 
     def stop_game(self) -> None:
         """Останавливает игру"""
-        self.is_running = False
+        self.engine.stop()
         self.cleanup_animations()
 
+    @traced("game.cleanup_animations")
     def cleanup_animations(self) -> None:
         """Очищает все анимации"""
-        # Отменяем все анимации
-        for anim_id in self.animation_ids:
-            if anim_id:
-                self.canvas.after_cancel(anim_id)
-        self.animation_ids.clear()
+        # Отменяем анимации стимулов и эффектов
+        self.animator.cancel_owner("stimulus")
+        self.animator.cancel_owner("fx")
         
         # Отменяем следующий спавн
         if self.next_spawn_id:
-            self.canvas.after_cancel(self.next_spawn_id)
+            self.precision.cancel(self.next_spawn_id)
             self.next_spawn_id = None
         
-        # Удаляем все объекты с канваса
-        self.canvas.delete("all")
-        
-        # Пересоздаем градиентный фон
-        create_gradient(self.canvas, COLORS["gradient1"], COLORS["gradient2"])
+        # Скрываем стимулы и эффекты, фон и счет остаются на месте
+        self.multi.stop()
+        self.shape_pool.release_all()
+        self.fx_pool.release_all()
+        self.current_shape = None
+        self.timer.reset()
+        self.layers.refresh()
 
-    def spawn_shape(self) -> None:
-        """Создает новую фигуру"""
-        if not self.is_running:
+    @property
+    def game_mode(self) -> str:
+        """Режим игры"""
+        return self.engine.mode
+
+    @property
+    def difficulty(self) -> str:
+        """Уровень сложности"""
+        return self.engine.difficulty
+
+    @property
+    def is_running(self) -> bool:
+        """Идет ли игра"""
+        return self.engine.is_running
+
+    @property
+    def current_score(self) -> int:
+        """Текущий счет"""
+        return self.engine.current_score
+
+    @property
+    def best_score(self) -> int:
+        """Лучший счет"""
+        return self.engine.best_score
+
+    def apply(self, events: List[object]) -> None:
+        """Отрисовывает события движка и планирует его следующий срок"""
+        for event in events:
+            if isinstance(event, StimulusShown):
+                self.show_stimulus(event)
+            elif isinstance(event, TrialCompleted):
+                self.hide_stimulus()
+            elif isinstance(event, ScoreChanged):
+                self.update_score()
+        self._schedule_advance()
+
+    def _schedule_advance(self) -> None:
+        """Ставит точный таймер на следующий срок движка"""
+        if self.next_spawn_id:
+            self.precision.cancel(self.next_spawn_id)
+            self.next_spawn_id = None
+        deadline_ns = self.engine.next_deadline_ns
+        if deadline_ns is None:
             return
-            
-        # Очищаем предыдущую фигуру
+        delay_ms = max(0.0, (deadline_ns - self.timer.now_ns()) / 1e6)
+        self.next_spawn_id = self.precision.schedule(delay_ms, self._on_deadline)
+
+    def _on_deadline(self) -> None:
+        """Срок движка наступил"""
+        self.next_spawn_id = None
+        self.apply(self.engine.advance())
+
+    def hide_stimulus(self) -> None:
+        """Возвращает текущую фигуру в пул"""
+        self.animator.cancel_owner("stimulus")
         if self.current_shape:
-            self.canvas.delete(self.current_shape)
-            self.current_shape = None
-            
-        # Определяем размер и позицию
-        size = GAME["shape_size"]
-        padding = size + 20
-        x = random.randint(padding, WINDOW["width"] - padding)
-        y = random.randint(padding, WINDOW["height"] - padding)
+            self.shape_pool.release(self.current_shape)
+        self.current_shape = None
+
+    @traced("game.show_stimulus")
+    def show_stimulus(self, stimulus: StimulusShown) -> None:
+        """Рисует новый стимул вместо предыдущего"""
+        self.hide_stimulus()
+        if stimulus.sound:
+            self.parent.bell()
         
-        # Создаем фигуру в зависимости от режима
-        if self.game_mode == "color":
-            self.current_shape = self.canvas.create_rectangle(
-                x - size/2, y - size/2,
-                x + size/2, y + size/2,
-                fill=random.choice(list(COLORS["shapes"].values())),
-                outline=""
-            )
-        elif self.game_mode == "shape":
-            shape_type = random.choice(["rectangle", "oval", "triangle"])
-            if shape_type == "rectangle":
-                self.current_shape = self.canvas.create_rectangle(
-                    x - size/2, y - size/2,
-                    x + size/2, y + size/2,
-                    fill=COLORS["shapes"]["default"],
-                    outline=""
-                )
-            elif shape_type == "oval":
-                self.current_shape = self.canvas.create_oval(
-                    x - size/2, y - size/2,
-                    x + size/2, y + size/2,
-                    fill=COLORS["shapes"]["default"],
-                    outline=""
-                )
-            else:  # triangle
-                points = [
-                    x, y - size/2,
-                    x - size/2, y + size/2,
-                    x + size/2, y + size/2
-                ]
-                self.current_shape = self.canvas.create_polygon(
-                    points,
-                    fill=COLORS["shapes"]["default"],
-                    outline=""
-                )
+        self.current_shape = self.shape_pool.acquire(
+            stimulus.kind, stimulus.coords, fill=stimulus.fill, outline=""
+        )
         
         # Анимация появления
-        anim_id = animate_shape(
-            self.canvas,
+        animate_shape(
+            self.animator,
             self.current_shape,
             start_scale=0.1,
-            end_scale=1.0
+            end_scale=1.0,
+            owner="stimulus"
         )
-        if anim_id:
-            self.animation_ids.append(anim_id)
         
-        # Запоминаем время спавна
-        self.last_spawn_time = time.time()
-        
-        # Планируем следующий спавн
-        self.next_spawn_id = self.canvas.after(
-            self.spawn_delay,
-            self.spawn_shape
-        )
+        # Время появления отмечается после отрисовки фигуры
+        self.timer.start_after_paint(self.canvas, on_onset=self.engine.mark_onset)
 
+    @traced("game.on_click")
     def on_click(self, event: tk.Event) -> None:
         """Обработка клика мыши"""
-        if not self.is_running or not self.current_shape:
+        if not self.is_running:
+            return
+        
+        if self.game_mode == "multi":
+            self.on_multi_click(event)
+            return
+        
+        # Стимул еще не отрисован - время появления не отмечено
+        if not self.current_shape or not self.timer.running:
             return
             
-        # Проверяем попадание
-        clicked = self.canvas.find_overlapping(
-            event.x - 1, event.y - 1,
-            event.x + 1, event.y + 1
+        # Движок проверяет попадание и считает очки по исправленному
+        # времени клика; время появления у таймера и движка общее
+        timing = self.timer.measure(
+            self.timer.onset_ns, event.time, self.timer.scheduled_ns
         )
+        events = self.engine.click(event.x, event.y, timing.event_ns)
+        if not events:
+            return
+        self.timer.reset()
+        self.record_timing(timing)
+        for result in events:
+            if isinstance(result, TrialCompleted):
+                self.store_trial(timing, result.center, result.points)
+                self.flash(result.center)
+        self.apply(events)
+
+    def on_multi_click(self, event: tk.Event) -> None:
+        """Обработка клика в режиме множества мишеней"""
+        target = self.multi.click(event.x, event.y)
+        if target is None:
+            return
         
-        if self.current_shape in clicked:
-            # Вычисляем очки в зависимости от времени реакции
-            reaction_time = time.time() - self.last_spawn_time
-            max_points = GAME["points"]["max"]
-            min_points = GAME["points"]["min"]
-            points = max(
-                min_points,
-                int(max_points * (1 - reaction_time / (self.spawn_delay / 1000)))
-            )
-            
-            # Обновляем счет
-            self.current_score += points
-            if self.current_score > self.best_score:
-                self.best_score = self.current_score
-            self.update_score()
-            
-            # Создаем эффект вспышки
-            shape_coords = self.canvas.coords(self.current_shape)
-            shape_center = (
-                sum(shape_coords[::2]) / len(shape_coords[::2]),
-                sum(shape_coords[1::2]) / len(shape_coords[1::2])
-            )
-            
-            flash_ids = create_flash_effect(
-                self.canvas,
-                int(shape_center[0]),
-                int(shape_center[1]),
-                COLORS["flash"]
-            )
-            self.animation_ids.extend(flash_ids)
-            
-            # Удаляем фигуру и запускаем следующий объект
-            self.canvas.delete(self.current_shape)
-            self.current_shape = None
-            
-            if self.next_spawn_id:
-                self.canvas.after_cancel(self.next_spawn_id)
-            self.next_spawn_id = self.canvas.after(
-                self.spawn_delay,
-                self.spawn_shape
+        if target.correct:
+            timing = self.record_timing(self.timer.measure(
+                target.spawned_at, event.time, target.scheduled_at
+            ))
+            points = calculate_points(
+                timing.corrected_ms, self.multi.lifetime_ns / 1e6
             )
+            self.add_points(points)
+            self.store_trial(timing, target.geometry.center, points)
+            self.flash(target.geometry.center)
+        else:
+            self.add_points(-MULTI_TARGET["penalty"])
 
-    def update_score(self) -> None:
-        """Обновляет счет"""
-        if self.score_text:
-            self.canvas.delete(self.score_text)
-            
-        score_text = (
-            f"{LOCALIZATION['score']}: {self.current_score}\n"
-            f"{LOCALIZATION['best_score']}: {self.best_score}"
-        )
+    def record_timing(self, timing: TrialTiming) -> TrialTiming:
+        """
+        Сохраняет время попытки: сырое и исправленное время реакции,
+        задержку очереди и задержку от постановки стимула до отрисовки.
+        Попытка помечается, если во время нее цикл событий отставал
+        сильнее порога.
         
-        self.score_text = self.canvas.create_text(
-            self.canvas.winfo_width() - 10,
-            30,
-            text=score_text,
-            font=("Helvetica", 14),
-            fill=COLORS["text"],
-            anchor="e",
-            justify="right"
+        :return: Время попытки
+        """
+        if self.lag_monitor:
+            timing.max_lag_ms = self.lag_monitor.max_lag_since(timing.scheduled_ns)
+            timing.lagged = self.lag_monitor.is_lagged(timing.max_lag_ms)
+        self.last_timing = timing
+        self.trial_timings.append(timing)
+        return timing
+
+    def store_trial(self, timing: TrialTiming, center: Tuple[float, float],
+                    points: int) -> None:
+        """Передает попытку в статистику и хранилище истории"""
+        if self.stats is not None:
+            self.stats.record(self.game_mode, self.difficulty, timing.corrected_ms)
+        if self.trial_sink is None:
+            return
+        self.trial_sink.append(TrialRecord(
+            time.time(), self.session_id, self.game_mode, self.difficulty,
+            center[0], center[1],
+            timing.corrected_ms, timing.raw_ms, timing.queue_delay_ms,
+            timing.schedule_to_paint_ms, timing.lagged, points, self.profile_id
+        ))
+
+    def add_points(self, points: int) -> None:
+        """Начисляет очки (или снимает штраф) и обновляет счет"""
+        self.apply(self.engine.add_points(points))
+
+    def flash(self, center: Tuple[float, float]) -> None:
+        """Создает эффект вспышки в точке"""
+        create_flash_effect(
+            self.animator,
+            int(center[0]),
+            int(center[1]),
+            COLORS["flash"],
+            pool=self.fx_pool,
+            owner="fx"
         )
-        
-        # Анимация для счета
-        anim_id = animate_text(
-            self.canvas,
-            self.score_text,
-            self.canvas.winfo_width() - 10,
-            30
+
+    @traced("game.update_score")
+    def update_score(self) -> None:
+        """Обновляет счет"""
+        self.state.update(
+            current_score=self.current_score,
+            best_score=self.best_score
         )
-        if anim_id:
-            self.animation_ids.append(anim_id)
 
     def get_scores(self) -> Dict[str, int]:
         """
@@ -283,10 +390,20 @@ class GameField:
             'best_score': self.best_score
         }
 
+    def reset_scores(self, best_score: int) -> None:
+        """Сбрасывает счет (например, при смене профиля)"""
+        self.apply(self.engine.reset_scores(best_score))
+
+    def toggle_overlay(self) -> None:
+        """Включает или выключает оверлей производительности"""
+        self.overlay.toggle()
+
     def show(self) -> None:
         """Показывает игровое поле"""
         self.frame.pack(expand=True, fill="both")
+        self.overlay.resume()
 
     def hide(self) -> None:
         """Скрывает игровое поле"""
+        self.overlay.pause()
         self.frame.pack_forget()
\ No newline at end of file
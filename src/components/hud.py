@@ -0,0 +1,112 @@
+"""
+Модуль с индикатором счета на игровом поле
+"""
+import time
+import tkinter as tk
+from typing import Dict, Optional
+from src.utils.colors import COLORS
+from src.utils.frame_clock import AnimationScheduler
+from src.utils.layers import CanvasLayers
+from src.utils.palette import ramp
+from src.utils.settings import ANIMATION, LOCALIZATION
+from src.utils.state import StateStore
+
+# Шаблоны строк индикатора и их вертикальные позиции
+TEMPLATES = {
+    "current_score": f"{LOCALIZATION['score']}: {{}}",
+    "best_score": f"{LOCALIZATION['best_score']}: {{}}"
+}
+ROWS = {
+    "current_score": 20,
+    "best_score": 42
+}
+
+
+class ScoreHud:
+    def __init__(self, canvas: tk.Canvas, layers: CanvasLayers,
+                 animator: AnimationScheduler, state: StateStore):
+        """
+        Инициализация индикатора
+
+        Текстовые элементы создаются один раз и обновляются через
+        itemconfig только при изменении значения в хранилище состояния.
+        Серия обновлений объединяется в одну перерисовку не чаще раза
+        за кадр.
+
+        :param canvas: Канвас
+        :param layers: Слои канваса
+        :param animator: Планировщик анимаций для подсветки
+        :param state: Хранилище состояния со значениями счета
+        """
+        self.canvas = canvas
+        self.layers = layers
+        self.animator = animator
+        self._items: Dict[str, int] = {}
+        self._shown: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._flush_id: Optional[str] = None
+        self._last_flush = 0.0
+        self._x = canvas.winfo_reqwidth() - 10
+        self._highlight = ramp("score_highlight", "text", 12)
+
+        for key, y in ROWS.items():
+            self._items[key] = layers.add("hud", canvas.create_text(
+                self._x, y,
+                text="",
+                font=("Helvetica", 14),
+                fill=COLORS["text"],
+                anchor="e",
+                justify="right"
+            ))
+            state.subscribe(key, lambda value, key=key: self._queue(key, value))
+
+    def _queue(self, key: str, value: int) -> None:
+        """Запоминает новое значение и планирует перерисовку"""
+        self._pending[key] = value
+        if self._flush_id is not None:
+            return
+
+        wait_ms = int(ANIMATION["speed"] - (time.perf_counter() - self._last_flush) * 1000)
+        if wait_ms > 0:
+            self._flush_id = self.canvas.after(wait_ms, self._flush)
+        else:
+            self._flush_id = self.canvas.after_idle(self._flush)
+
+    def relayout(self, width: int) -> None:
+        """Перемещает индикатор к правому краю канваса новой ширины"""
+        x = width - 10
+        if x == self._x:
+            return
+        self._x = x
+        for key, item in self._items.items():
+            self.canvas.coords(item, x, ROWS[key])
+
+    def _flush(self) -> None:
+        """Применяет накопленные значения к изменившимся элементам"""
+        self._flush_id = None
+        self._last_flush = time.perf_counter()
+        pending, self._pending = self._pending, {}
+
+        for key, value in pending.items():
+            previous = self._shown.get(key)
+            if previous == value:
+                continue
+            self._shown[key] = value
+            self.canvas.itemconfig(self._items[key], text=TEMPLATES[key].format(value))
+            if previous is not None and value > previous:
+                self._flash(key)
+
+    def _flash(self, key: str) -> None:
+        """Подсвечивает выросшее значение с затуханием к цвету текста"""
+        item = self._items[key]
+        colors = self._highlight
+        owner = ("hud", key)
+        self.animator.cancel_owner(owner)
+        self.animator.add(
+            lambda p: self.canvas.itemconfig(
+                item, fill=colors[min(len(colors) - 1, round(p * (len(colors) - 1)))]
+            ),
+            ANIMATION["text_duration"] * 2,
+            owner,
+            easing="linear"
+        )
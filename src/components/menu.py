@@ -3,21 +3,25 @@
 """
 import tkinter as tk
 from tkinter import messagebox
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, List, Optional
 from src.utils.colors import COLORS
 from src.utils.settings import WINDOW, LOCALIZATION
+from src.utils.state import StateStore
 
 
 class Menu:
-    def __init__(self, parent: tk.Tk, callbacks: Dict[str, Callable]):
+    def __init__(self, parent: tk.Tk, callbacks: Dict[str, Callable],
+                 state: StateStore):
         """
         Инициализация меню
         
         :param parent: Родительское окно
         :param callbacks: Словарь с функциями обратного вызова
+        :param state: Хранилище состояния игры
         """
         self.parent = parent
         self.callbacks = callbacks
+        self.state = state
         self.frame = tk.Frame(parent, bg=COLORS['bg'])
         
         self._create_widgets()
@@ -49,6 +53,9 @@ class Menu:
             ("Продолжить", 'continue_game'),
             ("Новая игра", 'new_game'),
             ("Режим игры", 'select_mode'),
+            ("Профиль", 'select_profile'),
+            ("Статистика", 'show_stats'),
+            ("Экспорт", 'export_history'),
             ("Инструкция", 'show_instructions')
         ]
 
@@ -66,6 +73,78 @@ class Menu:
                 self.continue_button = btn
                 self.continue_button.config(state="disabled")
 
+        # Информация о текущих настройках, обновляется из хранилища состояния
+        label_style = {
+            'font': ("Helvetica", 12),
+            'bg': COLORS['bg'],
+            'fg': COLORS['text']
+        }
+        profile_var = tk.StringVar(self.frame)
+        self.state.bind_var("profile", profile_var, lambda name: f"Профиль: {name}")
+        tk.Label(self.frame, textvariable=profile_var, **label_style).pack(pady=(20, 0))
+
+        settings_frame = tk.Frame(self.frame, bg=COLORS['bg'])
+        settings_frame.pack(pady=(5, 20))
+
+        mode_var = tk.StringVar(self.frame)
+        self.state.bind_var("mode", mode_var, lambda mode: (
+            f"Режим: {LOCALIZATION['modes'].get(mode, mode)}"
+        ))
+        tk.Label(settings_frame, textvariable=mode_var, **label_style).pack(
+            side="left", padx=10
+        )
+
+        difficulty_var = tk.StringVar(self.frame)
+        self.state.bind_var("difficulty", difficulty_var, lambda difficulty: (
+            f"Сложность: {LOCALIZATION['difficulties'].get(difficulty, difficulty)}"
+        ))
+        tk.Label(settings_frame, textvariable=difficulty_var, **label_style).pack(
+            side="right", padx=10
+        )
+
+        best_score_var = tk.StringVar(self.frame)
+        self.state.bind_var("best_score", best_score_var, lambda score: (
+            f"{LOCALIZATION['best_score']}: {score}"
+        ))
+        tk.Label(
+            self.frame,
+            textvariable=best_score_var,
+            font=("Helvetica", 16, "bold"),
+            bg=COLORS['bg'],
+            fg=COLORS['text']
+        ).pack(pady=10)
+
+        # Статистика времени реакции для текущего режима и сложности
+        stats_var = tk.StringVar(self.frame)
+        self.state.bind_var("stats", stats_var, self._format_stats)
+        tk.Label(
+            self.frame,
+            textvariable=stats_var,
+            justify="left",
+            **label_style
+        ).pack(pady=5)
+
+        # Прогресс выгрузки истории
+        export_var = tk.StringVar(self.frame)
+        self.state.bind_var("export_status", export_var)
+        tk.Label(self.frame, textvariable=export_var, **label_style).pack(pady=5)
+
+    @staticmethod
+    def _format_stats(stats: Optional[Dict[str, Any]]) -> str:
+        """Текст сводки статистики за сессию и за все время"""
+        lines = []
+        for key, title in (('session', "Сессия"), ('all_time', "Все время")):
+            summary = (stats or {}).get(key)
+            if not summary:
+                continue
+            lines.append(
+                f"{title}: {summary['count']} попыток, "
+                f"среднее {summary['mean']:.0f} ± {summary['std']:.0f} мс, "
+                f"p50/p90/p99 {summary['p50']:.0f}/{summary['p90']:.0f}/"
+                f"{summary['p99']:.0f} мс"
+            )
+        return "\n".join(lines)
+
     def _on_button_hover(self, button: tk.Button, entering: bool) -> None:
         """Эффект при наведении на кнопку"""
         if entering:
@@ -118,7 +197,7 @@ class Menu:
         # Создаем фреймы для режимов и сложности
         modes_frame = Menu._create_radio_group(
             mode_window, "Режим игры", mode_var,
-            [(LOCALIZATION["modes"][mode], mode) for mode in ["color", "shape", "sound"]]
+            [(name, mode) for mode, name in LOCALIZATION["modes"].items()]
         )
         modes_frame.pack(padx=20, pady=10, fill="x")
 
@@ -160,6 +239,79 @@ class Menu:
         )
         cancel_button.pack(side="left", padx=10)
 
+    @staticmethod
+    def show_profile_selection(parent: tk.Tk, names: List[str], current: str,
+                               on_select: Callable[[str], None]) -> None:
+        """Показывает окно выбора или создания профиля"""
+        window = tk.Toplevel(parent)
+        window.title("Профиль")
+        window.geometry("400x500")
+        window.resizable(False, False)
+        window.configure(bg=COLORS['bg'])
+        window.grab_set()
+
+        tk.Label(
+            window,
+            text="Выбор профиля",
+            font=("Helvetica", 18, "bold"),
+            bg=COLORS['bg'],
+            fg=COLORS['text']
+        ).pack(pady=20)
+
+        listbox = tk.Listbox(
+            window,
+            font=("Helvetica", 12),
+            bg=COLORS['button'],
+            fg=COLORS['text'],
+            selectbackground=COLORS['primary'],
+            height=12
+        )
+        listbox.insert("end", *names)
+        if current in names:
+            index = names.index(current)
+            listbox.selection_set(index)
+            listbox.see(index)
+        listbox.pack(padx=20, fill="x")
+
+        # Имя нового профиля или выбранного в списке
+        name_var = tk.StringVar(value=current)
+        listbox.bind('<<ListboxSelect>>', lambda e: listbox.curselection() and name_var.set(
+            listbox.get(listbox.curselection()[0])
+        ))
+        tk.Entry(
+            window,
+            textvariable=name_var,
+            font=("Helvetica", 12),
+            bg=COLORS['button'],
+            fg=COLORS['text'],
+            insertbackground=COLORS['text']
+        ).pack(padx=20, pady=10, fill="x")
+
+        def select() -> None:
+            name = name_var.get().strip()
+            if not name:
+                return
+            try:
+                on_select(name)
+            except ValueError as e:
+                messagebox.showerror("Профиль", str(e), parent=window)
+                return
+            window.destroy()
+
+        buttons_frame = tk.Frame(window, bg=COLORS['bg'])
+        buttons_frame.pack(pady=10)
+        for text, command in (("Выбрать", select), ("Отмена", window.destroy)):
+            tk.Button(
+                buttons_frame,
+                text=text,
+                command=command,
+                font=("Helvetica", 12),
+                bg=COLORS['button'],
+                fg=COLORS['text'],
+                relief='flat',
+                width=15
+            ).pack(side="left", padx=10)
+
     @staticmethod
     def _create_radio_group(parent: tk.Widget, title: str, 
                           variable: tk.StringVar,
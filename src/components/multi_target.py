@@ -0,0 +1,171 @@
+"""
+Модуль с режимом множества мишеней
+"""
+import heapq
+import random
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Tuple
+from src.utils.colors import COLORS
+from src.utils.hit_test import OvalShape
+from src.utils.layers import CanvasLayers
+from src.utils.pool import CanvasItemPool
+from src.utils.settings import GAME, MULTI_TARGET
+from src.utils.spatial_hash import SpatialHash
+
+
+class Target:
+    """Мишень на игровом поле"""
+    __slots__ = ("item", "geometry", "correct", "scheduled_at", "spawned_at", "expires_at")
+
+    def __init__(self, item: int, geometry: OvalShape, correct: bool,
+                 scheduled_at: int, expires_at: int):
+        self.item = item
+        self.geometry = geometry
+        self.correct = correct
+        self.scheduled_at = scheduled_at
+        # Уточняется после отрисовки партии
+        self.spawned_at = scheduled_at
+        self.expires_at = expires_at
+
+
+class MultiTargetMode:
+    def __init__(self, canvas: tk.Canvas, layers: CanvasLayers,
+                 clock_ns: Callable[[], int] = time.perf_counter_ns):
+        """
+        Инициализация режима
+
+        Мишени хранятся в пространственной хеш-сетке: клик и проверка
+        перекрытий при размещении смотрят только соседние ячейки, а
+        истекшие мишени извлекаются из кучи по времени истечения.
+
+        :param canvas: Канвас
+        :param layers: Слои канваса
+        :param clock_ns: Монотонные часы в наносекундах
+        """
+        self.canvas = canvas
+        self.clock_ns = clock_ns
+        self.pool = CanvasItemPool(canvas, layers, "stimulus", MULTI_TARGET["max_targets"])
+        self.grid = SpatialHash(MULTI_TARGET["cell_size"])
+        self.targets: Dict[int, Target] = {}
+        self._expiry: List[Tuple[int, int, Target]] = []
+        self._sequence = 0
+        self._spawn_id: Optional[str] = None
+        self._sweep_id: Optional[str] = None
+        self.lifetime_ns = MULTI_TARGET["lifetime"]["medium"] * 1_000_000
+        self.width = 0
+        self.height = 0
+        self.expired = 0
+        self.rejected = 0
+
+    def start(self, difficulty: str, width: int, height: int) -> None:
+        """
+        Запускает спавн и проверку истечения мишеней
+
+        :param difficulty: Уровень сложности
+        :param width: Ширина области размещения
+        :param height: Высота области размещения
+        """
+        self.stop()
+        self.lifetime_ns = MULTI_TARGET["lifetime"][difficulty] * 1_000_000
+        self.width = width
+        self.height = height
+        self._spawn_batch()
+        self._sweep()
+
+    def stop(self) -> None:
+        """Останавливает режим и убирает все мишени"""
+        for after_id in (self._spawn_id, self._sweep_id):
+            if after_id:
+                self.canvas.after_cancel(after_id)
+        self._spawn_id = None
+        self._sweep_id = None
+        self.pool.release_all()
+        self.grid.clear()
+        self.targets.clear()
+        self._expiry.clear()
+
+    def click(self, x: float, y: float) -> Optional[Target]:
+        """
+        Находит и убирает мишень под курсором
+
+        :return: Мишень, по которой попал клик, или None
+        """
+        best = None
+        tolerance = GAME["hit_tolerance"]
+        for item in self.grid.query_point(x, y, tolerance):
+            target = self.targets[item]
+            if target.geometry.contains(x, y, tolerance):
+                # Из перекрывающихся мишеней выбираем самую новую (верхнюю)
+                if best is None or target.spawned_at > best.spawned_at:
+                    best = target
+        if best is not None:
+            self._remove(best)
+        return best
+
+    def _spawn_batch(self) -> None:
+        """Добавляет партию мишеней и планирует следующую"""
+        now = self.clock_ns()
+        size = MULTI_TARGET["target_size"]
+        batch = []
+        for _ in range(MULTI_TARGET["batch"]):
+            if len(self.targets) >= MULTI_TARGET["max_targets"]:
+                break
+            box = self._place(size)
+            if box is None:
+                self.rejected += 1
+                continue
+
+            correct = random.random() >= MULTI_TARGET["distractor_chance"]
+            item = self.pool.acquire(
+                "oval", box,
+                fill=COLORS["shapes"]["green" if correct else "red"],
+                outline=""
+            )
+            target = Target(item, OvalShape(*box), correct, now, now + self.lifetime_ns)
+            self.targets[item] = target
+            self.grid.insert(item, box)
+            self._sequence += 1
+            heapq.heappush(self._expiry, (target.expires_at, self._sequence, target))
+            batch.append(target)
+
+        if batch:
+            self.canvas.after_idle(self._mark_onset, batch)
+        self._spawn_id = self.canvas.after(MULTI_TARGET["spawn_interval"], self._spawn_batch)
+
+    def _mark_onset(self, batch: List[Target]) -> None:
+        """Отмечает время появления партии после ее отрисовки"""
+        self.canvas.update_idletasks()
+        now = self.clock_ns()
+        for target in batch:
+            target.spawned_at = now
+
+    def _place(self, size: float) -> Optional[Tuple[float, float, float, float]]:
+        """Ищет место для мишени без перекрытия с другими"""
+        padding = size + 20
+        if self.width <= 2 * padding or self.height <= 2 * padding:
+            return None
+        for _ in range(MULTI_TARGET["placement_attempts"]):
+            x = random.uniform(padding, self.width - padding)
+            y = random.uniform(padding, self.height - padding)
+            box = (x - size/2, y - size/2, x + size/2, y + size/2)
+            if not self.grid.query_bbox(box):
+                return box
+        return None
+
+    def _sweep(self) -> None:
+        """Убирает истекшие мишени и планирует следующую проверку"""
+        now = self.clock_ns()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, target = heapq.heappop(self._expiry)
+            # Элемент мог быть переиспользован пулом для новой мишени
+            if self.targets.get(target.item) is target:
+                self._remove(target)
+                self.expired += 1
+        self._sweep_id = self.canvas.after(MULTI_TARGET["sweep_interval"], self._sweep)
+
+    def _remove(self, target: Target) -> None:
+        """Убирает мишень с поля"""
+        del self.targets[target.item]
+        self.grid.remove(target.item)
+        self.pool.release(target.item)
@@ -0,0 +1,161 @@
+"""
+Модуль с оверлеем производительности на игровом поле
+"""
+import time
+import tkinter as tk
+from typing import Callable, Optional
+from src.utils.colors import COLORS
+from src.utils.frame_clock import AnimationScheduler
+from src.utils.lag_monitor import LagMonitor
+from src.utils.layers import CanvasLayers
+from src.utils.settings import OVERLAY
+from src.utils.timing import TrialTiming
+
+TEMPLATE = (
+    "FPS: {fps:.0f}  худший кадр: {worst:.1f} мс  пропущено: {dropped}\n"
+    "элементов: {items}  after: {afters}  анимаций: {tweens}\n"
+    "задержка цикла: {lag:.1f} мс (p99 {lag_p99:.1f})\n"
+    "ошибка появления: {onset}"
+)
+
+
+class PerfOverlay:
+    def __init__(self, canvas: tk.Canvas, layers: CanvasLayers,
+                 animator: AnimationScheduler,
+                 lag_monitor: Optional[LagMonitor] = None,
+                 last_timing: Callable[[], Optional[TrialTiming]] = lambda: None):
+        """
+        Инициализация оверлея
+
+        Частота и худший кадр измеряются легким пульсом after() с
+        интервалом кадра анимации, поэтому видны и задержки, когда
+        анимаций нет. Текст обновляется таймером не чаще
+        OVERLAY["interval"] мс и только пока оверлей включен и поле
+        видно; itemconfig вызывается лишь при изменении текста.
+
+        :param canvas: Канвас
+        :param layers: Слои канваса
+        :param animator: Планировщик анимаций (интервал кадра, пропуски)
+        :param lag_monitor: Монитор задержек цикла событий
+        :param last_timing: Функция, возвращающая время последней попытки
+        """
+        self.canvas = canvas
+        self.layers = layers
+        self.animator = animator
+        self.lag_monitor = lag_monitor
+        self.last_timing = last_timing
+        self.visible = False
+        self.paused = False
+        self._item: Optional[int] = None
+        self._text = ""
+        self._after_id: Optional[str] = None
+        self._beat_id: Optional[str] = None
+        self._last_time = 0.0
+        self._last_beat = 0.0
+        self._beats = 0
+        self._worst_beat_ms = 0.0
+
+    def toggle(self) -> None:
+        """Включает или выключает оверлей"""
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self) -> None:
+        """Показывает оверлей"""
+        if self._item is None:
+            self._item = self.layers.add("hud", self.canvas.create_text(
+                10, 50,
+                text="",
+                font=("Courier", 10),
+                fill=COLORS["text"],
+                anchor="nw"
+            ))
+        self.canvas.itemconfig(self._item, state="normal")
+        self.visible = True
+        if not self.paused:
+            self._start()
+
+    def hide(self) -> None:
+        """Скрывает оверлей и останавливает обновления"""
+        self.visible = False
+        self._stop()
+        if self._item is not None:
+            self.canvas.itemconfig(self._item, state="hidden")
+
+    def pause(self) -> None:
+        """Останавливает обновления, пока игровое поле скрыто"""
+        self.paused = True
+        self._stop()
+
+    def resume(self) -> None:
+        """Возобновляет обновления включенного оверлея"""
+        self.paused = False
+        if self.visible and self._after_id is None:
+            self._start()
+
+    def _start(self) -> None:
+        """Запускает пульс кадров и обновление текста"""
+        self._last_time = self._last_beat = time.perf_counter()
+        self._beats = 0
+        self._worst_beat_ms = 0.0
+        self.animator.take_dropped_frames()
+        self._beat_id = self.canvas.after(self.animator.frame_ms, self._beat)
+        self._update()
+
+    def _stop(self) -> None:
+        """Останавливает пульс кадров и обновление текста"""
+        for after_id in (self._after_id, self._beat_id):
+            if after_id is not None:
+                self.canvas.after_cancel(after_id)
+        self._after_id = None
+        self._beat_id = None
+
+    def _beat(self) -> None:
+        """
+        Пульс с интервалом кадра анимации
+
+        Интервал между пульсами - реальная длительность кадра цикла
+        событий, в том числе когда анимаций нет (ожидание стимула).
+        """
+        now = time.perf_counter()
+        self._worst_beat_ms = max(self._worst_beat_ms, (now - self._last_beat) * 1000)
+        self._last_beat = now
+        self._beats += 1
+        self._beat_id = self.canvas.after(self.animator.frame_ms, self._beat)
+
+    def _update(self) -> None:
+        """Собирает метрики и обновляет текст"""
+        now = time.perf_counter()
+        elapsed = max(now - self._last_time, 1e-6)
+        fps = self._beats / elapsed
+        worst = self._worst_beat_ms
+        self._last_time = now
+        self._beats = 0
+        self._worst_beat_ms = 0.0
+
+        lag = lag_p99 = 0.0
+        if self.lag_monitor:
+            lag = self.lag_monitor.current_lag_ms
+            lag_p99 = self.lag_monitor.histogram.percentile(99)
+
+        timing = self.last_timing()
+        onset = f"{timing.schedule_to_paint_ms:.1f} мс" if timing else "-"
+
+        text = TEMPLATE.format(
+            fps=fps,
+            worst=worst,
+            dropped=self.animator.take_dropped_frames(),
+            items=len(self.canvas.find_all()),
+            afters=len(self.canvas.tk.splitlist(self.canvas.tk.call("after", "info"))),
+            tweens=self.animator.active_count,
+            lag=lag,
+            lag_p99=lag_p99,
+            onset=onset
+        )
+        if text != self._text:
+            self._text = text
+            self.canvas.itemconfig(self._item, text=text)
+
+        self._after_id = self.canvas.after(OVERLAY["interval"], self._update)
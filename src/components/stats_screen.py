@@ -0,0 +1,257 @@
+"""
+Модуль с экраном статистики
+"""
+import logging
+import threading
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.utils.analytics import HAS_NUMPY, Analytics
+from src.utils.colors import COLORS
+from src.utils.palette import ramp
+from src.utils.settings import ANALYTICS, LOCALIZATION
+from src.utils.state import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Размеры графиков, пиксели
+CHART_WIDTH = 360
+CHART_HEIGHT = 200
+HEAT_STEPS = 16
+
+
+class StatsScreen:
+    def __init__(self, parent: tk.Tk, on_back: Callable, state: StateStore,
+                 field_size: Callable[[str], Tuple[int, int]],
+                 profile_id: Optional[int] = None):
+        """
+        Инициализация экрана статистики
+
+        Показывает для текущего режима и сложности сводку по очищенной
+        истории, кривую обучения по сессиям, карту времени реакции по
+        областям экрана и сравнение последних дней с предыдущими.
+
+        :param parent: Родительское окно
+        :param on_back: Функция для возврата в меню
+        :param state: Хранилище состояния игры
+        :param field_size: Функция, возвращающая размер поля режима, в
+            координатах которого записаны попытки
+        :param profile_id: Профиль, чьи попытки показываются (None - все)
+        """
+        self.parent = parent
+        self.on_back = on_back
+        self.state = state
+        self.field_size = field_size
+        self.analytics: Optional[Analytics] = (
+            Analytics(profile_id=profile_id) if HAS_NUMPY else None
+        )
+        self._loader: Optional[threading.Thread] = None
+        self.frame = tk.Frame(parent, bg=COLORS['bg'])
+        self._create_widgets()
+
+    def _create_widgets(self) -> None:
+        """Создает виджеты экрана"""
+        label_style = {
+            'font': ("Helvetica", 12),
+            'bg': COLORS['bg'],
+            'fg': COLORS['text']
+        }
+        tk.Label(
+            self.frame,
+            text="Статистика",
+            font=("Helvetica", 24, "bold"),
+            bg=COLORS['bg'],
+            fg=COLORS['text']
+        ).pack(pady=(20, 10))
+
+        self.summary_var = tk.StringVar(self.frame)
+        tk.Label(
+            self.frame, textvariable=self.summary_var, justify="left", **label_style
+        ).pack(pady=10)
+
+        charts = tk.Frame(self.frame, bg=COLORS['bg'])
+        charts.pack(pady=10)
+        self.curve_canvas = self._chart(charts, "Кривая обучения (среднее по сессиям)")
+        self.region_canvas = self._chart(charts, "Время реакции по областям экрана")
+
+        tk.Button(
+            self.frame,
+            text="Назад",
+            command=self.on_back,
+            font=("Helvetica", 14),
+            width=25,
+            bg=COLORS['button'],
+            fg=COLORS['text'],
+            relief='flat'
+        ).pack(pady=20)
+
+    @staticmethod
+    def _chart(parent: tk.Widget, title: str) -> tk.Canvas:
+        """Создает подписанный канвас для графика"""
+        frame = tk.LabelFrame(
+            parent,
+            text=title,
+            font=("Helvetica", 12),
+            bg=COLORS['bg'],
+            fg=COLORS['text']
+        )
+        frame.pack(side="left", padx=10)
+        canvas = tk.Canvas(
+            frame,
+            width=CHART_WIDTH,
+            height=CHART_HEIGHT,
+            bg=COLORS['bg'],
+            highlightthickness=0
+        )
+        canvas.pack(padx=5, pady=5)
+        return canvas
+
+    def set_profile(self, profile_id: Optional[int]) -> None:
+        """Переключает статистику на попытки другого профиля"""
+        if self.analytics is not None:
+            self.analytics.profile_id = profile_id
+
+    def refresh(self) -> None:
+        """
+        Пересчитывает статистику (из кэша, если история не менялась)
+
+        Загрузка истории и расчеты идут в фоновом потоке, экран опрашивает
+        его через after() и пока показывает надпись о загрузке.
+        """
+        if self.analytics is None:
+            self.curve_canvas.delete("all")
+            self.region_canvas.delete("all")
+            self.summary_var.set("Для статистики нужен NumPy (pip install numpy)")
+            return
+        if self._loader is not None and self._loader.is_alive():
+            return
+
+        mode = self.state.get('mode')
+        difficulty = self.state.get('difficulty')
+        width, height = self.field_size(mode)
+        analytics = self.analytics
+        result: Dict[str, Any] = {}
+
+        def run() -> None:
+            try:
+                analytics.refresh()
+                split = time.time() - ANALYTICS["compare_days"] * 86400
+                result.update(
+                    summary=analytics.summary(mode, difficulty),
+                    comparison=analytics.compare(split, mode, difficulty),
+                    curve=analytics.learning_curve(mode, difficulty),
+                    regions=analytics.region_map(
+                        width, height, mode=mode, difficulty=difficulty
+                    )
+                )
+            except Exception as e:
+                logger.exception("failed to compute statistics")
+                result['error'] = str(e)
+
+        self.summary_var.set("Загрузка статистики...")
+        self._loader = threading.Thread(target=run, name="analytics", daemon=True)
+        self._loader.start()
+        self._poll(result, mode, difficulty)
+
+    def _poll(self, result: Dict[str, Any], mode: str, difficulty: str) -> None:
+        """Показывает результаты фоновой загрузки, когда она закончится"""
+        if self._loader is not None and self._loader.is_alive():
+            self.frame.after(ANALYTICS["poll_interval"], self._poll, result, mode, difficulty)
+            return
+        self.curve_canvas.delete("all")
+        self.region_canvas.delete("all")
+        if 'error' in result:
+            self.summary_var.set(f"Ошибка статистики: {result['error']}")
+            return
+        self.summary_var.set(self._format(
+            mode, difficulty, result['summary'], result['comparison']
+        ))
+        self._draw_curve(result['curve'])
+        self._draw_regions(result['regions'])
+
+    @staticmethod
+    def _format(mode: str, difficulty: str, summary: Dict[str, Any],
+                comparison: Dict[str, Any]) -> str:
+        """Текст сводки и сравнения"""
+        lines = [
+            f"{LOCALIZATION['modes'].get(mode, mode)}, "
+            f"{LOCALIZATION['difficulties'].get(difficulty, difficulty)}: "
+            f"{summary['count']} из {summary['total']} попыток после отсева "
+            f"упреждений и выбросов"
+        ]
+        if summary['count']:
+            lines.append(
+                f"Среднее {summary['mean']:.0f} ± {summary['std']:.0f} мс, "
+                f"p50/p90/p99 {summary['p50']:.0f}/{summary['p90']:.0f}/"
+                f"{summary['p99']:.0f} мс"
+            )
+        before, after = comparison['before'], comparison['after']
+        if before['count'] and after['count']:
+            lines.append(
+                f"Последние {ANALYTICS['compare_days']} дн.: {after['mean']:.0f} мс "
+                f"против {before['mean']:.0f} мс раньше "
+                f"({comparison['diff']:+.0f} мс, d = {comparison['d']:.2f})"
+            )
+        return "\n".join(lines)
+
+    def _draw_curve(self, curve: Dict[str, Any]) -> None:
+        """Рисует кривую обучения одной ломаной"""
+        means = curve['mean']
+        if len(means) < 2:
+            self.curve_canvas.create_text(
+                CHART_WIDTH / 2, CHART_HEIGHT / 2,
+                text="Недостаточно сессий", fill=COLORS['text']
+            )
+            return
+        low, high = float(means.min()), float(means.max())
+        span = (high - low) or 1.0
+        pad = 10
+        step = (CHART_WIDTH - 2 * pad) / (len(means) - 1)
+        points = []
+        for index, value in enumerate(means.tolist()):
+            points.append(pad + index * step)
+            points.append(pad + (high - value) / span * (CHART_HEIGHT - 2 * pad))
+        self.curve_canvas.create_line(*points, fill=COLORS['shapes']['green'], width=2)
+        for y, value in ((pad, high), (CHART_HEIGHT - pad, low)):
+            self.curve_canvas.create_text(
+                CHART_WIDTH - pad, y, text=f"{value:.0f} мс",
+                anchor="e", fill=COLORS['text'], font=("Helvetica", 9)
+            )
+
+    def _draw_regions(self, regions: Dict[str, Any]) -> None:
+        """Рисует карту областей: от зеленого (быстро) к красному (медленно)"""
+        mean = regions['mean']
+        filled = mean[regions['count'] > 0]
+        if not len(filled):
+            return
+        low, high = float(filled.min()), float(filled.max())
+        span = (high - low) or 1.0
+        colors = ramp(COLORS['shapes']['green'], COLORS['shapes']['red'], HEAT_STEPS)
+        rows, columns = mean.shape
+        cell_w = CHART_WIDTH / columns
+        cell_h = CHART_HEIGHT / rows
+        for row in range(rows):
+            for column in range(columns):
+                value = mean[row, column]
+                x0, y0 = column * cell_w, row * cell_h
+                if regions['count'][row, column] == 0:
+                    fill = COLORS['button']
+                    text = ""
+                else:
+                    fill = colors[int((value - low) / span * (HEAT_STEPS - 1))]
+                    text = f"{value:.0f}"
+                self.region_canvas.create_rectangle(
+                    x0, y0, x0 + cell_w, y0 + cell_h, fill=fill, outline=COLORS['bg']
+                )
+                self.region_canvas.create_text(
+                    x0 + cell_w / 2, y0 + cell_h / 2, text=text, fill=COLORS['bg']
+                )
+
+    def show(self) -> None:
+        """Показывает экран статистики"""
+        self.refresh()
+        self.frame.pack(expand=True, fill="both")
+
+    def hide(self) -> None:
+        """Скрывает экран статистики"""
+        self.frame.pack_forget()
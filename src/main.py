@@ -2,11 +2,27 @@
 Главный модуль приложения
 """
 import tkinter as tk
-import json
-from typing import Dict, Any
+from tkinter import filedialog
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
 from src.components.menu import Menu
 from src.components.game_field import GameField
-from src.utils.settings import WINDOW
+from src.components.stats_screen import StatsScreen
+from src.utils.export import TrialFilter, export_trials
+from src.utils.lag_monitor import LagMonitor
+from src.utils.log import setup_logging, shutdown_logging
+from src.utils.persistence import JsonLinesAppender, WriteBehindStore
+from src.utils.profiles import ProfileStore
+from src.utils.settings import EXPORT, LAG, PROFILES, STATS, WINDOW
+from src.utils.state import StateStore
+from src.utils.stats import StatsBook
+from src.utils.tracing import traced, tracer
+from src.utils.trial_store import open_trial_sink
+
+logger = logging.getLogger(__name__)
 
 
 class ReactionTrainer:
@@ -18,48 +34,112 @@ class ReactionTrainer:
         self.root.attributes('-fullscreen', True)
         # Добавляем обработчик клавиши Escape
         self.root.bind('<Escape>', lambda e: self.root.quit())
+        # F3 включает оверлей производительности
+        self.root.bind('<F3>', lambda e: self.game_field.toggle_overlay())
+        # F4 выгружает трассировку, если она включена
+        self.root.bind('<F4>', lambda e: self.dump_trace())
 
         # Настройки игры
         self.game_mode = "color"
         self.difficulty = "medium"
         self.best_score = 0
 
-        # Загрузка настроек
+        # Загрузка настроек активного профиля; запись идет в фоновом потоке
+        self.profiles = ProfileStore()
         self.load_settings()
 
+        # Статистика времени реакции за все время (у каждого профиля своя)
+        self.stats_store: Optional[WriteBehindStore] = None
+        self.load_stats()
+
+        # Общее состояние для меню и игрового поля
+        self.state = StateStore(
+            profile=self.profiles.active,
+            mode=self.game_mode,
+            difficulty=self.difficulty,
+            best_score=self.best_score,
+            current_score=0,
+            stats=self.stats.summary(self.game_mode, self.difficulty),
+            export_status=""
+        )
+
         # Создание компонентов
         self.menu = Menu(self.root, {
             'continue_game': self.continue_game,
             'new_game': self.start_new_game,
             'select_mode': self.select_mode,
+            'select_profile': self.select_profile,
+            'show_stats': self.show_stats,
+            'export_history': self.export_history,
             'show_instructions': Menu.show_instructions
-        })
+        }, self.state)
+
+        # Монитор задержек цикла событий
+        self.lag_monitor = LagMonitor(self.root)
+        self.lag_monitor.start()
+        self.lag_sessions: List[Dict[str, Any]] = []
+        self.lag_history = JsonLinesAppender(LAG["history_file"])
+        self.session_active = False
 
-        self.game_field = GameField(self.root, self.show_menu)
+        # История попыток
+        self.trials = open_trial_sink()
+        self.export_thread: Optional[threading.Thread] = None
+        self.export_cancel = threading.Event()
+
+        self.game_field = GameField(
+            self.root, self.show_menu, self.state, self.lag_monitor,
+            self.trials, self.stats
+        )
+        self.game_field.profile_id = self.profiles.profile_id()
+
+        self.stats_screen = StatsScreen(
+            self.root, self.close_stats, self.state, self.game_field.field_size,
+            self.profiles.profile_id()
+        )
 
         # Показать меню при запуске
         self.show_menu()
 
     def load_settings(self) -> None:
-        """Загружает настройки из файла"""
-        try:
-            with open('best_score.json', 'r') as f:
-                data = json.load(f)
-                self.best_score = data.get('best_score', 0)
-                self.game_mode = data.get('game_mode', "color")
-                self.difficulty = data.get('difficulty', "medium")
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+        """Загружает настройки активного профиля"""
+        self.apply_profile(self.profiles.load())
+
+    def apply_profile(self, data: Dict[str, Any]) -> None:
+        """Применяет настройки профиля"""
+        self.best_score = data.get('best_score', 0)
+        self.game_mode = data.get('game_mode', "color")
+        self.difficulty = data.get('difficulty', "medium")
 
+    def load_stats(self) -> None:
+        """
+        Загружает статистику активного профиля
+
+        Общий файл статистики из версий без профилей читается для профиля
+        по умолчанию, пока у него нет своего файла.
+        """
+        if self.stats_store is not None:
+            self.stats_store.close()
+        self.stats_store = WriteBehindStore(self.profiles.stats_path())
+        data = self.stats_store.load()
+        if not data and self.profiles.active == PROFILES["default"]:
+            data = WriteBehindStore(STATS["file"]).load()
+        self.stats = StatsBook.from_dict(data.get('all_time', {}))
+
+    @traced("settings.save", "io")
     def save_settings(self) -> None:
-        """Сохраняет настройки в файл"""
+        """Сохраняет настройки (запись в файл отложенная)"""
         scores = self.game_field.get_scores()
-        with open('best_score.json', 'w') as f:
-            json.dump({
-                'best_score': max(scores['best_score'], self.best_score),
-                'game_mode': self.game_mode,
-                'difficulty': self.difficulty
-            }, f)
+        self.best_score = max(scores['best_score'], self.best_score)
+        self.profiles.update(
+            best_score=self.best_score,
+            game_mode=self.game_mode,
+            difficulty=self.difficulty
+        )
+        self.state.update(
+            mode=self.game_mode,
+            difficulty=self.difficulty,
+            best_score=self.best_score
+        )
 
     def show_menu(self) -> None:
         """Показывает меню"""
@@ -67,11 +147,127 @@ class ReactionTrainer:
         self.game_field.hide()
         self.menu.show()
         self.save_settings()
+        self.end_session()
+        self.refresh_stats()
+
+    def export_history(self) -> None:
+        """Выгружает историю попыток активного профиля в фоновом потоке"""
+        if self.export_thread is not None and self.export_thread.is_alive():
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Выгрузка истории",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("CSV, gzip", "*.csv.gz"),
+                ("JSON Lines", "*.jsonl"),
+                ("JSON Lines, gzip", "*.jsonl.gz")
+            ]
+        )
+        if not path:
+            return
+
+        # Поток выгрузки читает базу своим соединением: ждем записи пакета
+        self.trials.sync()
+        names = self.profiles.id_names()
+        where = TrialFilter(profile_id=self.profiles.profile_id())
+        # Поток выгрузки только пишет сюда, интерфейс опрашивает через after()
+        progress: Dict[str, Any] = {'count': 0, 'elapsed': 0.0, 'done': False, 'error': None}
+
+        # Выгрузка прерывается при выходе из приложения (см. run())
+        cancel = self.export_cancel = threading.Event()
+
+        def run() -> None:
+            try:
+                export_trials(
+                    path, where, names,
+                    progress=lambda count, elapsed: progress.update(count=count, elapsed=elapsed),
+                    cancel=cancel
+                )
+            except Exception as e:
+                logger.exception("export to %s failed", path)
+                progress['error'] = str(e)
+            finally:
+                progress['done'] = True
+
+        self.export_thread = threading.Thread(target=run, name="export", daemon=True)
+        self.export_thread.start()
+        self._poll_export(progress)
+
+    def _poll_export(self, progress: Dict[str, Any]) -> None:
+        """Показывает прогресс выгрузки в меню"""
+        count, elapsed = progress['count'], progress['elapsed']
+        rate = count / elapsed if elapsed else 0.0
+        if progress['error']:
+            self.state.set('export_status', f"Ошибка выгрузки: {progress['error']}")
+        elif progress['done']:
+            self.state.set('export_status', f"Выгружено попыток: {count} ({rate:.0f}/с)")
+        else:
+            self.state.set('export_status', f"Выгрузка: {count} попыток ({rate:.0f}/с)")
+            self.root.after(EXPORT["poll_interval"], self._poll_export, progress)
+
+    def show_stats(self) -> None:
+        """Показывает экран статистики"""
+        # Аналитика читает историю своим соединением: ждем записи пакета
+        self.trials.sync()
+        self.menu.hide()
+        self.stats_screen.show()
+
+    def close_stats(self) -> None:
+        """Возвращается из экрана статистики в меню"""
+        self.stats_screen.hide()
+        self.menu.show()
+
+    def refresh_stats(self) -> None:
+        """Обновляет сводку статистики для текущего режима и сложности"""
+        self.state.set('stats', self.stats.summary(self.game_mode, self.difficulty))
+
+    def start_session(self) -> None:
+        """
+        Начинает игровую сессию
+
+        Завершает предыдущую, сбрасывает задержки и статистику сессии и
+        выдает новый идентификатор сессии для истории попыток.
+        """
+        self.end_session()
+        self.lag_monitor.reset_session()
+        self.stats.reset_session()
+        self.session_active = True
+        self.game_field.session_id = uuid.uuid4().hex
+
+    def end_session(self) -> None:
+        """
+        Завершает игровую сессию
+
+        Передает накопленные попытки на запись, сохраняет статистику за
+        все время и дописывает сводку задержек сессии в историю.
+        """
+        if not self.session_active:
+            return
+        self.session_active = False
+        self.trials.flush()
+        self.stats_store.update(all_time=self.stats.to_dict())
+        snapshot = self.lag_monitor.snapshot()
+        snapshot['ended_at'] = time.time()
+        snapshot['game_mode'] = self.game_mode
+        snapshot['difficulty'] = self.difficulty
+        self.lag_sessions.append(snapshot)
+        self.lag_history.append(snapshot)
+
+    def get_lag_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает сводку задержек цикла событий текущей сессии
+        
+        :return: Словарь с перцентилями и гистограммой
+        """
+        return self.lag_monitor.snapshot()
 
     def start_new_game(self) -> None:
         """Начинает новую игру"""
         self.menu.hide()
         self.game_field.show()
+        self.start_session()
         self.game_field.start_game(
             self.game_mode,
             self.difficulty,
@@ -84,6 +280,7 @@ class ReactionTrainer:
         """Продолжает текущую игру"""
         self.menu.hide()
         self.game_field.show()
+        self.start_session()
         scores = self.game_field.get_scores()
         self.game_field.start_game(
             self.game_mode,
@@ -98,6 +295,7 @@ class ReactionTrainer:
             self.game_mode = mode
             self.difficulty = difficulty
             self.save_settings()
+            self.refresh_stats()
 
         Menu.show_mode_selection(
             self.root,
@@ -106,21 +304,82 @@ class ReactionTrainer:
             on_save
         )
 
+    def select_profile(self) -> None:
+        """Открывает окно выбора профиля"""
+        Menu.show_profile_selection(
+            self.root,
+            self.profiles.names(),
+            self.profiles.active,
+            self.switch_profile
+        )
+
+    def switch_profile(self, name: str) -> None:
+        """
+        Переключает профиль игрока
+
+        Настройки прежнего профиля сохраняются, текущая игра сбрасывается.
+
+        :param name: Имя профиля (новый профиль создается)
+        """
+        self.end_session()
+        self.save_settings()
+        self.apply_profile(self.profiles.switch(name))
+        self.load_stats()
+        self.game_field.stats = self.stats
+        self.game_field.reset_scores(self.best_score)
+        self.game_field.profile_id = self.profiles.profile_id()
+        self.stats_screen.set_profile(self.game_field.profile_id)
+        self.menu.update_continue_button(False)
+        self.state.update(
+            profile=self.profiles.active,
+            mode=self.game_mode,
+            difficulty=self.difficulty,
+            best_score=self.best_score
+        )
+        self.refresh_stats()
+
     def run(self) -> None:
         """Запускает приложение"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # Escape и закрытие окна не проходят через show_menu:
+            # сохраняем незавершенную сессию до закрытия хранилищ
+            try:
+                self.game_field.stop_game()
+            except tk.TclError:  # окно уже уничтожено
+                pass
+            self.end_session()
+            try:
+                self.save_settings()
+            except tk.TclError:  # профиль уже обновлен, не удалось только меню
+                pass
+            # Незаконченная выгрузка удаляет свой .part-файл до закрытия хранилищ
+            if self.export_thread is not None and self.export_thread.is_alive():
+                self.export_cancel.set()
+                self.export_thread.join()
+            self.profiles.close()
+            self.stats_store.close()
+            self.lag_history.close()
+            self.trials.close()
+            self.dump_trace()
+
+    def dump_trace(self) -> None:
+        """Выгружает трассировку, если она включена"""
+        path = tracer.dump()
+        if path:
+            logger.info("trace written to %s (%d spans)", path, len(tracer.spans))
 
 
 if __name__ == "__main__":
+    setup_logging()
     try:
-        print("Starting application...")
+        logger.info("starting application")
         app = ReactionTrainer()
-        print("Application created, starting main loop...")
+        logger.info("application created, starting main loop")
         app.run()
-        print("Application closed.")
-    except Exception as e:
-        import traceback
-        print(f"Error occurred: {e}")
-        print("Full traceback:")
-        print(traceback.format_exc())
-        input("Press Enter to exit...")
\ No newline at end of file
+        logger.info("application closed")
+    except Exception:
+        logger.exception("application failed")
+        shutdown_logging()
+        input("Press Enter to exit...")
@@ -0,0 +1,389 @@
+"""
+Модуль с аналитикой истории попыток на NumPy
+"""
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from src.utils.settings import ANALYTICS, TRIALS
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy аналитика недоступна, игра работает
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class TrialHistory:
+    """История попыток в виде столбцов NumPy"""
+
+    def __init__(self, timestamp: Any, session: Any, mode: Any, difficulty: Any,
+                 x: Any, y: Any, reaction_ms: Any, lagged: Any):
+        """
+        :param timestamp: Время попыток, секунды эпохи Unix (float64)
+        :param session: Номера сессий (int64)
+        :param mode: Режимы (строки)
+        :param difficulty: Уровни сложности (строки)
+        :param x: Координаты стимулов (float64)
+        :param y: Координаты стимулов (float64)
+        :param reaction_ms: Время реакции, мс (float64)
+        :param lagged: Флаги высокой задержки цикла событий (bool)
+        """
+        # Попытки упорядочены по времени
+        order = np.argsort(timestamp, kind="stable")
+        self.timestamp = timestamp[order]
+        self.session = session[order]
+        self.mode = mode[order]
+        self.difficulty = difficulty[order]
+        self.x = x[order]
+        self.y = y[order]
+        self.reaction_ms = reaction_ms[order]
+        self.lagged = lagged[order]
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+
+def _load_sqlite(path: str, profile_id: Optional[int] = None,
+                 chunk_size: int = ANALYTICS["chunk_size"]) -> TrialHistory:
+    """
+    Загружает историю из базы SQLite в заранее выделенные массивы
+
+    Строки читаются порциями через fetchmany(), поэтому кортежей Python
+    в памяти не больше одной порции. Сессии, режимы и сложности
+    кодируются числами по словарям, строки собираются в конце по
+    таблице кодов. Попытки профиля отбираются по индексу
+    (profile_id, timestamp).
+    """
+    where, params = ("", ()) if profile_id is None else (" WHERE profile_id = ?", (profile_id,))
+    connection = sqlite3.connect(path)
+    try:
+        # Чтение в одной транзакции: количество и строки из одного снимка
+        connection.execute("BEGIN")
+        total = connection.execute(f"SELECT COUNT(*) FROM trials{where}", params).fetchone()[0]
+        cursor = connection.execute(
+            "SELECT timestamp, session_id, mode, difficulty, x, y, reaction_ms, lagged "
+            f"FROM trials{where}",
+            params
+        )
+        timestamp = np.empty(total, dtype=np.float64)
+        session = np.empty(total, dtype=np.int64)
+        mode = np.empty(total, dtype=np.int64)
+        difficulty = np.empty(total, dtype=np.int64)
+        x = np.empty(total, dtype=np.float64)
+        y = np.empty(total, dtype=np.float64)
+        reaction_ms = np.empty(total, dtype=np.float64)
+        lagged = np.empty(total, dtype=bool)
+        sessions: Dict[str, int] = {}
+        modes: Dict[str, int] = {}
+        difficulties: Dict[str, int] = {}
+        start = 0
+        while start < total:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            end = start + len(rows)
+            columns = list(zip(*rows))
+            timestamp[start:end] = columns[0]
+            session[start:end] = [sessions.setdefault(v, len(sessions)) for v in columns[1]]
+            mode[start:end] = [modes.setdefault(v, len(modes)) for v in columns[2]]
+            difficulty[start:end] = [
+                difficulties.setdefault(v, len(difficulties)) for v in columns[3]
+            ]
+            x[start:end] = columns[4]
+            y[start:end] = columns[5]
+            reaction_ms[start:end] = columns[6]
+            lagged[start:end] = columns[7]
+            start = end
+    except sqlite3.OperationalError:
+        return _empty()
+    finally:
+        connection.close()
+    if not start:
+        return _empty()
+    return TrialHistory(
+        timestamp[:start],
+        session[:start],
+        np.array(list(modes) or [""])[mode[:start]],
+        np.array(list(difficulties) or [""])[difficulty[:start]],
+        x[:start],
+        y[:start],
+        reaction_ms[:start],
+        lagged[:start]
+    )
+
+
+def _load_binary(path: str, profile_id: Optional[int] = None) -> TrialHistory:
+    """Загружает историю из двоичного журнала (столбцы копируются из mmap)"""
+    from src.utils.trial_log import DIFFICULTY_CODES, MODE_CODES, TrialLogReader
+
+    if not os.path.exists(path):
+        return _empty()
+    # Неизвестные коды (255) отображаются в пустую строку
+    modes = np.array(MODE_CODES + ("",) * (256 - len(MODE_CODES)))
+    difficulties = np.array(DIFFICULTY_CODES + ("",) * (256 - len(DIFFICULTY_CODES)))
+    with TrialLogReader(path) as reader:
+        if not len(reader):
+            return _empty()
+        records = reader.records()
+        if profile_id is not None:
+            records = records[records['profile_id'] == profile_id]
+            if not len(records):
+                return _empty()
+        history = TrialHistory(
+            records['timestamp'].astype(np.float64),
+            np.unique(records['session'].view('S16'), return_inverse=True)[1].astype(np.int64),
+            modes[records['mode']],
+            difficulties[records['difficulty']],
+            records['x'].astype(np.float64),
+            records['y'].astype(np.float64),
+            records['reaction_ms'].astype(np.float64),
+            records['lagged'].astype(bool)
+        )
+        del records
+    return history
+
+
+def _empty() -> TrialHistory:
+    """Пустая история"""
+    floats = np.empty(0, dtype=np.float64)
+    strings = np.empty(0, dtype="U1")
+    return TrialHistory(floats, np.empty(0, dtype=np.int64), strings, strings,
+                        floats, floats, floats, np.empty(0, dtype=bool))
+
+
+class Analytics:
+    def __init__(self, backend: str = TRIALS["backend"],
+                 profile_id: Optional[int] = None):
+        """
+        Инициализация аналитики
+
+        История загружается целиком в столбцы NumPy, все расчеты
+        векторные. Результаты кэшируются по параметрам и сбрасываются,
+        когда меняется версия данных (число и последний id строк в базе
+        или размер журнала) или профиль.
+
+        :param backend: Хранилище попыток: "sqlite" или "binary"
+        :param profile_id: Профиль, чьи попытки анализируются (None - все);
+            можно менять, история перезагрузится при следующем refresh()
+        """
+        if np is None:
+            raise RuntimeError("Для аналитики нужен NumPy")
+        self.backend = backend
+        self.profile_id = profile_id
+        self.path = TRIALS["db_file"] if backend == "sqlite" else TRIALS["log_file"]
+        self.version: Optional[Hashable] = None
+        self._history: Optional[TrialHistory] = None
+        self._cache: Dict[Hashable, Any] = {}
+
+    def data_version(self) -> Hashable:
+        """Текущая версия данных в хранилище"""
+        if not os.path.exists(self.path):
+            return None
+        if self.backend == "binary":
+            return os.path.getsize(self.path)
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute("SELECT COUNT(*), MAX(id) FROM trials").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            connection.close()
+
+    def refresh(self) -> bool:
+        """
+        Перезагружает историю, если данные изменились
+
+        :return: True, если история была перезагружена
+        """
+        profile_id = self.profile_id
+        version = (profile_id, self.data_version())
+        if self._history is not None and version == self.version:
+            return False
+        if self.backend == "binary":
+            self._history = _load_binary(self.path, profile_id)
+        else:
+            self._history = _load_sqlite(self.path, profile_id)
+        self.version = version
+        self._cache.clear()
+        return True
+
+    @property
+    def history(self) -> TrialHistory:
+        """Загруженная история"""
+        if self._history is None:
+            self.refresh()
+        return self._history
+
+    def _cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Возвращает результат из кэша текущей версии данных"""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _select(self, mode: Optional[str], difficulty: Optional[str]) -> Any:
+        """Маска попыток режима и сложности"""
+        history = self.history
+        mask = np.ones(len(history), dtype=bool)
+        if mode is not None:
+            mask &= history.mode == mode
+        if difficulty is not None:
+            mask &= history.difficulty == difficulty
+        return mask
+
+    def clean_mask(self, min_ms: float = ANALYTICS["min_ms"],
+                   max_sd: float = ANALYTICS["max_sd"]) -> Any:
+        """
+        Маска попыток без упреждений и выбросов
+
+        Отбрасываются попытки быстрее min_ms (упреждение) и отличающиеся
+        от среднего своей группы (режим и сложность) больше чем на
+        max_sd стандартных отклонений. Попытки при высокой задержке
+        цикла событий тоже отбрасываются.
+
+        :return: Булев массив по всем попыткам
+        """
+        def compute() -> Any:
+            history = self.history
+            rt = history.reaction_ms
+            valid = (rt >= min_ms) & ~history.lagged
+            if not len(rt):
+                return valid
+            groups = np.unique(
+                np.char.add(np.char.add(history.mode, "/"), history.difficulty),
+                return_inverse=True
+            )[1]
+            weights = valid.astype(np.float64)
+            counts = np.bincount(groups, weights=weights)
+            sums = np.bincount(groups, weights=rt * weights)
+            squares = np.bincount(groups, weights=rt * rt * weights)
+            safe = np.maximum(counts, 1)
+            mean = sums / safe
+            std = np.sqrt(np.maximum(squares / safe - mean * mean, 0))
+            return valid & (np.abs(rt - mean[groups]) <= max_sd * std[groups] + 1e-9)
+        return self._cached(("clean", min_ms, max_sd), compute)
+
+    def _clean(self, mode: Optional[str], difficulty: Optional[str]) -> Any:
+        """Маска чистых попыток режима и сложности"""
+        return self._select(mode, difficulty) & self.clean_mask()
+
+    def summary(self, mode: Optional[str] = None,
+                difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Сводка по чистым попыткам
+
+        :return: Словарь с количеством (всего и после очистки), средним,
+            СКО и перцентилями, мс
+        """
+        def compute() -> Dict[str, Any]:
+            selected = self._select(mode, difficulty)
+            rt = self.history.reaction_ms[selected & self.clean_mask()]
+            result = {'total': int(selected.sum()), 'count': int(len(rt))}
+            if len(rt):
+                p50, p90, p99 = np.percentile(rt, [50, 90, 99])
+                result.update(mean=float(rt.mean()), std=float(rt.std()),
+                              p50=float(p50), p90=float(p90), p99=float(p99))
+            return result
+        return self._cached(("summary", mode, difficulty), compute)
+
+    def rolling_mean(self, window: int = ANALYTICS["window"],
+                     mode: Optional[str] = None,
+                     difficulty: Optional[str] = None) -> Any:
+        """
+        Скользящее среднее времени реакции по чистым попыткам
+
+        :param window: Размер окна, попыток
+        :return: Массив длиной max(0, n - window + 1)
+        """
+        def compute() -> Any:
+            rt = self.history.reaction_ms[self._clean(mode, difficulty)]
+            if len(rt) < window:
+                return np.empty(0)
+            sums = np.cumsum(np.concatenate(([0.0], rt)))
+            return (sums[window:] - sums[:-window]) / window
+        return self._cached(("rolling", window, mode, difficulty), compute)
+
+    def learning_curve(self, mode: Optional[str] = None,
+                       difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Кривая обучения: среднее время реакции по сессиям
+
+        :return: Словарь массивов 'start' (начало сессии), 'mean', 'count',
+            упорядоченных по началу сессии
+        """
+        def compute() -> Dict[str, Any]:
+            mask = self._clean(mode, difficulty)
+            history = self.history
+            sessions, index = np.unique(history.session[mask], return_inverse=True)
+            if not len(sessions):
+                return {'start': np.empty(0), 'mean': np.empty(0), 'count': np.empty(0)}
+            count = np.bincount(index)
+            mean = np.bincount(index, weights=history.reaction_ms[mask]) / count
+            start = np.full(len(sessions), np.inf)
+            np.minimum.at(start, index, history.timestamp[mask])
+            order = np.argsort(start)
+            return {'start': start[order], 'mean': mean[order], 'count': count[order]}
+        return self._cached(("learning", mode, difficulty), compute)
+
+    def region_map(self, width: float, height: float,
+                   grid: Tuple[int, int] = ANALYTICS["grid"],
+                   mode: Optional[str] = None,
+                   difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Среднее время реакции по областям экрана
+
+        :param width: Ширина поля, пиксели
+        :param height: Высота поля, пиксели
+        :param grid: Число столбцов и строк сетки
+        :return: Словарь массивов 'mean' и 'count' формы (строки, столбцы);
+            в пустых ячейках среднее равно NaN
+        """
+        def compute() -> Dict[str, Any]:
+            mask = self._clean(mode, difficulty)
+            history = self.history
+            columns, rows = grid
+            edges = (np.linspace(0, height, rows + 1), np.linspace(0, width, columns + 1))
+            y = np.clip(history.y[mask], 0, height)
+            x = np.clip(history.x[mask], 0, width)
+            count, _, _ = np.histogram2d(y, x, bins=edges)
+            total, _, _ = np.histogram2d(y, x, bins=edges, weights=history.reaction_ms[mask])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, total / count, np.nan)
+            return {'mean': mean, 'count': count.astype(np.int64)}
+        return self._cached(("region", width, height, grid, mode, difficulty), compute)
+
+    def compare(self, split: float, mode: Optional[str] = None,
+                difficulty: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Сравнение чистых попыток до и после момента времени
+
+        :param split: Граница, секунды эпохи Unix
+        :return: Словарь со сводками 'before' и 'after', разностью средних
+            (после минус до), t-статистикой Уэлча и размером эффекта d Коэна
+        """
+        def compute() -> Dict[str, Any]:
+            mask = self._clean(mode, difficulty)
+            history = self.history
+            rt = history.reaction_ms[mask]
+            after = history.timestamp[mask] >= split
+            parts = {}
+            for name, values in (('before', rt[~after]), ('after', rt[after])):
+                parts[name] = {
+                    'count': int(len(values)),
+                    'mean': float(values.mean()) if len(values) else float("nan"),
+                    'var': float(values.var(ddof=1)) if len(values) > 1 else float("nan")
+                }
+            before, later = parts['before'], parts['after']
+            diff = later['mean'] - before['mean']
+            se = np.sqrt(before['var'] / max(before['count'], 1) +
+                         later['var'] / max(later['count'], 1))
+            pooled = np.sqrt((before['var'] + later['var']) / 2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return {
+                    'before': before,
+                    'after': later,
+                    'diff': diff,
+                    't': float(np.divide(diff, se)),
+                    'd': float(np.divide(diff, pooled))
+                }
+        return self._cached(("compare", split, mode, difficulty), compute)
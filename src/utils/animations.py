@@ -2,12 +2,52 @@
 Модуль с утилитами для анимаций
 """
 import tkinter as tk
-from typing import List, Callable, Optional
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+from src.utils.frame_clock import AnimationScheduler
+from src.utils.pool import CanvasItemPool
+from src.utils.palette import ramp
 from src.utils.settings import ANIMATION
+from src.utils.tracing import traced
 
+# Кэш изображений градиента: (ширина, высота, цвет1, цвет2) -> изображение
+_gradient_cache: "OrderedDict[Tuple[int, int, str, str], tk.PhotoImage]" = OrderedDict()
 
-def create_gradient(canvas: tk.Canvas, color1: str, color2: str) -> None:
-    """Создает градиентный фон на канвасе"""
+
+def get_gradient_image(canvas: tk.Canvas, width: int, height: int,
+                       color1: str, color2: str) -> tk.PhotoImage:
+    """
+    Возвращает изображение вертикального градиента из кэша
+
+    Изображение строится один раз для каждой комбинации размеров и цветов:
+    сначала столбец шириной в один пиксель, затем он растягивается по ширине.
+
+    :return: Изображение градиента
+    """
+    key = (width, height, color1, color2)
+    image = _gradient_cache.get(key)
+    if image is not None:
+        _gradient_cache.move_to_end(key)
+        return image
+
+    colors = ramp(color1, color2, height, endpoint=False)
+    column = tk.PhotoImage(master=canvas, width=1, height=height)
+    column.put("{" + "} {".join(colors) + "}")
+    image = column.zoom(width, 1)
+
+    _gradient_cache[key] = image
+    while len(_gradient_cache) > ANIMATION["gradient_cache_size"]:
+        _gradient_cache.popitem(last=False)
+    return image
+
+
+@traced("create_gradient", "render")
+def create_gradient(canvas: tk.Canvas, color1: str, color2: str) -> Optional[int]:
+    """
+    Создает градиентный фон на канвасе одним элементом-изображением
+
+    :return: ID элемента фона
+    """
     width = canvas.winfo_width()
     height = canvas.winfo_height()
     
@@ -16,39 +56,38 @@ def create_gradient(canvas: tk.Canvas, color1: str, color2: str) -> None:
         width = canvas.winfo_width()
         height = canvas.winfo_height()
     
-    for i in range(height):
-        # Вычисляем цвет для текущей строки
-        ratio = i / height
-        r1, g1, b1 = [int(color1[i:i+2], 16) for i in (1, 3, 5)]
-        r2, g2, b2 = [int(color2[i:i+2], 16) for i in (1, 3, 5)]
-        r = int(r1 * (1 - ratio) + r2 * ratio)
-        g = int(g1 * (1 - ratio) + g2 * ratio)
-        b = int(b1 * (1 - ratio) + b2 * ratio)
-        color = f'#{r:02x}{g:02x}{b:02x}'
-        canvas.create_line(0, i, width, i, fill=color)
-
-
-def animate_shape(canvas: tk.Canvas, shape_id: int, 
+    canvas.delete("gradient")
+    if width <= 1 or height <= 1:
+        return None
+
+    image = get_gradient_image(canvas, width, height, color1, color2)
+    item = canvas.create_image(0, 0, image=image, anchor="nw", tags="gradient")
+    canvas.tag_lower(item)
+    return item
+
+
+def animate_shape(animator: AnimationScheduler, shape_id: int,
                  start_scale: float = 0.1, end_scale: float = 1.0,
-                 on_complete: Optional[Callable] = None) -> str:
+                 on_complete: Optional[Callable] = None,
+                 owner: Optional[Hashable] = None) -> Optional[int]:
     """
     Анимация появления фигуры
     
-    :return: ID анимации
+    :param animator: Планировщик анимаций
+    :param owner: Владелец анимации для групповой отмены
+    :return: Дескриптор анимации
     """
+    canvas = animator.canvas
     coords = canvas.coords(shape_id)
     if not coords:
-        return ""
+        return None
         
     # Находим центр фигуры
     center_x = sum(coords[::2]) / len(coords[::2])
     center_y = sum(coords[1::2]) / len(coords[1::2])
     
-    def animate_step(step: int) -> None:
-        if not canvas.winfo_exists():
-            return
-            
-        scale = start_scale + (end_scale - start_scale) * (step / ANIMATION["steps"])
+    def animate_step(progress: float) -> None:
+        scale = start_scale + (end_scale - start_scale) * progress
         
         # Масштабируем координаты относительно центра
         new_coords = []
@@ -58,83 +97,80 @@ def animate_shape(canvas: tk.Canvas, shape_id: int,
             new_coords.extend([x, y])
             
         canvas.coords(shape_id, *new_coords)
-        
-        if step < ANIMATION["steps"]:
-            return canvas.after(ANIMATION["speed"], lambda: animate_step(step + 1))
-        elif on_complete:
-            on_complete()
-            return ""
     
-    return animate_step(0) or ""
+    return animator.add(animate_step, ANIMATION["duration"], owner, on_complete)
 
 
-def create_flash_effect(canvas: tk.Canvas, x: int, y: int, color: str) -> List[str]:
+def create_flash_effect(animator: AnimationScheduler, x: int, y: int, color: str,
+                        pool: Optional[CanvasItemPool] = None,
+                        owner: Optional[Hashable] = None) -> int:
     """
     Создает эффект вспышки при клике
     
-    :return: Список ID анимаций
+    :param animator: Планировщик анимаций
+    :param pool: Пул элементов, из которого берутся кольца
+    :param owner: Владелец анимации для групповой отмены
+    :return: Дескриптор анимации
     """
-    animation_ids = []
+    canvas = animator.canvas
     rings = []
+    # Кольца затухают от цвета вспышки к цвету фона
+    fade_colors = ramp(color, "bg", 10)
     
     for i in range(ANIMATION["flash_rings"]):
         radius = ANIMATION["flash_radius"] * (1 - i/ANIMATION["flash_rings"])
-        ring = canvas.create_oval(
-            x - radius, y - radius,
-            x + radius, y + radius,
-            fill=color,
-            outline="",
-            width=2
-        )
+        ring_coords = (x - radius, y - radius, x + radius, y + radius)
+        if pool:
+            ring = pool.acquire("oval", ring_coords, fill=color, outline="", width=2)
+        else:
+            ring = canvas.create_oval(*ring_coords, fill=color, outline="", width=2)
         rings.append(ring)
     
-    def fade_step(step: int, rings: List[int]) -> Optional[str]:
-        if not canvas.winfo_exists():
-            return None
-            
-        if step >= 10 or not rings:
-            for ring in rings:
-                canvas.delete(ring)
-            return None
+    def fade_step(progress: float) -> None:
+        color = fade_colors[round(progress * (len(fade_colors) - 1))]
         
         # Изменяем размер колец
         for i, ring in enumerate(rings):
-            radius = ANIMATION["flash_radius"] * (1 - i/ANIMATION["flash_rings"]) * (1 + step/10)
+            radius = ANIMATION["flash_radius"] * (1 - i/ANIMATION["flash_rings"]) * (1 + progress)
             canvas.coords(
                 ring,
                 x - radius, y - radius,
                 x + radius, y + radius
             )
-        
-        return canvas.after(20, lambda: fade_step(step + 1, rings))
+            canvas.itemconfig(ring, fill=color)
     
-    animation_id = fade_step(0, rings)
-    if animation_id:
-        animation_ids.append(animation_id)
+    def remove_rings() -> None:
+        for ring in rings:
+            if pool:
+                pool.release(ring)
+            else:
+                canvas.delete(ring)
     
-    return animation_ids
+    return animator.add(
+        fade_step, ANIMATION["flash_duration"], owner, remove_rings, easing="linear"
+    )
 
 
-def animate_text(canvas: tk.Canvas, text_id: int, center_x: int, center_y: int,
+def animate_text(animator: AnimationScheduler, text_id: int,
+                center_x: int, center_y: int,
                 start_scale: float = 0.1, end_scale: float = 1.0,
-                on_complete: Optional[Callable] = None) -> str:
+                on_complete: Optional[Callable] = None,
+                owner: Optional[Hashable] = None) -> int:
     """
     Анимация появления текста
     
-    :return: ID анимации
+    :param animator: Планировщик анимаций
+    :param owner: Владелец анимации для групповой отмены
+    :return: Дескриптор анимации
     """
-    canvas.scale(text_id, center_x, center_y, start_scale, start_scale)
+    canvas = animator.canvas
+    current = [1.0]
     
-    def animate_step(step: int) -> Optional[str]:
-        if not canvas.winfo_exists():
-            return None
-            
-        if step <= 10:
-            scale = start_scale + (end_scale - start_scale) * (step / 10)
-            canvas.scale(text_id, center_x, center_y, scale, scale)
-            return canvas.after(ANIMATION["speed"], lambda: animate_step(step + 1))
-        elif on_complete:
-            on_complete()
-            return None
+    def animate_step(progress: float) -> None:
+        scale = start_scale + (end_scale - start_scale) * progress
+        # canvas.scale накапливается, поэтому применяем отношение масштабов
+        factor = scale / current[0]
+        canvas.scale(text_id, center_x, center_y, factor, factor)
+        current[0] = scale
     
-    return animate_step(0) or ""
\ No newline at end of file
+    return animator.add(animate_step, ANIMATION["text_duration"], owner, on_complete)
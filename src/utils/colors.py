@@ -9,6 +9,7 @@ COLORS = {
     "button": "#2a2a2a",
     "primary": "#4a4a4a",
     "flash": "#ffffff",
+    "score_highlight": "#ffff44",
     
     # Градиент фона
     "gradient1": "#1a1a1a",
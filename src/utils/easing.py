@@ -0,0 +1,44 @@
+"""
+Модуль с функциями плавности для анимаций
+"""
+from typing import Callable, Dict
+
+Easing = Callable[[float], float]
+
+
+def linear(t: float) -> float:
+    """Равномерное движение"""
+    return t
+
+
+def ease_out_quad(t: float) -> float:
+    """Быстрый старт и плавное замедление"""
+    return 1 - (1 - t) * (1 - t)
+
+
+def ease_out_cubic(t: float) -> float:
+    """Быстрый старт и более сильное замедление"""
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_quad(t: float) -> float:
+    """Плавный разгон и плавное замедление"""
+    if t < 0.5:
+        return 2 * t * t
+    return 1 - 2 * (1 - t) * (1 - t)
+
+
+def ease_out_back(t: float) -> float:
+    """Замедление с небольшим перелетом конечного значения"""
+    c1 = 1.70158
+    c3 = c1 + 1
+    return 1 + c3 * (t - 1) ** 3 + c1 * (t - 1) ** 2
+
+
+EASINGS: Dict[str, Easing] = {
+    "linear": linear,
+    "ease_out_quad": ease_out_quad,
+    "ease_out_cubic": ease_out_cubic,
+    "ease_in_out_quad": ease_in_out_quad,
+    "ease_out_back": ease_out_back
+}
@@ -0,0 +1,347 @@
+"""
+Модуль с игровой логикой без Tkinter
+
+Движок получает команды (start, stop, advance, mark_onset, click,
+add_points) и возвращает список событий, которые отрисовывает
+GameField. Часы и генератор случайных чисел передаются снаружи, поэтому
+игру можно прогонять без дисплея с подставными часами.
+"""
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from src.utils.colors import COLORS
+from src.utils.hit_test import hit, make_shape
+from src.utils.settings import GAME, WINDOW
+
+# Состояния движка
+IDLE = "idle"          # игра не идет
+WAITING = "waiting"    # стимула нет, ждем следующего появления
+STIMULUS = "stimulus"  # стимул на экране, ждем реакции
+EXTERNAL = "external"  # стимулами управляет режим множества мишеней
+
+# Допустимые переходы между состояниями
+TRANSITIONS = {
+    IDLE: (WAITING, EXTERNAL),
+    WAITING: (STIMULUS, IDLE),
+    STIMULUS: (STIMULUS, WAITING, IDLE),
+    EXTERNAL: (IDLE,)
+}
+
+_NS_PER_MS = 1_000_000
+
+
+def calculate_points(reaction_ms: float, time_limit_ms: float) -> int:
+    """
+    Вычисляет очки в зависимости от времени реакции
+
+    :param reaction_ms: Время реакции, мс
+    :param time_limit_ms: Время, за которое очки падают до минимума, мс
+    :return: Количество очков
+    """
+    max_points = GAME["points"]["max"]
+    min_points = GAME["points"]["min"]
+    return max(
+        min_points,
+        int(max_points * (1 - reaction_ms / time_limit_ms))
+    )
+
+
+class StimulusShown:
+    """Появился стимул"""
+    __slots__ = ("trial", "kind", "coords", "fill", "center", "sound")
+
+    def __init__(self, trial: int, kind: str, coords: List[float], fill: str,
+                 center: Tuple[float, float], sound: bool):
+        self.trial = trial
+        self.kind = kind
+        self.coords = coords
+        self.fill = fill
+        self.center = center
+        self.sound = sound
+
+
+class StimulusExpired:
+    """Стимул сменился следующим без реакции"""
+    __slots__ = ("trial",)
+
+    def __init__(self, trial: int):
+        self.trial = trial
+
+
+class TrialCompleted:
+    """Попадание по стимулу"""
+    __slots__ = ("trial", "reaction_ms", "points", "center")
+
+    def __init__(self, trial: int, reaction_ms: float, points: int,
+                 center: Tuple[float, float]):
+        self.trial = trial
+        self.reaction_ms = reaction_ms
+        self.points = points
+        self.center = center
+
+
+class ScoreChanged:
+    """Изменился текущий или лучший счет"""
+    __slots__ = ("current_score", "best_score")
+
+    def __init__(self, current_score: int, best_score: int):
+        self.current_score = current_score
+        self.best_score = best_score
+
+
+class GameEngine:
+    def __init__(self, clock_ns: Callable[[], int] = time.perf_counter_ns,
+                 rng: Optional[random.Random] = None,
+                 width: int = WINDOW["width"], height: int = WINDOW["height"]):
+        """
+        Инициализация движка
+
+        В режимах color, shape и sound стимул появляется каждые
+        spawn_delay мс; попадание убирает его, и следующий появляется
+        через spawn_delay после клика. Сроки движок не отсчитывает сам:
+        next_deadline_ns говорит, когда вызвать advance(). В режиме multi
+        мишенями управляет MultiTargetMode, а движок ведет только счет.
+
+        :param clock_ns: Часы, нс
+        :param rng: Генератор случайных чисел
+        :param width: Ширина поля
+        :param height: Высота поля
+        """
+        self.clock_ns = clock_ns
+        self.rng = rng or random.Random()
+        self.width = width
+        self.height = height
+        self.phase = IDLE
+        self.mode = "color"
+        self.difficulty = "medium"
+        self.spawn_delay = GAME["spawn_delay"]["medium"]
+        self.current_score = 0
+        self.best_score = 0
+        self.trial = 0
+        self.geometry = None
+        self.onset_ns: Optional[int] = None
+        self.next_deadline_ns: Optional[int] = None
+
+    def _transition(self, phase: str) -> None:
+        """Переводит движок в новое состояние"""
+        if phase not in TRANSITIONS[self.phase]:
+            raise RuntimeError(f"Недопустимый переход {self.phase} -> {phase}")
+        self.phase = phase
+
+    @property
+    def is_running(self) -> bool:
+        """Идет ли игра"""
+        return self.phase != IDLE
+
+    def start(self, mode: str, difficulty: str, current_score: int = 0,
+              best_score: int = 0) -> List[object]:
+        """
+        Начинает игру; в одиночных режимах сразу показывает стимул
+
+        :return: События
+        """
+        if self.phase != IDLE:
+            self.stop()
+        self.mode = mode
+        self.difficulty = difficulty
+        self.spawn_delay = GAME["spawn_delay"][difficulty]
+        self.current_score = current_score
+        self.best_score = best_score
+        events: List[object] = [ScoreChanged(current_score, best_score)]
+        if mode == "multi":
+            self._transition(EXTERNAL)
+        else:
+            self._transition(WAITING)
+            events.append(self._spawn(self.clock_ns()))
+        return events
+
+    def stop(self) -> List[object]:
+        """Останавливает игру"""
+        if self.phase != IDLE:
+            self._transition(IDLE)
+        self.geometry = None
+        self.onset_ns = None
+        self.next_deadline_ns = None
+        return []
+
+    def _spawn(self, now_ns: int) -> StimulusShown:
+        """Выбирает и показывает следующий стимул"""
+        size = GAME["shape_size"]
+        padding = size + 20
+        x = self.rng.randint(padding, self.width - padding)
+        y = self.rng.randint(padding, self.height - padding)
+
+        box = [x - size/2, y - size/2, x + size/2, y + size/2]
+        if self.mode == "color":
+            kind, coords = "rectangle", box
+            fill = self.rng.choice(list(COLORS["shapes"].values()))
+        else:
+            if self.mode == "shape":
+                kind = self.rng.choice(["rectangle", "oval", "polygon"])
+            else:  # sound: треугольник со звуковым сигналом
+                kind = "polygon"
+            coords = box
+            if kind == "polygon":  # треугольник
+                coords = [
+                    x, y - size/2,
+                    x - size/2, y + size/2,
+                    x + size/2, y + size/2
+                ]
+            fill = COLORS["shapes"]["default"]
+
+        self._transition(STIMULUS)
+        self.trial += 1
+        self.geometry = make_shape(kind, coords)
+        # До отметки от отрисовщика время появления - момент показа
+        self.onset_ns = now_ns
+        self.next_deadline_ns = now_ns + self.spawn_delay * _NS_PER_MS
+        return StimulusShown(
+            self.trial, kind, coords, fill, self.geometry.center,
+            self.mode == "sound"
+        )
+
+    def advance(self, now_ns: Optional[int] = None) -> List[object]:
+        """
+        Обрабатывает наступившие сроки
+
+        :param now_ns: Текущее время (по умолчанию по часам движка), нс
+        :return: События
+        """
+        if now_ns is None:
+            now_ns = self.clock_ns()
+        events: List[object] = []
+        if self.next_deadline_ns is None or now_ns < self.next_deadline_ns:
+            return events
+        if self.phase == STIMULUS:
+            events.append(StimulusExpired(self.trial))
+        events.append(self._spawn(now_ns))
+        return events
+
+    def mark_onset(self, onset_ns: int) -> None:
+        """Уточняет время появления стимула (после его отрисовки), нс"""
+        if self.phase == STIMULUS:
+            self.onset_ns = onset_ns
+
+    def click(self, x: float, y: float,
+              at_ns: Optional[int] = None) -> List[object]:
+        """
+        Обрабатывает клик
+
+        :param x: Координата x
+        :param y: Координата y
+        :param at_ns: Время клика (по умолчанию по часам движка), нс
+        :return: События (пустой список при промахе)
+        """
+        if self.phase != STIMULUS or not hit(self.geometry, x, y):
+            return []
+        if at_ns is None:
+            at_ns = self.clock_ns()
+        reaction_ms = max(0.0, (at_ns - self.onset_ns) / _NS_PER_MS)
+        points = calculate_points(reaction_ms, self.spawn_delay)
+        center = self.geometry.center
+        self._transition(WAITING)
+        self.geometry = None
+        self.onset_ns = None
+        self.next_deadline_ns = self.clock_ns() + self.spawn_delay * _NS_PER_MS
+        return [
+            TrialCompleted(self.trial, reaction_ms, points, center),
+            self._add(points)
+        ]
+
+    def add_points(self, points: int) -> List[object]:
+        """Начисляет очки (или снимает штраф)"""
+        return [self._add(points)]
+
+    def _add(self, points: int) -> ScoreChanged:
+        self.current_score = max(0, self.current_score + points)
+        if self.current_score > self.best_score:
+            self.best_score = self.current_score
+        return ScoreChanged(self.current_score, self.best_score)
+
+    def reset_scores(self, best_score: int) -> List[object]:
+        """Сбрасывает счет (например, при смене профиля)"""
+        self.current_score = 0
+        self.best_score = best_score
+        return [ScoreChanged(0, best_score)]
+
+
+class ManualClock:
+    """Подставные часы, которые идут только по команде"""
+    __slots__ = ("now",)
+
+    def __init__(self, start_ns: int = 0):
+        self.now = start_ns
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, delta_ns: int) -> None:
+        self.now += delta_ns
+
+    def set(self, now_ns: int) -> None:
+        self.now = max(self.now, now_ns)
+
+
+def simulate(trials: int, mode: str = "color", difficulty: str = "medium",
+             seed: Optional[int] = None,
+             respond: Optional[Callable[[random.Random], Optional[float]]] = None,
+             best_score: int = 0) -> Dict[str, object]:
+    """
+    Прогоняет игру без дисплея
+
+    :param trials: Количество показанных стимулов
+    :param mode: Режим игры (кроме multi)
+    :param difficulty: Уровень сложности
+    :param seed: Начальное значение генератора
+    :param respond: Функция, возвращающая время реакции игрока, мс
+        (None - пропуск стимула); по умолчанию нормальное 300 ± 50 мс
+    :param best_score: Лучший счет до игры
+    :return: Словарь с количеством попаданий и пропусков, временами
+        реакции и итоговым счетом
+    """
+    if mode == "multi":
+        raise ValueError("Режим multi не моделируется движком")
+    rng = random.Random(seed)
+    if respond is None:
+        def respond(r: random.Random) -> Optional[float]:
+            return max(100.0, r.gauss(300.0, 50.0))
+    clock = ManualClock()
+    engine = GameEngine(clock, rng)
+    hits = misses = 0
+    reactions: List[float] = []
+
+    shown = _last_stimulus(engine.start(mode, difficulty, 0, best_score))
+    while True:
+        reaction_ms = respond(rng)
+        deadline = engine.next_deadline_ns
+        if reaction_ms is not None:
+            at_ns = engine.onset_ns + int(reaction_ms * _NS_PER_MS)
+            if at_ns < deadline:
+                clock.set(at_ns)
+                x, y = shown.center
+                for event in engine.click(x, y, at_ns):
+                    if isinstance(event, TrialCompleted):
+                        hits += 1
+                        reactions.append(event.reaction_ms)
+        if engine.phase == STIMULUS:
+            misses += 1
+        if hits + misses >= trials:
+            break
+        clock.set(engine.next_deadline_ns)
+        shown = _last_stimulus(engine.advance())
+    engine.stop()
+    return {
+        'hits': hits,
+        'misses': misses,
+        'reaction_ms': reactions,
+        'current_score': engine.current_score,
+        'best_score': engine.best_score
+    }
+
+
+def _last_stimulus(events: Sequence[object]) -> StimulusShown:
+    """Последнее событие появления стимула в списке"""
+    for event in reversed(events):
+        if isinstance(event, StimulusShown):
+            return event
+    raise RuntimeError("Стимул не появился")
@@ -0,0 +1,288 @@
+"""
+Модуль с потоковой выгрузкой истории попыток в CSV и JSON Lines
+
+Запуск из командной строки:
+    python -m src.utils.export trials.csv.gz --mode color --since 2026-01-01
+"""
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.utils.settings import EXPORT, TRIALS
+from src.utils.trial_store import TrialRecord
+
+logger = logging.getLogger(__name__)
+
+# Столбцы выгрузки: поля попытки с именем профиля вместо его номера и датой
+COLUMNS = ("datetime", "profile") + tuple(
+    name for name in TrialRecord.FIELDS if name != "profile_id"
+)
+
+Row = Tuple[Any, ...]
+Progress = Callable[[int, float], None]
+
+
+class TrialFilter:
+    """Условия отбора попыток"""
+    __slots__ = ("profile_id", "mode", "difficulty", "since", "until")
+
+    def __init__(self, profile_id: Optional[int] = None, mode: Optional[str] = None,
+                 difficulty: Optional[str] = None, since: Optional[float] = None,
+                 until: Optional[float] = None):
+        """
+        :param profile_id: Идентификатор профиля
+        :param mode: Режим игры
+        :param difficulty: Уровень сложности
+        :param since: Начало периода включительно, секунды эпохи Unix
+        :param until: Конец периода не включительно, секунды эпохи Unix
+        """
+        self.profile_id = profile_id
+        self.mode = mode
+        self.difficulty = difficulty
+        self.since = since
+        self.until = until
+
+    def sql(self) -> Tuple[str, List[Any]]:
+        """Условие WHERE и его параметры"""
+        clauses, params = [], []
+        for column, op, value in (
+            ("profile_id", "=", self.profile_id),
+            ("mode", "=", self.mode),
+            ("difficulty", "=", self.difficulty),
+            ("timestamp", ">=", self.since),
+            ("timestamp", "<", self.until)
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def order(self) -> str:
+        """
+        Порядок выборки, который обслуживает тот же индекс, что и отбор
+
+        При отборе по профилю (или режиму) попытки идут по времени из
+        индекса (profile_id, timestamp) или (mode, timestamp); без них -
+        по профилю и времени из индекса (profile_id, timestamp). Таблица
+        не сортируется целиком.
+        """
+        if self.profile_id is not None or self.mode is not None:
+            return "timestamp"
+        return "profile_id, timestamp"
+
+    def matches(self, record: TrialRecord) -> bool:
+        """Подходит ли попытка"""
+        return (
+            (self.profile_id is None or record.profile_id == self.profile_id)
+            and (self.mode is None or record.mode == self.mode)
+            and (self.difficulty is None or record.difficulty == self.difficulty)
+            and (self.since is None or record.timestamp >= self.since)
+            and (self.until is None or record.timestamp < self.until)
+        )
+
+
+def iter_sqlite(path: str, where: TrialFilter,
+                chunk_size: int = EXPORT["chunk_size"]) -> Iterator[List[Row]]:
+    """
+    Выдает попытки из базы SQLite порциями по chunk_size строк
+
+    Курсор читается через fetchmany(), поэтому в памяти не больше одной
+    порции.
+    """
+    clause, params = where.sql()
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.execute(
+            f"SELECT {', '.join(TrialRecord.FIELDS)} FROM trials{clause} "
+            f"ORDER BY {where.order()}",
+            params
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        connection.close()
+
+
+def iter_binary(path: str, where: TrialFilter,
+                chunk_size: int = EXPORT["chunk_size"]) -> Iterator[List[Row]]:
+    """Выдает попытки из двоичного журнала порциями по chunk_size записей"""
+    from src.utils.trial_log import TrialLogReader
+
+    with TrialLogReader(path) as reader:
+        for start in range(0, len(reader), chunk_size):
+            rows = []
+            for index in range(start, min(start + chunk_size, len(reader))):
+                record = reader.record(index)
+                if where.matches(record):
+                    rows.append(record.as_tuple())
+            if rows:
+                yield rows
+
+
+def iter_trials(where: TrialFilter, backend: str = TRIALS["backend"],
+                chunk_size: int = EXPORT["chunk_size"]) -> Iterator[List[Row]]:
+    """
+    Выдает отобранные попытки порциями из выбранного хранилища
+
+    :param where: Условия отбора
+    :param backend: "sqlite" или "binary"
+    :param chunk_size: Размер порции
+    :return: Генератор списков кортежей в порядке TrialRecord.FIELDS
+    """
+    if backend == "binary":
+        path = TRIALS["log_file"]
+        source = iter_binary
+    else:
+        path = TRIALS["db_file"]
+        source = iter_sqlite
+    if not os.path.exists(path):
+        return iter(())
+    return source(path, where, chunk_size)
+
+
+def _rows(chunks: Iterator[List[Row]],
+          profile_names: Dict[int, str]) -> Iterator[List[Dict[str, Any]]]:
+    """Переводит порции кортежей в порции словарей для выгрузки"""
+    fields = TrialRecord.FIELDS
+    for chunk in chunks:
+        rows = []
+        for values in chunk:
+            record = dict(zip(fields, values))
+            profile_id = record.pop('profile_id')
+            record['lagged'] = int(bool(record['lagged']))
+            rows.append({
+                'datetime': datetime.datetime.fromtimestamp(record['timestamp']).isoformat(
+                    timespec="milliseconds"
+                ),
+                'profile': profile_names.get(profile_id, str(profile_id)),
+                **record
+            })
+        yield rows
+
+
+def export_trials(path: str, where: TrialFilter,
+                  profile_names: Optional[Dict[int, str]] = None,
+                  fmt: Optional[str] = None,
+                  compress: Optional[bool] = None,
+                  backend: str = TRIALS["backend"],
+                  progress: Optional[Progress] = None,
+                  cancel: Optional[threading.Event] = None) -> int:
+    """
+    Выгружает попытки в файл CSV или JSON Lines
+
+    Попытки читаются и пишутся порциями, поэтому память не зависит от
+    размера истории. Запись идет во временный файл, который заменяет
+    целевой только после успешного окончания.
+
+    :param path: Путь к файлу
+    :param where: Условия отбора
+    :param profile_names: Имена профилей по идентификаторам
+    :param fmt: "csv" или "jsonl" (по умолчанию по расширению файла)
+    :param compress: Сжимать gzip (по умолчанию, если путь оканчивается на .gz)
+    :param backend: Хранилище попыток
+    :param progress: Функция (выгружено попыток, секунд с начала) после каждой порции
+    :param cancel: Событие для прерывания выгрузки
+    :return: Количество выгруженных попыток
+    """
+    base = path[:-3] if path.endswith(".gz") else path
+    if compress is None:
+        compress = path.endswith(".gz")
+    if fmt is None:
+        fmt = "jsonl" if base.endswith((".jsonl", ".json")) else "csv"
+
+    started = time.perf_counter()
+    count = 0
+    tmp_path = path + ".part"
+    raw = open(tmp_path, 'wb')
+    try:
+        binary = gzip.GzipFile(fileobj=raw, mode='wb') if compress else raw
+        with io.TextIOWrapper(binary, encoding="utf-8", newline="") as out:
+            writer = None
+            if fmt == "csv":
+                writer = csv.DictWriter(out, fieldnames=COLUMNS)
+                writer.writeheader()
+            chunks = iter_trials(where, backend)
+            for rows in _rows(chunks, profile_names or {}):
+                if cancel is not None and cancel.is_set():
+                    break
+                if writer is not None:
+                    writer.writerows(rows)
+                else:
+                    out.writelines(
+                        json.dumps(row, ensure_ascii=False) + "\n" for row in rows
+                    )
+                count += len(rows)
+                if progress:
+                    progress(count, time.perf_counter() - started)
+        raw.close()
+        if cancel is not None and cancel.is_set():
+            os.remove(tmp_path)
+            return count
+        os.replace(tmp_path, path)
+    except BaseException:
+        raw.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info("exported %d trials to %s in %.1f s (%.0f trials/s)",
+                count, path, elapsed, count / elapsed if elapsed else 0.0)
+    return count
+
+
+def _parse_date(value: str) -> float:
+    """Дата или дата и время ISO в секунды эпохи Unix"""
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Выгрузка истории попыток из командной строки"""
+    from src.utils.profiles import ProfileStore
+
+    parser = argparse.ArgumentParser(description="Выгрузка истории попыток")
+    parser.add_argument("output", help="файл .csv или .jsonl, можно с .gz")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="формат вместо расширения")
+    parser.add_argument("--backend", choices=("sqlite", "binary"), default=TRIALS["backend"])
+    parser.add_argument("--profile", help="имя профиля")
+    parser.add_argument("--mode", help="режим игры")
+    parser.add_argument("--difficulty", help="уровень сложности")
+    parser.add_argument("--since", type=_parse_date, help="начало периода (ISO)")
+    parser.add_argument("--until", type=_parse_date, help="конец периода (ISO)")
+    args = parser.parse_args(argv)
+
+    # Выгрузка только читает: каталог и индекс профилей не создаются
+    profiles = ProfileStore(read_only=True)
+    names = profiles.id_names()
+    profile_id = None
+    if args.profile is not None:
+        if args.profile not in profiles.names():
+            parser.error(f"профиль не найден: {args.profile}")
+        profile_id = profiles.profile_id(args.profile)
+
+    def report(count: int, elapsed: float) -> None:
+        rate = count / elapsed if elapsed else 0.0
+        print(f"\r{count} попыток, {rate:.0f}/с", end="", flush=True)
+
+    count = export_trials(
+        args.output,
+        TrialFilter(profile_id, args.mode, args.difficulty, args.since, args.until),
+        names, args.format, backend=args.backend, progress=report
+    )
+    print(f"\rВыгружено попыток: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""
+Модуль с общим планировщиком анимаций
+"""
+import time
+import tkinter as tk
+from typing import Callable, Dict, Hashable, Optional, Union
+from src.utils.easing import EASINGS, Easing
+from src.utils.settings import ANIMATION
+from src.utils.tracing import traced
+
+
+class Tween:
+    """Анимация, которую продвигает планировщик"""
+    __slots__ = ("step", "start", "duration", "easing", "owner", "on_complete")
+
+    def __init__(self, step: Callable[[float], None], start: float,
+                 duration: float, easing: Easing,
+                 owner: Optional[Hashable] = None,
+                 on_complete: Optional[Callable] = None):
+        """
+        :param step: Функция кадра, получает прогресс от 0 до 1
+        :param start: Время начала по монотонным часам, с
+        :param duration: Длительность, с
+        :param easing: Функция плавности
+        :param owner: Владелец анимации для групповой отмены
+        :param on_complete: Функция, вызываемая после последнего кадра
+        """
+        self.step = step
+        self.start = start
+        self.duration = duration
+        self.easing = easing
+        self.owner = owner
+        self.on_complete = on_complete
+
+    def progress(self, now: float) -> float:
+        """Возвращает долю пройденного времени от 0 до 1"""
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, (now - self.start) / self.duration)
+
+
+class AnimationScheduler:
+    def __init__(self, canvas: tk.Canvas, frame_ms: int = ANIMATION["speed"],
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Инициализация планировщика
+
+        Все активные анимации продвигаются за один проход в одном
+        обработчике after() на кадр. Состояние анимации вычисляется по
+        монотонным часам, поэтому при опоздании кадра анимация сразу
+        переходит в нужное состояние, а не замедляется.
+
+        :param canvas: Канвас, на котором выполняются анимации
+        :param frame_ms: Интервал между кадрами в мс
+        :param clock: Монотонные часы в секундах
+        """
+        self.canvas = canvas
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self._tweens: Dict[int, Tween] = {}
+        self._next_handle = 1
+        self._after_id: Optional[str] = None
+        self._last_tick: Optional[float] = None
+        self.frame_count = 0
+        self.dropped_frames = 0
+
+    @property
+    def active_count(self) -> int:
+        """Количество активных анимаций"""
+        return len(self._tweens)
+
+    def add(self, step: Callable[[float], None], duration_ms: float,
+            owner: Optional[Hashable] = None,
+            on_complete: Optional[Callable] = None,
+            easing: Union[str, Easing] = ANIMATION["easing"]) -> int:
+        """
+        Добавляет анимацию и сразу рисует ее первый кадр
+
+        :param step: Функция кадра, получает прогресс от 0 до 1
+            после применения функции плавности
+        :param duration_ms: Длительность анимации в мс
+        :param owner: Владелец анимации для групповой отмены
+        :param on_complete: Функция, вызываемая после последнего кадра
+        :param easing: Функция плавности или ее имя из EASINGS
+        :return: Дескриптор анимации
+        """
+        if isinstance(easing, str):
+            easing = EASINGS[easing]
+
+        handle = self._next_handle
+        self._next_handle += 1
+        self._tweens[handle] = Tween(
+            step, self.clock(), duration_ms / 1000, easing, owner, on_complete
+        )
+        step(easing(0.0))
+
+        if self._after_id is None:
+            self._last_tick = self.clock()
+            self._after_id = self.canvas.after(self.frame_ms, self._tick)
+        return handle
+
+    def cancel(self, handle: Optional[int]) -> bool:
+        """
+        Отменяет анимацию по дескриптору
+
+        :return: True, если анимация была активна
+        """
+        removed = self._tweens.pop(handle, None) is not None
+        self._stop_if_idle()
+        return removed
+
+    def cancel_owner(self, owner: Hashable) -> int:
+        """
+        Отменяет все анимации владельца
+
+        :return: Количество отмененных анимаций
+        """
+        handles = [h for h, tween in self._tweens.items() if tween.owner == owner]
+        for handle in handles:
+            del self._tweens[handle]
+        self._stop_if_idle()
+        return len(handles)
+
+    def cancel_all(self) -> None:
+        """Отменяет все анимации"""
+        self._tweens.clear()
+        self._stop_if_idle()
+
+    def take_dropped_frames(self) -> int:
+        """
+        Возвращает количество пропущенных кадров с прошлого вызова и сбрасывает его
+
+        :return: Количество кадров
+        """
+        dropped, self.dropped_frames = self.dropped_frames, 0
+        return dropped
+
+    def _stop_if_idle(self) -> None:
+        """Останавливает таймер, если анимаций не осталось"""
+        if not self._tweens and self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+            self._after_id = None
+
+    @traced("animation.tick", "animation")
+    def _tick(self) -> None:
+        """Продвигает все активные анимации на один кадр"""
+        self._after_id = None
+        if not self.canvas.winfo_exists():
+            self._tweens.clear()
+            return
+
+        now = self.clock()
+        # Кадры, которые не успели отрисоваться из-за загрузки цикла событий
+        if self._last_tick is not None:
+            frame_time_ms = (now - self._last_tick) * 1000
+            late_frames = int(frame_time_ms / self.frame_ms) - 1
+            if late_frames > 0:
+                self.dropped_frames += late_frames
+        self._last_tick = now
+        self.frame_count += 1
+
+        for handle, tween in list(self._tweens.items()):
+            # Анимация могла быть отменена другой анимацией в этом же кадре
+            if self._tweens.get(handle) is not tween:
+                continue
+            progress = tween.progress(now)
+            tween.step(tween.easing(progress))
+            if progress >= 1.0:
+                self._tweens.pop(handle, None)
+                if tween.on_complete:
+                    tween.on_complete()
+
+        if self._tweens and self._after_id is None:
+            self._after_id = self.canvas.after(self.frame_ms, self._tick)
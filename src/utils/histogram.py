@@ -0,0 +1,134 @@
+"""
+Модуль с гистограммой с логарифмическими корзинами
+"""
+from typing import Any, Dict, List, Optional
+
+
+class LogHistogram:
+    def __init__(self, unit: float = 0.001, sub_bits: int = 3, max_bits: int = 32):
+        """
+        Инициализация гистограммы
+
+        Корзины устроены как в HDR Histogram: значения переводятся в
+        целые единицы, каждый интервал [2^k, 2^(k+1)) делится на
+        2^sub_bits равных корзин. Относительная ошибка не превышает
+        1 / 2^sub_bits, а число корзин фиксировано, поэтому память не
+        зависит от количества значений.
+
+        :param unit: Размер единицы (например 0.001 мс = 1 мкс)
+        :param sub_bits: Точность: 2^sub_bits корзин на удвоение
+        :param max_bits: Значения до 2^max_bits единиц, большие обрезаются
+        """
+        self.unit = unit
+        self.sub_bits = sub_bits
+        self.max_bits = max_bits
+        self._sub = 1 << sub_bits
+        self.counts: List[int] = [0] * ((max_bits - sub_bits + 1) * self._sub)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, units: int) -> int:
+        """Номер корзины для значения в единицах"""
+        if units < self._sub:
+            return units
+        shift = units.bit_length() - self.sub_bits - 1
+        return min(
+            (shift + 1) * self._sub + ((units >> shift) - self._sub),
+            len(self.counts) - 1
+        )
+
+    def _bucket_value(self, index: int) -> float:
+        """Середина корзины в исходных величинах"""
+        if index < self._sub:
+            return index * self.unit
+        shift = index // self._sub - 1
+        mantissa = self._sub + index % self._sub
+        low = mantissa << shift
+        high = (mantissa + 1) << shift
+        return (low + high - 1) / 2 * self.unit
+
+    def record(self, value: float) -> None:
+        """Добавляет значение"""
+        value = max(0.0, value)
+        self.counts[self._index(int(value / self.unit))] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Возвращает приблизительный перцентиль
+
+        :param p: Перцентиль от 0 до 100
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                value = self._bucket_value(index)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def count_above(self, value: float) -> int:
+        """Количество значений в корзинах выше заданного"""
+        start = self._index(int(value / self.unit)) + 1
+        return sum(self.counts[start:])
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Добавляет значения другой гистограммы с теми же параметрами"""
+        if (other.unit, other.sub_bits, other.max_bits) != (self.unit, self.sub_bits, self.max_bits):
+            raise ValueError("Гистограммы с разными параметрами нельзя объединить")
+        for index, bucket in enumerate(other.counts):
+            self.counts[index] += bucket
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def reset(self) -> None:
+        """Удаляет все значения"""
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализует гистограмму (только непустые корзины)"""
+        return {
+            'unit': self.unit,
+            'sub_bits': self.sub_bits,
+            'max_bits': self.max_bits,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {str(i): c for i, c in enumerate(self.counts) if c}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogHistogram":
+        """Восстанавливает гистограмму из словаря to_dict()"""
+        histogram = cls(data['unit'], data['sub_bits'], data['max_bits'])
+        for index, bucket in data['buckets'].items():
+            histogram.counts[int(index)] = bucket
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
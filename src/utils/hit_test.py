@@ -0,0 +1,144 @@
+"""
+Модуль с геометрической проверкой попадания по стимулам
+"""
+import math
+from typing import Sequence, Tuple
+from src.utils.settings import GAME
+
+Point = Tuple[float, float]
+
+
+class RectShape:
+    """Прямоугольник, заданный углами"""
+    __slots__ = ("x0", "y0", "x1", "y1")
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float):
+        self.x0, self.x1 = min(x0, x1), max(x0, x1)
+        self.y0, self.y1 = min(y0, y1), max(y0, y1)
+
+    @property
+    def center(self) -> Point:
+        return (self.x0 + self.x1) / 2, (self.y0 + self.y1) / 2
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        return self.x0, self.y0, self.x1, self.y1
+
+    def contains(self, x: float, y: float, tolerance: float = 0) -> bool:
+        """Проверяет, лежит ли точка внутри прямоугольника"""
+        return (self.x0 - tolerance <= x <= self.x1 + tolerance
+                and self.y0 - tolerance <= y <= self.y1 + tolerance)
+
+
+class OvalShape:
+    """Эллипс, вписанный в прямоугольник"""
+    __slots__ = ("cx", "cy", "rx", "ry")
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float):
+        self.cx = (x0 + x1) / 2
+        self.cy = (y0 + y1) / 2
+        self.rx = abs(x1 - x0) / 2
+        self.ry = abs(y1 - y0) / 2
+
+    @property
+    def center(self) -> Point:
+        return self.cx, self.cy
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        return self.cx - self.rx, self.cy - self.ry, self.cx + self.rx, self.cy + self.ry
+
+    def contains(self, x: float, y: float, tolerance: float = 0) -> bool:
+        """Проверяет, лежит ли точка внутри эллипса, расширенного на допуск"""
+        rx = self.rx + tolerance
+        ry = self.ry + tolerance
+        if rx <= 0 or ry <= 0:
+            return False
+        dx = (x - self.cx) / rx
+        dy = (y - self.cy) / ry
+        return dx * dx + dy * dy <= 1
+
+
+class TriangleShape:
+    """Треугольник, заданный тремя вершинами"""
+    __slots__ = ("points",)
+
+    def __init__(self, points: Sequence[float]):
+        self.points = (
+            (points[0], points[1]),
+            (points[2], points[3]),
+            (points[4], points[5])
+        )
+
+    @property
+    def center(self) -> Point:
+        return (
+            sum(p[0] for p in self.points) / 3,
+            sum(p[1] for p in self.points) / 3
+        )
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def contains(self, x: float, y: float, tolerance: float = 0) -> bool:
+        """Проверяет, лежит ли точка внутри треугольника или рядом с его сторонами"""
+        (ax, ay), (bx, by), (cx, cy) = self.points
+        d1 = (x - bx) * (ay - by) - (ax - bx) * (y - by)
+        d2 = (x - cx) * (by - cy) - (bx - cx) * (y - cy)
+        d3 = (x - ax) * (cy - ay) - (cx - ax) * (y - ay)
+        has_neg = d1 < 0 or d2 < 0 or d3 < 0
+        has_pos = d1 > 0 or d2 > 0 or d3 > 0
+        if not (has_neg and has_pos):
+            return True
+        if tolerance <= 0:
+            return False
+        return min(
+            _segment_distance(x, y, ax, ay, bx, by),
+            _segment_distance(x, y, bx, by, cx, cy),
+            _segment_distance(x, y, cx, cy, ax, ay)
+        ) <= tolerance
+
+
+def _segment_distance(px: float, py: float,
+                      ax: float, ay: float, bx: float, by: float) -> float:
+    """Расстояние от точки до отрезка"""
+    dx = bx - ax
+    dy = by - ay
+    length = dx * dx + dy * dy
+    if length == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def make_shape(kind: str, coords: Sequence[float]):
+    """
+    Создает геометрию стимула по типу элемента канваса и координатам
+
+    :param kind: "rectangle", "oval" или "polygon" (треугольник)
+    :param coords: Координаты в формате канваса
+    :return: Объект с методом contains(x, y, tolerance)
+    """
+    if kind == "rectangle":
+        return RectShape(*coords[:4])
+    if kind == "oval":
+        return OvalShape(*coords[:4])
+    if kind == "polygon":
+        return TriangleShape(coords)
+    raise ValueError(f"Неизвестный тип фигуры: {kind}")
+
+
+def hit(shape, x: float, y: float,
+        tolerance: float = GAME["hit_tolerance"]) -> bool:
+    """
+    Проверяет попадание по стимулу без обращений к Tk
+
+    :param shape: Геометрия стимула или None
+    :param x: Координата клика по X
+    :param y: Координата клика по Y
+    :param tolerance: Допуск в пикселях
+    """
+    return shape is not None and shape.contains(x, y, tolerance)
@@ -0,0 +1,119 @@
+"""
+Модуль с мониторингом задержек цикла событий Tk
+"""
+import time
+import tkinter as tk
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from src.utils.histogram import LogHistogram
+from src.utils.settings import LAG
+
+_NS_PER_MS = 1_000_000
+
+
+class LagMonitor:
+    def __init__(self, widget: tk.Misc,
+                 interval_ms: int = LAG["interval"],
+                 threshold_ms: float = LAG["threshold"],
+                 clock_ns: Callable[[], int] = time.perf_counter_ns):
+        """
+        Инициализация монитора
+
+        Периодический таймер after() измеряет, насколько позже
+        запланированного он срабатывает. Опоздания попадают в гистограмму
+        сессии и в короткую историю, по которой помечаются попытки,
+        прошедшие при высокой задержке.
+
+        :param widget: Виджет для вызовов after()
+        :param interval_ms: Интервал проверки, мс
+        :param threshold_ms: Порог задержки для пометки попыток, мс
+        :param clock_ns: Монотонные часы в наносекундах
+        """
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.clock_ns = clock_ns
+        self.histogram = LogHistogram()
+        self.current_lag_ms = 0.0
+        self._recent: Deque[Tuple[int, float]] = deque(maxlen=LAG["recent_beats"])
+        self._after_id: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Запущен ли монитор"""
+        return self._after_id is not None
+
+    def start(self) -> None:
+        """Запускает проверки"""
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self) -> None:
+        """Останавливает проверки"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self) -> None:
+        """Планирует следующую проверку"""
+        expected_ns = self.clock_ns() + self.interval_ms * _NS_PER_MS
+        self._after_id = self.widget.after(self.interval_ms, self._beat, expected_ns)
+
+    def _beat(self, expected_ns: int) -> None:
+        """Записывает опоздание таймера и планирует следующую проверку"""
+        now = self.clock_ns()
+        lag_ms = max(0, now - expected_ns) / _NS_PER_MS
+        self.current_lag_ms = lag_ms
+        self.histogram.record(lag_ms)
+        self._recent.append((now, lag_ms))
+        self._schedule()
+
+    def max_lag_since(self, since_ns: int) -> float:
+        """
+        Возвращает максимальную задержку с заданного момента
+
+        Учитывается также проверка, пришедшая сразу после него: ее
+        опоздание накапливалось в том числе в этом интервале.
+
+        :param since_ns: Момент по монотонным часам, нс
+        :return: Задержка, мс
+        """
+        worst = 0.0
+        for beat_ns, lag_ms in reversed(self._recent):
+            worst = max(worst, lag_ms)
+            if beat_ns < since_ns:
+                break
+        # Текущий промежуток еще не закрыт проверкой
+        if self._recent:
+            last_ns = self._recent[-1][0]
+            pending_ms = (self.clock_ns() - last_ns) / _NS_PER_MS - self.interval_ms
+            worst = max(worst, pending_ms)
+        return worst
+
+    def is_lagged(self, lag_ms: float) -> bool:
+        """Превышает ли задержка порог"""
+        return lag_ms > self.threshold_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает сводку задержек за сессию
+
+        :return: Словарь с перцентилями (мс) и гистограммой
+        """
+        histogram = self.histogram
+        return {
+            'interval_ms': self.interval_ms,
+            'threshold_ms': self.threshold_ms,
+            'count': histogram.count,
+            'mean_ms': histogram.mean,
+            'p50_ms': histogram.percentile(50),
+            'p99_ms': histogram.percentile(99),
+            'max_ms': histogram.max or 0.0,
+            'over_threshold': histogram.count_above(self.threshold_ms),
+            'histogram': histogram.to_dict()
+        }
+
+    def reset_session(self) -> None:
+        """Начинает новую сессию"""
+        self.histogram.reset()
+        self._recent.clear()
@@ -0,0 +1,82 @@
+"""
+Модуль со слоями канваса
+"""
+import tkinter as tk
+from typing import Callable, Dict, Iterable, Optional, Set
+
+# Слои в порядке снизу вверх
+LAYERS = ("background", "stimulus", "fx", "hud")
+
+
+class CanvasLayers:
+    def __init__(self, canvas: tk.Canvas, layers: Iterable[str] = LAYERS):
+        """
+        Инициализация слоев
+
+        Для каждого слоя создается скрытый маркер. Новые элементы слоя
+        опускаются сразу под его маркер, поэтому порядок слоев сохраняется
+        одним вызовом Tcl без поиска по канвасу.
+
+        :param canvas: Канвас
+        :param layers: Имена слоев снизу вверх
+        """
+        self.canvas = canvas
+        self.layers = tuple(layers)
+        self._renderers: Dict[str, Callable[[], None]] = {}
+        self._dirty: Set[str] = set()
+        self._markers: Dict[str, int] = {}
+
+        for layer in self.layers:
+            self._markers[layer] = canvas.create_line(
+                0, 0, 0, 0,
+                state="hidden",
+                tags=(f"marker:{layer}",)
+            )
+
+    @staticmethod
+    def tag(layer: str) -> str:
+        """Возвращает тег элементов слоя"""
+        return f"layer:{layer}"
+
+    def add(self, layer: str, item: Optional[int]) -> Optional[int]:
+        """
+        Добавляет элемент канваса в слой
+
+        :param layer: Имя слоя
+        :param item: ID элемента
+        :return: ID элемента
+        """
+        if item:
+            self.canvas.addtag_withtag(self.tag(layer), item)
+            self.canvas.tag_lower(item, self._markers[layer])
+        return item
+
+    def register(self, layer: str, renderer: Callable[[], None]) -> None:
+        """
+        Регистрирует функцию перерисовки слоя
+
+        :param layer: Имя слоя
+        :param renderer: Функция, создающая элементы слоя
+        """
+        self._renderers[layer] = renderer
+        self._dirty.add(layer)
+
+    def invalidate(self, layer: str) -> None:
+        """Помечает слой для перерисовки при следующем refresh()"""
+        self._dirty.add(layer)
+
+    def clear(self, *layers: str) -> None:
+        """Удаляет все элементы указанных слоев"""
+        for layer in layers:
+            self.canvas.delete(self.tag(layer))
+
+    def refresh(self) -> None:
+        """Перерисовывает только помеченные слои"""
+        for layer in self.layers:
+            if layer not in self._dirty:
+                continue
+            self._dirty.discard(layer)
+            renderer = self._renderers.get(layer)
+            if renderer:
+                self.clear(layer)
+                renderer()
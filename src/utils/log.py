@@ -0,0 +1,98 @@
+"""
+Модуль с настройкой структурированного журнала
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional, Union
+from src.utils.settings import LOGGING
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class TextFormatter(logging.Formatter):
+    """Строка "время уровень логгер: сообщение поле=значение ..." """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: Union[int, str, None] = None) -> None:
+    """
+    Настраивает журнал приложения
+
+    Записи попадают в очередь, а форматирует и выводит их отдельный
+    поток QueueListener, поэтому поток интерфейса не ждет ввода-вывода.
+    Сообщения форматируются лениво (аргументы в стиле %), а вызовы
+    отключенных уровней отсекаются проверкой уровня без форматирования.
+    Для горячих участков используется logger.isEnabledFor().
+
+    Повторный вызов только меняет уровень.
+
+    :param level: Уровень (по умолчанию из окружения или LOGGING["level"])
+    """
+    global _listener, _handler
+    if level is None:
+        level = os.environ.get(LOGGING["env_var"]) or LOGGING["level"]
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return
+
+    if LOGGING["file"]:
+        sink: logging.Handler = logging.FileHandler(LOGGING["file"], encoding="utf-8")
+    else:
+        sink = logging.StreamHandler(sys.stderr)
+    sink.setFormatter(JsonFormatter() if LOGGING["format"] == "json" else TextFormatter())
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _handler = logging.handlers.QueueHandler(records)
+    root.addHandler(_handler)
+    _listener = logging.handlers.QueueListener(records, sink, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Выводит оставшиеся записи и останавливает поток журнала"""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
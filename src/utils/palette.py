@@ -0,0 +1,90 @@
+"""
+Модуль с предвычисленными цветами и цветовыми переходами
+"""
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+from src.utils.colors import COLORS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+RGB = Tuple[int, int, int]
+
+# Двузначные шестнадцатеричные строки для всех значений канала
+_HEX = tuple(f"{i:02x}" for i in range(256))
+
+
+def hex_to_rgb(color: str) -> RGB:
+    """Переводит цвет вида #rrggbb в кортеж (r, g, b)"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def rgb_to_hex(rgb: RGB) -> str:
+    """Переводит кортеж (r, g, b) в цвет Tk вида #rrggbb"""
+    return "#" + _HEX[rgb[0]] + _HEX[rgb[1]] + _HEX[rgb[2]]
+
+
+def _compile(colors: Dict[str, Union[str, dict]], prefix: str = "") -> Dict[str, RGB]:
+    """Переводит вложенный словарь цветов в плоский словарь RGB"""
+    compiled = {}
+    for name, value in colors.items():
+        if isinstance(value, dict):
+            compiled.update(_compile(value, f"{prefix}{name}."))
+        else:
+            compiled[f"{prefix}{name}"] = hex_to_rgb(value)
+    return compiled
+
+
+# Цвета из COLORS в целочисленном виде: "bg", "shapes.red" и т.д.
+PALETTE: Dict[str, RGB] = _compile(COLORS)
+
+
+def resolve(color: str) -> RGB:
+    """
+    Возвращает RGB цвета по имени из палитры или по строке #rrggbb
+
+    :param color: Имя цвета ("bg", "shapes.red") или строка #rrggbb
+    """
+    rgb = PALETTE.get(color)
+    if rgb is None:
+        rgb = hex_to_rgb(color)
+    return rgb
+
+
+@lru_cache(maxsize=64)
+def ramp(color1: str, color2: str, steps: int,
+         endpoint: bool = True) -> Tuple[str, ...]:
+    """
+    Возвращает цветовой переход в виде готовых строк цветов Tk
+
+    Результат кэшируется, поэтому в анимациях цвета не форматируются.
+
+    :param color1: Начальный цвет
+    :param color2: Конечный цвет
+    :param steps: Количество цветов в переходе
+    :param endpoint: Включать ли конечный цвет последним элементом
+    :return: Кортеж цветов вида #rrggbb
+    """
+    if steps <= 0:
+        return ()
+    start = resolve(color1)
+    end = resolve(color2)
+    divisor = steps - 1 if endpoint and steps > 1 else steps
+
+    if np is not None:
+        ratios = (np.arange(steps, dtype=np.float64) / divisor)[:, None]
+        channels = (
+            np.array(start, dtype=np.float64) * (1 - ratios)
+            + np.array(end, dtype=np.float64) * ratios
+        ).astype(np.int64).tolist()
+    else:
+        channels = []
+        for i in range(steps):
+            ratio = i / divisor
+            channels.append([
+                int(start[c] * (1 - ratio) + end[c] * ratio) for c in range(3)
+            ])
+
+    return tuple("#" + _HEX[r] + _HEX[g] + _HEX[b] for r, g, b in channels)
@@ -0,0 +1,217 @@
+"""
+Модуль с отложенной записью JSON-файлов
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+from src.utils.settings import PERSIST
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(path: str, data: Any, fsync: bool = False) -> None:
+    """
+    Атомарно записывает JSON в файл
+
+    Данные пишутся во временный файл в том же каталоге, который затем
+    заменяет исходный через os.replace(). При сбое на диске остается
+    либо старая, либо новая версия файла, но не обрезанная.
+
+    :param path: Путь к файлу
+    :param data: Данные для json.dump
+    :param fsync: Сбросить данные на диск перед заменой
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehindStore:
+    def __init__(self, path: str,
+                 interval_ms: int = PERSIST["interval"],
+                 fsync: bool = PERSIST["fsync"]):
+        """
+        Инициализация хранилища
+
+        update() только меняет данные в памяти и будит фоновый поток.
+        Поток записывает файл не чаще одного раза в interval_ms, объединяя
+        все изменения за это время, поэтому обработчики ввода не ждут
+        диска. При закрытии несохраненные изменения записываются сразу.
+
+        :param path: Путь к JSON-файлу
+        :param interval_ms: Минимальный интервал между записями, мс
+        :param fsync: Сбрасывать данные на диск при каждой записи
+        """
+        self.path = path
+        self.interval = interval_ms / 1000
+        self.fsync = fsync
+        self.data: Dict[str, Any] = {}
+        self.writes = 0
+        self._dirty = False
+        self._closed = False
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Читает файл
+
+        :return: Копия данных (пустой словарь, если файла нет или он поврежден)
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        with self._lock:
+            self.data = data
+        return dict(data)
+
+    def update(self, **fields: Any) -> None:
+        """Меняет поля и планирует запись, если они изменились"""
+        with self._lock:
+            if all(self.data.get(key) == value for key, value in fields.items()):
+                return
+            self.data.update(fields)
+            self._dirty = True
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-behind", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+            self._wake.notify()
+
+    def _run(self) -> None:
+        """Фоновый поток: записывает накопленные изменения"""
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                # Выдерживаем интервал, собирая изменения, пришедшие за это время
+                wait = self._last_write + self.interval - time.monotonic()
+                if wait > 0:
+                    self._wake.wait(wait)
+                    continue
+            self._write()
+
+    def _write(self) -> None:
+        """Записывает снимок данных, если есть несохраненные изменения"""
+        # Записи идут по очереди, и каждая следующая берет более новый снимок
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self.data)
+                self._dirty = False
+                self._last_write = time.monotonic()
+            try:
+                atomic_write_json(self.path, snapshot, self.fsync)
+                self.writes += 1
+            except OSError:
+                logger.exception("failed to write %s", self.path)
+                with self._lock:
+                    self._dirty = True
+
+    def flush(self) -> None:
+        """Немедленно записывает несохраненные изменения"""
+        self._write()
+
+    def close(self) -> None:
+        """Останавливает фоновый поток и записывает оставшиеся изменения"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+            thread = self._thread
+        atexit.unregister(self.close)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._write()
+
+
+class JsonLinesAppender:
+    def __init__(self, path: str):
+        """
+        Инициализация журнала JSON Lines
+
+        append() только кладет запись в очередь; дописывает строки в
+        файл фоновый поток, забирая из очереди все накопившиеся записи
+        за одно открытие файла.
+
+        :param path: Путь к файлу
+        """
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Добавляет запись (запись в файл отложенная)"""
+        if self._closed:
+            raise ValueError("Журнал закрыт")
+        self._queue.put(json.dumps(entry) + "\n")
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="jsonl-appender", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self) -> None:
+        """Фоновый поток: дописывает строки из очереди"""
+        while True:
+            lines = [self._queue.get()]
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in lines
+            lines = [line for line in lines if line is not None]
+            if lines:
+                try:
+                    with open(self.path, 'a') as f:
+                        f.writelines(lines)
+                except OSError:
+                    logger.exception("failed to append to %s", self.path)
+            if done:
+                return
+
+    def close(self) -> None:
+        """Дописывает оставшиеся записи и останавливает фоновый поток"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,89 @@
+"""
+Модуль с пулом элементов канваса
+"""
+import tkinter as tk
+from typing import Dict, List, Optional, Sequence
+from src.utils.layers import CanvasLayers
+from src.utils.settings import GAME
+
+
+class CanvasItemPool:
+    def __init__(self, canvas: tk.Canvas, layers: Optional[CanvasLayers] = None,
+                 layer: str = "stimulus", max_size: int = GAME["pool_size"]):
+        """
+        Инициализация пула
+
+        Освобожденные элементы не удаляются, а скрываются и переиспользуются
+        через coords/itemconfig, поэтому ID элементов перестают расти.
+
+        :param canvas: Канвас
+        :param layers: Слои канваса
+        :param layer: Слой, в который попадают элементы пула
+        :param max_size: Максимальное число свободных элементов каждого типа
+        """
+        self.canvas = canvas
+        self.layers = layers
+        self.layer = layer
+        self.max_size = max_size
+        self._free: Dict[str, List[int]] = {}
+        self._live: Dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def acquire(self, kind: str, coords: Sequence[float], **options) -> int:
+        """
+        Возвращает видимый элемент канваса нужного типа
+
+        :param kind: Тип элемента: "rectangle", "oval", "polygon"
+        :param coords: Координаты элемента
+        :param options: Параметры элемента (fill, outline и т.д.)
+        :return: ID элемента
+        """
+        free = self._free.get(kind)
+        if free:
+            item = free.pop()
+            self.hits += 1
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, state="normal", **options)
+        else:
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self.misses += 1
+
+        if self.layers:
+            self.layers.add(self.layer, item)
+        self._live[item] = kind
+        return item
+
+    def release(self, item: Optional[int]) -> None:
+        """Возвращает элемент в пул, лишние элементы удаляются"""
+        kind = self._live.pop(item, None)
+        if kind is None:
+            return
+
+        free = self._free.setdefault(kind, [])
+        if len(free) < self.max_size:
+            self.canvas.itemconfig(item, state="hidden")
+            free.append(item)
+        else:
+            self.canvas.delete(item)
+            self.discarded += 1
+
+    def release_all(self) -> None:
+        """Возвращает в пул все выданные элементы"""
+        for item in list(self._live):
+            self.release(item)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает счетчики пула
+
+        :return: Словарь с попаданиями, промахами и размерами пула
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'discarded': self.discarded,
+            'live': len(self._live),
+            'free': sum(len(items) for items in self._free.values())
+        }
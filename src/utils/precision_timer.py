@@ -0,0 +1,159 @@
+"""
+Модуль с точным планировщиком появления стимулов
+"""
+import logging
+import math
+import time
+import tkinter as tk
+from typing import Callable, Dict, Optional, Tuple
+from src.utils.settings import PRECISION
+
+logger = logging.getLogger(__name__)
+
+_NS_PER_MS = 1_000_000
+
+
+class PrecisionScheduler:
+    def __init__(self, widget: tk.Misc,
+                 clock_ns: Callable[[], int] = time.perf_counter_ns):
+        """
+        Инициализация планировщика
+
+        Таймеры after() срабатывают с непредсказуемым опозданием.
+        Планировщик оценивает это опоздание (экспоненциальное среднее),
+        просыпается заранее и дожидается нужного момента коротким циклом
+        ожидания по perf_counter. Длительность цикла ограничена
+        PRECISION["max_spin_ms"].
+
+        :param widget: Виджет для вызовов after()
+        :param clock_ns: Монотонные часы в наносекундах
+        """
+        self.widget = widget
+        self.clock_ns = clock_ns
+        self.lateness_ms = PRECISION["initial_lateness"]
+        self._tasks: Dict[int, Tuple[str, int, int, Callable[[], None]]] = {}
+        self._next_handle = 1
+
+        # Статистика: достигнутая минус запрошенная задержка, мс
+        self.count = 0
+        self.error_sum = 0.0
+        self.error_sq_sum = 0.0
+        self.max_abs_error = 0.0
+        self.spin_ns_total = 0
+
+    def _update_lateness(self, sample_ms: float) -> None:
+        """Обновляет оценку опоздания after()"""
+        alpha = PRECISION["ewma_alpha"]
+        self.lateness_ms += alpha * (max(0.0, sample_ms) - self.lateness_ms)
+
+    def calibrate(self, on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Измеряет опоздание after() серией коротких таймеров
+
+        Калибровка не блокирует цикл событий.
+
+        :param on_done: Функция, вызываемая по окончании
+        """
+        samples = []
+        delay_ms = PRECISION["calibration_delay"]
+
+        def probe(expected_ns: int) -> None:
+            now = self.clock_ns()
+            samples.append((now - expected_ns) / _NS_PER_MS)
+            if len(samples) < PRECISION["calibration_samples"]:
+                self.widget.after(delay_ms, probe, self.clock_ns() + delay_ms * _NS_PER_MS)
+                return
+            samples.sort()
+            # Медиана устойчива к единичным задержкам при запуске
+            self.lateness_ms = samples[len(samples) // 2]
+            logger.debug("after() lateness calibrated: %.3f ms", self.lateness_ms)
+            if on_done:
+                on_done()
+
+        self.widget.after(delay_ms, probe, self.clock_ns() + delay_ms * _NS_PER_MS)
+
+    def schedule(self, delay_ms: int, callback: Callable[[], None]) -> int:
+        """
+        Планирует вызов функции через заданное время
+
+        :param delay_ms: Задержка, мс
+        :param callback: Функция
+        :return: Дескриптор для отмены
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        start_ns = self.clock_ns()
+        target_ns = start_ns + int(delay_ms * _NS_PER_MS)
+        self._arm(handle, start_ns, target_ns, callback)
+        return handle
+
+    def cancel(self, handle: Optional[int]) -> None:
+        """Отменяет запланированный вызов"""
+        task = self._tasks.pop(handle, None)
+        if task is not None:
+            self.widget.after_cancel(task[0])
+
+    def _arm(self, handle: int, start_ns: int, target_ns: int,
+             callback: Callable[[], None]) -> None:
+        """Ставит таймер с упреждением на оценку опоздания и цикл ожидания"""
+        remaining_ms = (target_ns - self.clock_ns()) / _NS_PER_MS
+        wake_ms = int(remaining_ms - self.lateness_ms - PRECISION["spin_ms"])
+        wake_ms = max(0, wake_ms)
+        expected_ns = self.clock_ns() + wake_ms * _NS_PER_MS
+        after_id = self.widget.after(wake_ms, self._wake, handle, expected_ns)
+        self._tasks[handle] = (after_id, start_ns, target_ns, callback)
+
+    def _wake(self, handle: int, expected_ns: int) -> None:
+        """Просыпается перед целевым моментом и дожидается его"""
+        task = self._tasks.get(handle)
+        if task is None:
+            return
+        _, start_ns, target_ns, callback = task
+
+        now = self.clock_ns()
+        self._update_lateness((now - expected_ns) / _NS_PER_MS)
+
+        # Проснулись слишком рано - ставим таймер еще раз
+        max_spin_ns = PRECISION["max_spin_ms"] * _NS_PER_MS
+        if target_ns - now > max_spin_ns:
+            self._arm(handle, start_ns, target_ns, callback)
+            return
+
+        spin_start = now
+        while now < target_ns:
+            now = self.clock_ns()
+        self.spin_ns_total += now - spin_start
+
+        del self._tasks[handle]
+        self._record((now - start_ns) / _NS_PER_MS, (target_ns - start_ns) / _NS_PER_MS)
+        callback()
+
+    def _record(self, achieved_ms: float, requested_ms: float) -> None:
+        """Учитывает достигнутую задержку в статистике"""
+        error = achieved_ms - requested_ms
+        self.count += 1
+        self.error_sum += error
+        self.error_sq_sum += error * error
+        self.max_abs_error = max(self.max_abs_error, abs(error))
+        logger.debug(
+            "foreperiod requested=%.1f ms achieved=%.3f ms error=%.3f ms lateness=%.3f ms",
+            requested_ms, achieved_ms, error, self.lateness_ms
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает статистику точности задержек
+
+        :return: Словарь со средней, СКО и максимальной ошибкой (мс),
+            оценкой опоздания after() и временем в цикле ожидания
+        """
+        mean = self.error_sum / self.count if self.count else 0.0
+        variance = self.error_sq_sum / self.count - mean * mean if self.count else 0.0
+        return {
+            'count': self.count,
+            'mean_error_ms': mean,
+            'std_error_ms': math.sqrt(max(0.0, variance)),
+            'max_abs_error_ms': self.max_abs_error,
+            'lateness_ms': self.lateness_ms,
+            'spin_ms_total': self.spin_ns_total / _NS_PER_MS
+        }
@@ -0,0 +1,166 @@
+"""
+Модуль с хранилищем профилей игроков
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional
+from src.utils.persistence import WriteBehindStore, atomic_write_json
+from src.utils.settings import PERSIST, PROFILES
+from src.utils.trial_log import MAX_PROFILE_ID
+
+INDEX_VERSION = 1
+
+
+class ProfileStore:
+    def __init__(self, directory: str = PROFILES["dir"], read_only: bool = False):
+        """
+        Инициализация хранилища
+
+        Каждый профиль хранится в своем файле, а индекс сопоставляет имя
+        профиля с файлом. Имя активного профиля лежит в отдельном
+        маленьком файле. При запуске читаются только индекс и активный
+        профиль. Переключение - поиск в словаре, чтение одного файла и
+        запись имени активного профиля; индекс переписывается только при
+        создании профиля. Сохранение переписывает только файл активного
+        профиля (отложенно, через WriteBehindStore).
+
+        Если индекса еще нет, настройки из PERSIST["file"] переносятся в
+        профиль по умолчанию.
+
+        Рядом с файлом профиля лежит его статистика (<id>.stats.json).
+
+        :param directory: Каталог профилей
+        :param read_only: Только читать: без индекса профилей нет, ничего
+            не создается и не переносится (например, для выгрузки)
+        """
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.active_path = os.path.join(directory, "active.json")
+        self.index: Dict[str, Any] = {}
+        self.active = PROFILES["default"]
+        self._store: Optional[WriteBehindStore] = None
+        if read_only:
+            self.index = self.read_index(directory) or {'profiles': {}}
+        else:
+            self._load_index()
+        try:
+            with open(self.active_path, 'r') as f:
+                active = json.load(f).get('name')
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            active = None
+        if active in self.index['profiles']:
+            self.active = active
+
+    @staticmethod
+    def read_index(directory: str = PROFILES["dir"]) -> Optional[Dict[str, Any]]:
+        """
+        Читает индекс профилей, ничего не создавая
+
+        :param directory: Каталог профилей
+        :return: Индекс или None, если его нет или он поврежден
+        """
+        try:
+            with open(os.path.join(directory, "index.json"), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _load_index(self) -> None:
+        """Читает индекс или создает его, перенося старые настройки"""
+        index = self.read_index(self.directory)
+        if index is not None:
+            self.index = index
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.index = {
+            'version': INDEX_VERSION,
+            'next_id': 0,
+            'profiles': {}
+        }
+        record = self._add(PROFILES["default"])
+        legacy = WriteBehindStore(PERSIST["file"]).load()
+        if legacy:
+            atomic_write_json(self._path(record), legacy)
+        self._save_index()
+
+    def _save_index(self) -> None:
+        """Записывает индекс"""
+        atomic_write_json(self.index_path, self.index)
+
+    def _add(self, name: str) -> Dict[str, Any]:
+        """Добавляет профиль в индекс (без записи индекса)"""
+        profile_id = self.index['next_id']
+        if profile_id > MAX_PROFILE_ID:
+            raise ValueError(f"Слишком много профилей (не больше {MAX_PROFILE_ID + 1})")
+        self.index['next_id'] = profile_id + 1
+        record = {'id': profile_id, 'file': f"{profile_id}.json"}
+        self.index['profiles'][name] = record
+        return record
+
+    def _path(self, record: Dict[str, Any]) -> str:
+        """Путь к файлу профиля"""
+        return os.path.join(self.directory, record['file'])
+
+    def names(self) -> List[str]:
+        """Имена профилей в алфавитном порядке"""
+        return sorted(self.index['profiles'])
+
+    def id_names(self) -> Dict[int, str]:
+        """Имена профилей по их числовым идентификаторам"""
+        return {record['id']: name for name, record in self.index['profiles'].items()}
+
+    def profile_id(self, name: Optional[str] = None) -> int:
+        """Числовой идентификатор профиля (по умолчанию активного)"""
+        return self.index['profiles'][name or self.active]['id']
+
+    def stats_path(self, name: Optional[str] = None) -> str:
+        """Путь к файлу статистики профиля (по умолчанию активного)"""
+        record = self.index['profiles'][name or self.active]
+        return os.path.join(self.directory, f"{record['id']}.stats.json")
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Читает активный профиль
+
+        :return: Данные профиля (пустой словарь для нового профиля)
+        """
+        if self._store is None:
+            record = self.index['profiles'][self.active]
+            self._store = WriteBehindStore(self._path(record))
+        return self._store.load()
+
+    def switch(self, name: str) -> Dict[str, Any]:
+        """
+        Делает профиль активным, создавая его при необходимости
+
+        Несохраненные изменения прежнего профиля записываются.
+
+        :param name: Имя профиля
+        :return: Данные профиля
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Имя профиля не может быть пустым")
+        if name == self.active and self._store is not None:
+            return dict(self._store.data)
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        if name not in self.index['profiles']:
+            self._add(name)
+            self._save_index()
+        self.active = name
+        atomic_write_json(self.active_path, {'name': name})
+        return self.load()
+
+    def update(self, **fields: Any) -> None:
+        """Меняет поля активного профиля (запись отложенная)"""
+        if self._store is None:
+            self.load()
+        self._store.update(**fields)
+
+    def close(self) -> None:
+        """Записывает несохраненные изменения активного профиля"""
+        if self._store is not None:
+            self._store.close()
@@ -12,6 +12,12 @@ WINDOW = {
 # Настройки игры
 GAME = {
     "shape_size": 50,
+    # Максимум свободных элементов каждого типа в пуле канваса
+    "pool_size": 32,
+    # Допуск при проверке попадания по стимулу, пиксели
+    "hit_tolerance": 2,
+    # Сколько последних измерений времени хранить в памяти
+    "timing_history": 1000,
     "spawn_delay": {
         "easy": 2000,
         "medium": 1500,
@@ -23,12 +29,169 @@ GAME = {
     }
 }
 
+# Настройки режима множества мишеней
+MULTI_TARGET = {
+    "max_targets": 300,
+    # Мишеней за один спавн и интервал между спавнами, мс
+    "batch": 10,
+    "spawn_interval": 100,
+    # Время жизни мишени, мс
+    "lifetime": {
+        "easy": 4000,
+        "medium": 3000,
+        "hard": 2000
+    },
+    "target_size": 24,
+    # Доля отвлекающих мишеней
+    "distractor_chance": 0.7,
+    # Штраф за клик по отвлекающей мишени
+    "penalty": 10,
+    # Размер ячейки пространственной сетки, пиксели
+    "cell_size": 64,
+    # Интервал проверки истекших мишеней, мс
+    "sweep_interval": 100,
+    # Попыток найти место без перекрытий
+    "placement_attempts": 5
+}
+
+# Настройки точного планирования стимулов
+PRECISION = {
+    # Начальная оценка опоздания after(), мс
+    "initial_lateness": 1.0,
+    # Сколько мс до цели ждать в цикле по perf_counter
+    "spin_ms": 2,
+    # Предел длительности цикла ожидания, мс
+    "max_spin_ms": 3,
+    # Коэффициент сглаживания оценки опоздания
+    "ewma_alpha": 0.1,
+    # Калибровка при запуске: число замеров и их интервал, мс
+    "calibration_samples": 20,
+    "calibration_delay": 10
+}
+
+# Настройки мониторинга задержек цикла событий
+LAG = {
+    # Интервал проверки, мс
+    "interval": 50,
+    # Попытки при задержке выше порога помечаются, мс
+    "threshold": 30,
+    # Сколько последних проверок хранить для пометки попыток
+    "recent_beats": 256,
+    # Файл со сводками задержек по сессиям
+    "history_file": "lag_history.jsonl"
+}
+
+# Настройки сохранения настроек и рекордов
+PERSIST = {
+    # Файл с лучшим счетом и настройками
+    "file": "best_score.json",
+    # Минимальный интервал между записями файла, мс
+    "interval": 1000,
+    # Сбрасывать данные на диск при каждой записи
+    "fsync": False
+}
+
+# Настройки профилей игроков
+PROFILES = {
+    # Каталог с индексом и файлами профилей
+    "dir": "profiles",
+    # Профиль, в который переносятся настройки из best_score.json
+    "default": "default"
+}
+
+# Настройки истории попыток
+TRIALS = {
+    # Хранилище: "sqlite" или "binary" (двоичный журнал для киосков)
+    "backend": "sqlite",
+    # База SQLite с попытками
+    "db_file": "trials.db",
+    # Сколько попыток вставлять одним пакетом
+    "batch_size": 50,
+    # Двоичный журнал попыток и размер его буфера записи, байт
+    "log_file": "trials.bin",
+    "buffer_size": 64 * 1024
+}
+
+# Настройки статистики времени реакции
+STATS = {
+    # Общий файл статистики из версий без профилей; теперь статистика
+    # хранится у каждого профиля, а этот файл переносится в профиль по
+    # умолчанию
+    "file": "stats.json",
+    # Гистограмма перцентилей: единица 0.1 мс, точность 1/2^6 (~1.6%),
+    # значения до 2^20 единиц (~100 с)
+    "unit": 0.1,
+    "sub_bits": 6,
+    "max_bits": 20
+}
+
+# Настройки выгрузки истории попыток
+EXPORT = {
+    # Попыток в одной порции чтения и записи
+    "chunk_size": 5000,
+    # Интервал обновления прогресса в меню, мс
+    "poll_interval": 200
+}
+
+# Настройки аналитики истории попыток
+ANALYTICS = {
+    # Попытки быстрее этого времени считаются упреждением, мс
+    "min_ms": 100,
+    # Выбросы: дальше от среднего, чем на max_sd стандартных отклонений
+    "max_sd": 3,
+    # Окно скользящего среднего, попыток
+    "window": 20,
+    # Сетка карты областей экрана: столбцы, строки
+    "grid": (4, 3),
+    # Сравнение последних дней с предыдущей историей
+    "compare_days": 7,
+    # Строк базы за одно чтение при загрузке истории
+    "chunk_size": 10000,
+    # Интервал опроса фоновой загрузки экраном статистики, мс
+    "poll_interval": 100
+}
+
+# Настройки журнала
+LOGGING = {
+    # Уровень (или переменная окружения env_var)
+    "level": "WARNING",
+    "env_var": "REACTION_LOG_LEVEL",
+    # "text" или "json"
+    "format": "text",
+    # Файл журнала; пустая строка - вывод в stderr
+    "file": ""
+}
+
+# Настройки трассировки
+TRACE = {
+    # Включить трассировку (или задать переменную окружения env_var)
+    "enabled": False,
+    "env_var": "REACTION_TRACE",
+    # Максимум хранимых участков
+    "buffer_size": 100000,
+    # Файл для выгрузки в формате Chrome trace events
+    "output": "trace.json"
+}
+
+# Настройки оверлея производительности
+OVERLAY = {
+    # Интервал обновления, мс
+    "interval": 250
+}
+
 # Настройки анимации
 ANIMATION = {
+    # Интервал между кадрами, мс
     "speed": 20,
-    "steps": 10,
+    # Длительность анимаций, мс
+    "duration": 200,
+    "flash_duration": 200,
+    "text_duration": 200,
+    # Функция плавности по умолчанию (см. src/utils/easing.py)
+    "easing": "ease_out_cubic",
     "flash_radius": 50,
-    "flash_rings": 3
+    "flash_rings": 3,
+    "gradient_cache_size": 4
 }
 
 # Настройки прогрессии
@@ -59,7 +222,8 @@ LOCALIZATION = {
     "modes": {
         "color": "Цвета",
         "shape": "Фигуры",
-        "sound": "Звуки"
+        "sound": "Звуки",
+        "multi": "Мишени"
     },
     "difficulties": {
         "easy": "Легкий",
@@ -0,0 +1,111 @@
+"""
+Модуль с равномерной пространственной хеш-сеткой
+"""
+from typing import Dict, Hashable, Iterator, List, Set, Tuple
+
+BBox = Tuple[float, float, float, float]
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    def __init__(self, cell_size: float):
+        """
+        Инициализация сетки
+
+        Каждый объект записывается во все ячейки, которые пересекает его
+        габаритный прямоугольник, поэтому запрос точки проверяет только
+        объекты одной ячейки, независимо от общего числа объектов.
+
+        :param cell_size: Размер ячейки в пикселях
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._boxes: Dict[Hashable, BBox] = {}
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._boxes
+
+    def _cells_for(self, bbox: BBox) -> Iterator[Cell]:
+        """Перебирает ячейки, пересекаемые прямоугольником"""
+        size = self.cell_size
+        x0, y0, x1, y1 = bbox
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def insert(self, key: Hashable, bbox: BBox) -> None:
+        """
+        Добавляет объект в сетку
+
+        :param key: Ключ объекта
+        :param bbox: Габаритный прямоугольник (x0, y0, x1, y1)
+        """
+        if key in self._boxes:
+            self.remove(key)
+        self._boxes[key] = bbox
+        for cell in self._cells_for(bbox):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Удаляет объект из сетки
+
+        :return: True, если объект был в сетке
+        """
+        bbox = self._boxes.pop(key, None)
+        if bbox is None:
+            return False
+        for cell in self._cells_for(bbox):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+        return True
+
+    def clear(self) -> None:
+        """Удаляет все объекты"""
+        self._cells.clear()
+        self._boxes.clear()
+
+    def query_point(self, x: float, y: float,
+                    tolerance: float = 0) -> List[Hashable]:
+        """
+        Возвращает объекты, чей габаритный прямоугольник содержит точку
+
+        :param tolerance: Расширение прямоугольников, пиксели (точка у
+            границы ячейки может попасть в соседние ячейки)
+        :return: Список ключей
+        """
+        if tolerance > 0:
+            return list(self.query_bbox(
+                (x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+            ))
+        size = self.cell_size
+        bucket = self._cells.get((int(x // size), int(y // size)), ())
+        result = []
+        for key in bucket:
+            x0, y0, x1, y1 = self._boxes[key]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                result.append(key)
+        return result
+
+    def query_bbox(self, bbox: BBox) -> Set[Hashable]:
+        """
+        Возвращает объекты, пересекающие прямоугольник
+
+        :return: Множество ключей
+        """
+        x0, y0, x1, y1 = bbox
+        result = set()
+        for cell in self._cells_for(bbox):
+            for key in self._cells.get(cell, ()):
+                if key in result:
+                    continue
+                bx0, by0, bx1, by1 = self._boxes[key]
+                if bx0 <= x1 and x0 <= bx1 and by0 <= y1 and y0 <= by1:
+                    result.add(key)
+        return result
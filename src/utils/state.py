@@ -0,0 +1,74 @@
+"""
+Модуль с наблюдаемым хранилищем состояния игры
+"""
+import tkinter as tk
+from typing import Any, Callable, Dict, List
+
+
+class StateStore:
+    def __init__(self, **initial: Any):
+        """
+        Инициализация хранилища
+
+        Подписчики вызываются только при фактическом изменении значения,
+        поэтому обновление затрагивает лишь зависящие от него виджеты.
+
+        :param initial: Начальные значения (mode, difficulty, best_score, ...)
+        """
+        self._values: Dict[str, Any] = dict(initial)
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Возвращает значение по ключу"""
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: Any) -> bool:
+        """
+        Устанавливает значение и уведомляет подписчиков
+
+        :return: True, если значение изменилось
+        """
+        if key in self._values and self._values[key] == value:
+            return False
+        self._values[key] = value
+        for callback in list(self._subscribers.get(key, ())):
+            callback(value)
+        return True
+
+    def update(self, **values: Any) -> None:
+        """Устанавливает несколько значений"""
+        for key, value in values.items():
+            self.set(key, value)
+
+    def subscribe(self, key: str, callback: Callable[[Any], None],
+                  immediate: bool = True) -> Callable[[], None]:
+        """
+        Подписывает функцию на изменения значения
+
+        :param key: Ключ значения
+        :param callback: Функция, получающая новое значение
+        :param immediate: Вызвать функцию сразу с текущим значением
+        :return: Функция отписки
+        """
+        self._subscribers.setdefault(key, []).append(callback)
+        if immediate and key in self._values:
+            callback(self._values[key])
+
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+        return unsubscribe
+
+    def bind_var(self, key: str, variable: tk.StringVar,
+                 formatter: Callable[[Any], str] = str) -> Callable[[], None]:
+        """
+        Связывает StringVar со значением хранилища
+
+        :param key: Ключ значения
+        :param variable: Переменная Tk, используемая как textvariable
+        :param formatter: Функция, превращающая значение в текст
+        :return: Функция отписки
+        """
+        return self.subscribe(key, lambda value: variable.set(formatter(value)))
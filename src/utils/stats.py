@@ -0,0 +1,176 @@
+"""
+Модуль с потоковой статистикой времени реакции
+"""
+import math
+from typing import Any, Dict, Optional, Tuple
+from src.utils.histogram import LogHistogram
+from src.utils.settings import STATS
+
+Key = Tuple[str, str]
+
+
+class RunningStats:
+    def __init__(self):
+        """
+        Инициализация статистики
+
+        Среднее и дисперсия считаются методом Велфорда, перцентили - по
+        гистограмме с логарифмическими корзинами. Память не зависит от
+        количества значений, а две статистики можно объединить без
+        потери точности среднего и дисперсии.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.histogram = LogHistogram(
+            STATS["unit"], STATS["sub_bits"], STATS["max_bits"]
+        )
+
+    def add(self, value: float) -> None:
+        """Добавляет значение"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.histogram.record(value)
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Стандартное отклонение"""
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> float:
+        """Приблизительный перцентиль (0-100)"""
+        return self.histogram.percentile(p)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Добавляет значения другой статистики (формула Чана)"""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        self.histogram.merge(other.histogram)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Сводка статистики
+
+        :return: Словарь с количеством, средним, СКО, минимумом,
+            максимумом и перцентилями p50/p90/p99, мс
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализует статистику"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min,
+            'max': self.max,
+            'histogram': self.histogram.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Восстанавливает статистику из словаря to_dict()"""
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        stats.histogram = LogHistogram.from_dict(data['histogram'])
+        return stats
+
+
+class StatsBook:
+    def __init__(self):
+        """
+        Статистика по режимам и сложностям за сессию и за все время
+
+        Обновляется по одной попытке, поэтому показ сводки не требует
+        просмотра истории.
+        """
+        self.session: Dict[Key, RunningStats] = {}
+        self.all_time: Dict[Key, RunningStats] = {}
+
+    @staticmethod
+    def _get(table: Dict[Key, RunningStats], key: Key) -> RunningStats:
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = RunningStats()
+        return stats
+
+    def record(self, mode: str, difficulty: str, reaction_ms: float) -> None:
+        """Добавляет время реакции попытки"""
+        key = (mode, difficulty)
+        self._get(self.session, key).add(reaction_ms)
+        self._get(self.all_time, key).add(reaction_ms)
+
+    def reset_session(self) -> None:
+        """Начинает новую сессию"""
+        self.session.clear()
+
+    def summary(self, mode: str, difficulty: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Сводки для режима и сложности
+
+        :return: Словарь {'session': сводка, 'all_time': сводка}
+            (None, если попыток не было)
+        """
+        key = (mode, difficulty)
+        session = self.session.get(key)
+        all_time = self.all_time.get(key)
+        return {
+            'session': session.summary() if session else None,
+            'all_time': all_time.summary() if all_time else None
+        }
+
+    def merge(self, other: "StatsBook") -> None:
+        """Добавляет статистику за все время другой книги (например, другой станции)"""
+        for key, stats in other.all_time.items():
+            self._get(self.all_time, key).merge(stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализует статистику за все время"""
+        return {
+            f"{mode}/{difficulty}": stats.to_dict()
+            for (mode, difficulty), stats in self.all_time.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatsBook":
+        """Восстанавливает статистику из словаря to_dict()"""
+        book = cls()
+        for key, stats in data.items():
+            mode, _, difficulty = key.partition("/")
+            book.all_time[(mode, difficulty)] = RunningStats.from_dict(stats)
+        return book
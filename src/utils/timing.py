@@ -0,0 +1,215 @@
+"""
+Модуль с измерением времени реакции
+"""
+import time
+import tkinter as tk
+from typing import Callable, Optional
+
+# Метки времени событий Tk - 32-битный счетчик миллисекунд
+_EVENT_TIME_WRAP = 1 << 32
+_NS_PER_MS = 1_000_000
+
+
+class EventClock:
+    def __init__(self, clock_ns: Callable[[], int] = time.perf_counter_ns,
+                 drift_ppm: float = 20.0):
+        """
+        Инициализация часов событий
+
+        Сопоставляет метку event.time (мс по часам оконной системы) с
+        монотонными часами perf_counter_ns. Смещение между часами
+        оценивается как минимум разности "время обработки - время
+        события": задержка в очереди только увеличивает эту разность,
+        поэтому минимум соответствует событиям, обработанным без
+        ожидания. Чтобы учесть дрейф часов, оценка может медленно расти.
+
+        :param clock_ns: Монотонные часы в наносекундах
+        :param drift_ppm: Допустимый дрейф часов, миллионных долей
+        """
+        self.clock_ns = clock_ns
+        self.drift_ppm = drift_ppm
+        self._offset_ns: Optional[int] = None
+        self._offset_at_ns = 0
+        self._last_event_ms: Optional[int] = None
+        self._wraps = 0
+
+    def _unwrap(self, event_ms: int) -> int:
+        """Разворачивает переполнение 32-битного счетчика событий"""
+        if self._last_event_ms is not None and event_ms < self._last_event_ms - _EVENT_TIME_WRAP // 2:
+            self._wraps += 1
+        self._last_event_ms = event_ms
+        return event_ms + self._wraps * _EVENT_TIME_WRAP
+
+    def observe(self, event_time: Optional[int],
+                handled_ns: Optional[int] = None) -> Optional[int]:
+        """
+        Учитывает метку события и переводит ее в монотонное время
+
+        :param event_time: event.time из события Tk, мс
+        :param handled_ns: Время обработки события, нс (по умолчанию сейчас)
+        :return: Время события по монотонным часам, нс, или None,
+            если у события нет метки времени
+        """
+        if handled_ns is None:
+            handled_ns = self.clock_ns()
+        if not event_time:
+            return None
+
+        event_ns = self._unwrap(event_time & (_EVENT_TIME_WRAP - 1)) * _NS_PER_MS
+        candidate = handled_ns - event_ns
+
+        if self._offset_ns is None:
+            self._offset_ns = candidate
+        else:
+            # Оценка может расти не быстрее допустимого дрейфа часов
+            elapsed = handled_ns - self._offset_at_ns
+            allowed = self._offset_ns + int(elapsed * self.drift_ppm / 1_000_000)
+            self._offset_ns = min(candidate, allowed)
+        self._offset_at_ns = handled_ns
+
+        return min(handled_ns, event_ns + self._offset_ns)
+
+
+class TrialTiming:
+    """Время одной попытки"""
+    __slots__ = ("onset_ns", "event_ns", "handled_ns", "scheduled_ns",
+                 "max_lag_ms", "lagged")
+
+    def __init__(self, onset_ns: int, event_ns: Optional[int], handled_ns: int,
+                 scheduled_ns: Optional[int] = None):
+        """
+        :param onset_ns: Время появления стимула на экране, нс
+        :param event_ns: Время клика по часам событий, нс
+        :param handled_ns: Время вызова обработчика клика, нс
+        :param scheduled_ns: Время, когда стимул был поставлен на отрисовку, нс
+        """
+        self.onset_ns = onset_ns
+        self.event_ns = event_ns if event_ns is not None else handled_ns
+        self.handled_ns = handled_ns
+        self.scheduled_ns = scheduled_ns if scheduled_ns is not None else onset_ns
+        # Заполняются монитором задержек цикла событий
+        self.max_lag_ms = 0.0
+        self.lagged = False
+
+    @property
+    def schedule_to_paint_ms(self) -> float:
+        """Задержка от постановки стимула до его отрисовки, мс"""
+        return (self.onset_ns - self.scheduled_ns) / _NS_PER_MS
+
+    @property
+    def raw_ms(self) -> float:
+        """Время реакции по моменту вызова обработчика, мс"""
+        return (self.handled_ns - self.onset_ns) / _NS_PER_MS
+
+    @property
+    def corrected_ms(self) -> float:
+        """Время реакции по моменту самого клика, мс"""
+        return max(0, self.event_ns - self.onset_ns) / _NS_PER_MS
+
+    @property
+    def queue_delay_ms(self) -> float:
+        """Сколько клик ждал в очереди событий Tk, мс"""
+        return (self.handled_ns - self.event_ns) / _NS_PER_MS
+
+
+class ReactionTimer:
+    def __init__(self, event_clock: Optional[EventClock] = None):
+        """
+        Инициализация таймера реакции
+
+        :param event_clock: Часы событий для поправки на задержку очереди
+        """
+        self.event_clock = event_clock or EventClock()
+        self.onset_ns: Optional[int] = None
+        self.scheduled_ns: Optional[int] = None
+        self._paint_id: Optional[str] = None
+        self._paint_widget: Optional[tk.Misc] = None
+
+    def now_ns(self) -> int:
+        """Текущее время по монотонным часам, нс"""
+        return self.event_clock.clock_ns()
+
+    def start(self) -> int:
+        """
+        Отмечает появление стимула
+
+        :return: Время появления, нс
+        """
+        self.onset_ns = self.now_ns()
+        if self.scheduled_ns is None:
+            self.scheduled_ns = self.onset_ns
+        return self.onset_ns
+
+    def start_after_paint(self, widget: tk.Misc,
+                          on_onset: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Отмечает появление стимула после того, как он отрисован
+
+        Сейчас запоминается только момент постановки стимула. Отметка
+        появления ставится в обработчике after_idle после
+        update_idletasks(), то есть когда Tk выполнил отложенную
+        перерисовку канваса с новым стимулом.
+
+        :param widget: Виджет, на котором рисуется стимул
+        :param on_onset: Функция, получающая время появления, нс
+        """
+        self.cancel_paint()
+        self.onset_ns = None
+        self.scheduled_ns = self.now_ns()
+
+        def mark_onset() -> None:
+            self._paint_id = None
+            self._paint_widget = None
+            widget.update_idletasks()
+            onset_ns = self.start()
+            if on_onset:
+                on_onset(onset_ns)
+
+        self._paint_widget = widget
+        self._paint_id = widget.after_idle(mark_onset)
+
+    def cancel_paint(self) -> None:
+        """Отменяет ожидающую отметку появления"""
+        if self._paint_id is not None and self._paint_widget is not None:
+            self._paint_widget.after_cancel(self._paint_id)
+        self._paint_id = None
+        self._paint_widget = None
+
+    def reset(self) -> None:
+        """Сбрасывает отметку появления стимула"""
+        self.cancel_paint()
+        self.onset_ns = None
+        self.scheduled_ns = None
+
+    @property
+    def running(self) -> bool:
+        """Есть ли стимул, ожидающий реакции"""
+        return self.onset_ns is not None
+
+    def measure(self, onset_ns: int, event_time: Optional[int],
+                scheduled_ns: Optional[int] = None) -> TrialTiming:
+        """
+        Измеряет время реакции от произвольного момента появления
+
+        :param onset_ns: Время появления стимула, нс
+        :param event_time: event.time из события клика
+        :param scheduled_ns: Время постановки стимула на отрисовку, нс
+        :return: Время попытки
+        """
+        handled_ns = self.now_ns()
+        event_ns = self.event_clock.observe(event_time, handled_ns)
+        return TrialTiming(onset_ns, event_ns, handled_ns, scheduled_ns)
+
+    def stop(self, event_time: Optional[int]) -> Optional[TrialTiming]:
+        """
+        Завершает попытку по клику
+
+        :param event_time: event.time из события клика
+        :return: Время попытки или None, если стимула не было
+        """
+        if self.onset_ns is None:
+            return None
+        timing = self.measure(self.onset_ns, event_time, self.scheduled_ns)
+        self.onset_ns = None
+        self.scheduled_ns = None
+        return timing
@@ -0,0 +1,153 @@
+"""
+Модуль с трассировкой участков кода в формате Chrome trace events
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from src.utils.settings import TRACE
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (имя, категория, начало в нс, длительность в нс, поток)
+_Record = Tuple[str, str, int, int, int]
+
+
+class _NullSpan:
+    """Пустой участок: используется, когда трассировка выключена"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    """Измеряемый участок"""
+    __slots__ = ("tracer", "name", "cat", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.start_ns = 0
+
+    def __enter__(self) -> "_ActiveSpan":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.tracer.record(self.name, self.cat, self.start_ns,
+                           time.perf_counter_ns() - self.start_ns)
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False,
+                 buffer_size: int = TRACE["buffer_size"]):
+        """
+        Инициализация трассировщика
+
+        Участки хранятся в кольцевом буфере кортежами, без форматирования.
+        JSON собирается только при выгрузке. Если трассировка выключена,
+        span() возвращает общий пустой объект, а traced() оставляет
+        функцию без обертки.
+
+        :param enabled: Включена ли трассировка
+        :param buffer_size: Максимум хранимых участков
+        """
+        self.enabled = enabled
+        self.spans: Deque[_Record] = deque(maxlen=buffer_size)
+        self._origin_ns = time.perf_counter_ns()
+
+    def record(self, name: str, cat: str, start_ns: int, duration_ns: int) -> None:
+        """Добавляет завершенный участок в буфер"""
+        self.spans.append((name, cat, start_ns, duration_ns, threading.get_ident()))
+
+    def span(self, name: str, cat: str = "game") -> Any:
+        """
+        Возвращает контекстный менеджер для измерения участка
+
+        :param name: Имя участка
+        :param cat: Категория
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, cat)
+
+    def traced(self, name: str, cat: str = "game") -> Callable[[F], F]:
+        """
+        Декоратор, измеряющий каждый вызов функции
+
+        Решение принимается при импорте: без трассировки функция
+        возвращается как есть и не получает лишнего уровня вызова.
+
+        :param name: Имя участка
+        :param cat: Категория
+        """
+        def decorate(func: F) -> F:
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                start_ns = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, cat, start_ns, time.perf_counter_ns() - start_ns)
+
+            return wrapper  # type: ignore[return-value]
+        return decorate
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """
+        Преобразует буфер в формат Chrome trace events
+
+        :return: Словарь для chrome://tracing и Perfetto
+        """
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': (start_ns - self._origin_ns) / 1000,
+                'dur': duration_ns / 1000,
+                'pid': pid,
+                'tid': tid
+            }
+            for name, cat, start_ns, duration_ns, tid in list(self.spans)
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Записывает буфер в файл
+
+        :param path: Путь к файлу (по умолчанию TRACE["output"])
+        :return: Путь к файлу или None, если трассировка выключена
+        """
+        if not self.enabled:
+            return None
+        path = path or TRACE["output"]
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome(), f)
+        return path
+
+    def clear(self) -> None:
+        """Очищает буфер"""
+        self.spans.clear()
+
+
+# Общий трассировщик приложения
+tracer = Tracer(TRACE["enabled"] or bool(os.environ.get(TRACE["env_var"])))
+traced = tracer.traced
+span = tracer.span
@@ -0,0 +1,245 @@
+"""
+Модуль с двоичным журналом попыток фиксированного размера
+"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import uuid
+from typing import Any, Dict, Iterator, Union
+from src.utils.settings import TRIALS
+from src.utils.trial_store import TrialRecord, TrialSink
+
+try:
+    import numpy as np
+except ImportError:  # numpy не обязателен: столбцы отдаются как memoryview
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RTLG"
+# Версия 2 хранит профиль в байтах, которые в версии 1 были нулевым
+# выравниванием, поэтому файлы версии 1 читаются как профиль 0
+VERSION = 2
+
+# Заголовок: сигнатура, версия, размер записи, резерв
+HEADER = struct.Struct("<4sHH8x")
+
+# Запись: время (d), сессия (16s), x, y, реакция, сырое время, очередь,
+# ошибка появления (6f), очки (h), режим, сложность, флаг задержки (3B),
+# профиль (H).
+# Каждое поле выровнено по своему размеру, а размер записи кратен 8,
+# поэтому столбец - это срез memoryview с шагом, без разбора записей.
+RECORD = struct.Struct("<d16s6fh3BxH")
+
+# Поле -> (код формата, смещение в записи)
+COLUMNS = {
+    'timestamp': ('d', 0),
+    'x': ('f', 24),
+    'y': ('f', 28),
+    'reaction_ms': ('f', 32),
+    'raw_ms': ('f', 36),
+    'queue_delay_ms': ('f', 40),
+    'onset_error_ms': ('f', 44),
+    'points': ('h', 48),
+    'mode': ('B', 50),
+    'difficulty': ('B', 51),
+    'lagged': ('B', 52),
+    'profile_id': ('H', 54)
+}
+
+# Коды режимов и сложностей; новые значения добавляются только в конец
+MODE_CODES = ("color", "shape", "sound", "multi")
+DIFFICULTY_CODES = ("easy", "medium", "hard")
+# Профиль хранится в поле H
+MAX_PROFILE_ID = 0xFFFF
+_UNKNOWN = 255
+
+if np is not None:
+    # Столбцы и идентификатор сессии (16 байт) для структурированного массива
+    DTYPE = np.dtype({
+        'names': list(COLUMNS) + ['session'],
+        'formats': ['<' + code for code, _ in COLUMNS.values()] + ['V16'],
+        'offsets': [offset for _, offset in COLUMNS.values()] + [8],
+        'itemsize': RECORD.size
+    })
+
+
+def _code(table: tuple, value: str) -> int:
+    """Код строки по таблице"""
+    try:
+        return table.index(value)
+    except ValueError:
+        return _UNKNOWN
+
+
+def _session_bytes(session_id: str) -> bytes:
+    """Идентификатор сессии в 16 байтах"""
+    try:
+        return uuid.UUID(hex=session_id).bytes
+    except ValueError:
+        return session_id.encode("utf-8")[:16]
+
+
+class BinaryTrialLog(TrialSink):
+    def __init__(self, path: str = TRIALS["log_file"],
+                 buffer_size: int = TRIALS["buffer_size"]):
+        """
+        Инициализация журнала
+
+        Файл только дополняется записями по RECORD.size байт. Запись идет
+        через буфер в памяти, на диск он сбрасывается при заполнении и в
+        flush(). Неполная запись в конце файла (после сбоя) отбрасывается
+        при открытии.
+
+        :param path: Путь к файлу
+        :param buffer_size: Размер буфера записи, байт
+        """
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, 'r+b') as f:
+                if _check_header(f.read(HEADER.size)) < VERSION:
+                    # Формат записей совместим: достаточно обновить версию
+                    f.seek(0)
+                    f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+                size = os.fstat(f.fileno()).st_size
+                whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+                if whole != size:
+                    f.truncate(whole)
+        self._file = open(path, 'ab', buffering=buffer_size)
+        if not exists:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def append(self, record: TrialRecord) -> None:
+        """Добавляет попытку в буфер записи"""
+        if not 0 <= record.profile_id <= MAX_PROFILE_ID:
+            logger.warning("profile id %r does not fit the trial log, trial skipped",
+                           record.profile_id)
+            return
+        self._file.write(RECORD.pack(
+            record.timestamp,
+            _session_bytes(record.session_id),
+            record.x, record.y,
+            record.reaction_ms, record.raw_ms,
+            record.queue_delay_ms, record.onset_error_ms,
+            max(-32768, min(32767, record.points)),
+            _code(MODE_CODES, record.mode),
+            _code(DIFFICULTY_CODES, record.difficulty),
+            1 if record.lagged else 0,
+            record.profile_id
+        ))
+
+    def flush(self) -> None:
+        """Сбрасывает буфер записи в файл"""
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Сбрасывает буфер и закрывает файл"""
+        if not self._file.closed:
+            self._file.close()
+
+
+def _check_header(data: bytes) -> int:
+    """Проверяет заголовок журнала и возвращает его версию"""
+    if len(data) < HEADER.size:
+        raise ValueError("Файл журнала попыток поврежден")
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Файл не является журналом попыток")
+    if not 1 <= version <= VERSION or record_size != RECORD.size:
+        raise ValueError(f"Неподдерживаемая версия журнала попыток: {version}")
+    return version
+
+
+class TrialLogReader:
+    def __init__(self, path: str = TRIALS["log_file"]):
+        """
+        Открывает журнал для чтения через mmap
+
+        Записи не разбираются: столбцы - это представления отображенного
+        файла (массивы NumPy, если он установлен, иначе memoryview со
+        срезом по шагу записи). Неполная запись в конце не учитывается.
+
+        :param path: Путь к файлу
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        _check_header(self._file.read(HEADER.size))
+        self.count = (size - HEADER.size) // RECORD.size
+        self._mmap = None
+        self._view = memoryview(b"")
+        if self.count:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            end = HEADER.size + self.count * RECORD.size
+            self._view = memoryview(self._mmap)[HEADER.size:end]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "TrialLogReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def records(self) -> Any:
+        """Все записи как структурированный массив NumPy (без копирования)"""
+        if np is None:
+            raise RuntimeError("Для records() нужен NumPy")
+        return np.frombuffer(self._view, dtype=DTYPE, count=self.count)
+
+    def column(self, name: str) -> Union[memoryview, Any]:
+        """
+        Возвращает столбец без копирования
+
+        :param name: Имя поля из COLUMNS
+        :return: Массив NumPy или memoryview
+        """
+        if np is not None:
+            return self.records()[name]
+        if sys.byteorder != "little":
+            raise RuntimeError("Столбцы без NumPy доступны только на little-endian")
+        code, offset = COLUMNS[name]
+        width = struct.calcsize(code)
+        step = RECORD.size // width
+        return self._view.cast(code)[offset // width::step]
+
+    def columns(self) -> Dict[str, Union[memoryview, Any]]:
+        """Все числовые столбцы по именам"""
+        return {name: self.column(name) for name in COLUMNS}
+
+    def record(self, index: int) -> TrialRecord:
+        """Разбирает одну запись"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        (timestamp, session, x, y, reaction_ms, raw_ms, queue_delay_ms,
+         onset_error_ms, points, mode, difficulty, lagged, profile_id) = RECORD.unpack_from(
+            self._view, index * RECORD.size
+        )
+        return TrialRecord(
+            timestamp, uuid.UUID(bytes=session).hex,
+            MODE_CODES[mode] if mode < len(MODE_CODES) else "",
+            DIFFICULTY_CODES[difficulty] if difficulty < len(DIFFICULTY_CODES) else "",
+            x, y, reaction_ms, raw_ms, queue_delay_ms, onset_error_ms,
+            bool(lagged), points, profile_id
+        )
+
+    def __iter__(self) -> Iterator[TrialRecord]:
+        for index in range(self.count):
+            yield self.record(index)
+
+    def close(self) -> None:
+        """
+        Освобождает отображение и закрывает файл
+
+        Полученные столбцы к этому моменту должны быть удалены.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
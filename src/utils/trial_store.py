@@ -0,0 +1,396 @@
+"""
+Модуль с хранилищем истории попыток
+"""
+import logging
+import queue
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from src.utils.settings import TRIALS
+
+logger = logging.getLogger(__name__)
+
+
+class TrialRecord:
+    """Одна попытка для хранилища"""
+    __slots__ = ("timestamp", "session_id", "mode", "difficulty", "x", "y",
+                 "reaction_ms", "raw_ms", "queue_delay_ms", "onset_error_ms",
+                 "lagged", "points", "profile_id")
+
+    FIELDS = __slots__
+
+    def __init__(self, timestamp: float, session_id: str, mode: str,
+                 difficulty: str, x: float, y: float, reaction_ms: float,
+                 raw_ms: float, queue_delay_ms: float, onset_error_ms: float,
+                 lagged: bool, points: int, profile_id: int = 0):
+        """
+        :param timestamp: Время попытки, секунды эпохи Unix
+        :param session_id: Идентификатор игровой сессии
+        :param mode: Режим игры
+        :param difficulty: Уровень сложности
+        :param x: Координата центра стимула
+        :param y: Координата центра стимула
+        :param reaction_ms: Время реакции по моменту клика, мс
+        :param raw_ms: Время реакции по моменту обработки клика, мс
+        :param queue_delay_ms: Задержка клика в очереди событий, мс
+        :param onset_error_ms: Задержка от постановки стимула до отрисовки, мс
+        :param lagged: Была ли попытка при высокой задержке цикла событий
+        :param points: Начисленные очки
+        :param profile_id: Идентификатор профиля игрока
+        """
+        self.timestamp = timestamp
+        self.session_id = session_id
+        self.mode = mode
+        self.difficulty = difficulty
+        self.x = x
+        self.y = y
+        self.reaction_ms = reaction_ms
+        self.raw_ms = raw_ms
+        self.queue_delay_ms = queue_delay_ms
+        self.onset_error_ms = onset_error_ms
+        self.lagged = lagged
+        self.points = points
+        self.profile_id = profile_id
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Значения полей в порядке FIELDS"""
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Значения полей по именам"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class TrialSink(ABC):
+    """
+    Приемник попыток
+
+    append() вызывается в обработчике клика и не должен обращаться к
+    диску: реализации копят попытки и записывают их пакетами.
+    """
+
+    @abstractmethod
+    def append(self, record: TrialRecord) -> None:
+        """Добавляет попытку"""
+
+    def flush(self) -> None:
+        """Передает накопленные попытки на запись (например, в конце сессии)"""
+
+    def sync(self) -> None:
+        """Записывает накопленные попытки и ждет окончания записи"""
+        self.flush()
+
+    def close(self) -> None:
+        """Записывает оставшиеся попытки и освобождает ресурсы"""
+
+
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    reaction_ms REAL NOT NULL,
+    raw_ms REAL NOT NULL,
+    queue_delay_ms REAL NOT NULL,
+    onset_error_ms REAL NOT NULL,
+    lagged INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    profile_id INTEGER NOT NULL DEFAULT 0
+);
+-- Перцентили по режиму: поиск по (mode, difficulty), значения уже упорядочены
+CREATE INDEX IF NOT EXISTS trials_mode_rt ON trials (mode, difficulty, reaction_ms);
+-- Тренды по дням и выборки за период
+CREATE INDEX IF NOT EXISTS trials_mode_time ON trials (mode, timestamp);
+CREATE INDEX IF NOT EXISTS trials_session ON trials (session_id);
+CREATE INDEX IF NOT EXISTS trials_profile_time ON trials (profile_id, timestamp);
+"""
+
+# Переходы схемы: версия -> операторы, приводящие базу к следующей версии
+_MIGRATIONS = {
+    1: (
+        "ALTER TABLE trials ADD COLUMN profile_id INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS trials_profile_time ON trials (profile_id, timestamp)"
+    )
+}
+
+# Пакет попыток для вставки одной транзакцией
+_Batch = List[Tuple[Any, ...]]
+
+_INSERT = "INSERT INTO trials ({}) VALUES ({})".format(
+    ", ".join(TrialRecord.FIELDS), ", ".join("?" * len(TrialRecord.FIELDS))
+)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Открывает базу попыток и создает схему при необходимости
+
+    :param path: Путь к файлу базы
+    :return: Соединение
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # В режиме WAL NORMAL не теряет целостность, а запись не ждет fsync
+    connection.execute("PRAGMA synchronous=NORMAL")
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version < _SCHEMA_VERSION:
+        if version == 0:
+            statements = [s for s in _SCHEMA.split(";") if s.strip()]
+        else:
+            statements = [
+                s for step in range(version, _SCHEMA_VERSION) for s in _MIGRATIONS[step]
+            ]
+        _migrate(connection, statements)
+    return connection
+
+
+def _migrate(connection: sqlite3.Connection, statements: Sequence[str]) -> None:
+    """
+    Выполняет операторы схемы и записывает ее версию одной транзакцией
+
+    executescript() фиксирует каждый оператор отдельно, поэтому операторы
+    выполняются по одному между явными BEGIN и COMMIT. Добавление уже
+    существующего столбца пропускается, и прерванный переход можно
+    повторить.
+    """
+    isolation_level = connection.isolation_level
+    connection.isolation_level = None
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(trials)")}
+            for statement in statements:
+                words = statement.split()
+                if words[:5] == ["ALTER", "TABLE", "trials", "ADD", "COLUMN"] \
+                        and words[5] in columns:
+                    continue
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    finally:
+        connection.isolation_level = isolation_level
+
+
+class SqliteTrialStore(TrialSink):
+    def __init__(self, path: str = TRIALS["db_file"],
+                 batch_size: int = TRIALS["batch_size"]):
+        """
+        Инициализация хранилища
+
+        Попытки копятся в памяти и передаются пакетами по batch_size (или
+        в конце сессии) в отдельный поток записи. Поток сам открывает
+        базу, поэтому создание схемы не задерживает запуск игры. Запросы
+        выполняются через отдельное соединение: в режиме WAL чтение не
+        блокируется записью.
+
+        Если базу открыть не удалось, попытки не копятся: они
+        отбрасываются с одним предупреждением в журнале, а close()
+        сообщает, сколько попыток потеряно.
+
+        :param path: Путь к файлу базы
+        :param batch_size: Размер пакета вставки
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self._failed = False
+        self._pending: _Batch = []
+        # Пакеты попыток, отметки sync() и None для остановки потока
+        self._batches: "queue.SimpleQueue[Union[_Batch, threading.Event, None]]" = queue.SimpleQueue()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trial-store", daemon=True)
+        self._thread.start()
+
+    def append(self, record: TrialRecord) -> None:
+        """Добавляет попытку в текущий пакет"""
+        if self._failed:
+            self._drop(1)
+            return
+        self._pending.append(record.as_tuple())
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Передает текущий пакет потоку записи"""
+        if not self._pending:
+            return
+        if self._failed:
+            self._drop(len(self._pending))
+        else:
+            self._batches.put(self._pending)
+        self._pending = []
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """
+        Передает текущий пакет и ждет, пока поток записи его зафиксирует
+
+        Нужен перед чтением базы через другое соединение (выгрузка,
+        аналитика): flush() только ставит пакет в очередь.
+
+        :param timeout: Предельное время ожидания, с
+        :return: True, если все переданные попытки записаны
+        """
+        self.flush()
+        if self._failed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._batches.put(done)
+        return done.wait(timeout) and not self._failed
+
+    def _drop(self, count: int) -> None:
+        """Учитывает попытки, которые некуда записать"""
+        if not self.dropped:
+            logger.warning("trial store %s is unavailable, trials are dropped", self.path)
+        self.dropped += count
+
+    def _drain(self) -> None:
+        """Отбрасывает пакеты, оставшиеся в очереди"""
+        while True:
+            try:
+                batch = self._batches.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(batch, threading.Event):
+                batch.set()
+            elif batch:
+                self._drop(len(batch))
+
+    def close(self) -> None:
+        """Записывает оставшиеся попытки и останавливает поток"""
+        if self._thread.is_alive():
+            self.flush()
+            self._batches.put(None)
+            self._thread.join()
+        if self._failed:
+            self.flush()
+            self._drain()
+            if self.dropped:
+                logger.error("trial store %s: %d trials were not saved",
+                             self.path, self.dropped)
+
+    def _run(self) -> None:
+        """Поток записи: вставляет пакеты одной транзакцией"""
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error:
+            logger.exception("failed to open trial store %s", self.path)
+            self._failed = True
+            self._drain()
+            return
+        finally:
+            self._ready.set()
+        try:
+            while True:
+                batch = self._batches.get()
+                if batch is None:
+                    return
+                if isinstance(batch, threading.Event):
+                    batch.set()
+                    continue
+                started = time.perf_counter()
+                try:
+                    with connection:
+                        connection.executemany(_INSERT, batch)
+                except sqlite3.Error:
+                    logger.exception("failed to store %d trials", len(batch))
+                    continue
+                self.written += len(batch)
+                logger.debug("stored %d trials in %.1f ms", len(batch),
+                             (time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Выполняет запрос на чтение через отдельное соединение"""
+        self._ready.wait()
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def count(self, mode: Optional[str] = None) -> int:
+        """Количество сохраненных попыток (всех или режима)"""
+        if mode is None:
+            return self._query("SELECT COUNT(*) FROM trials")[0][0]
+        return self._query("SELECT COUNT(*) FROM trials WHERE mode = ?", (mode,))[0][0]
+
+    def percentiles(self, mode: str, difficulty: str,
+                    percents: Sequence[float] = (50, 90, 99)) -> Dict[float, Optional[float]]:
+        """
+        Перцентили времени реакции для режима и сложности
+
+        Значения читаются по порядку из индекса (mode, difficulty,
+        reaction_ms) без сортировки таблицы, одним проходом, который
+        останавливается на самом большом нужном смещении.
+
+        :return: Словарь перцентиль -> время реакции, мс
+        """
+        where = "mode = ? AND difficulty = ?"
+        total = self._query(
+            f"SELECT COUNT(*) FROM trials WHERE {where}", (mode, difficulty)
+        )[0][0]
+        if not total:
+            return {p: None for p in percents}
+        offsets = {
+            p: min(total - 1, max(0, int(round(p / 100 * total)) - 1))
+            for p in percents
+        }
+        wanted = set(offsets.values())
+        values: Dict[int, float] = {}
+        self._ready.wait()
+        connection = sqlite3.connect(self.path)
+        try:
+            cursor = connection.execute(
+                f"SELECT reaction_ms FROM trials WHERE {where} "
+                "ORDER BY reaction_ms LIMIT ?",
+                (mode, difficulty, max(wanted) + 1)
+            )
+            for index, (reaction_ms,) in enumerate(cursor):
+                if index in wanted:
+                    values[index] = reaction_ms
+        finally:
+            connection.close()
+        return {p: values[offset] for p, offset in offsets.items()}
+
+    def daily_trend(self, mode: str, since: float = 0.0) -> List[Tuple[str, int, float]]:
+        """
+        Среднее время реакции по дням
+
+        :param mode: Режим игры
+        :param since: Начало периода, секунды эпохи Unix
+        :return: Список (дата, количество попыток, среднее время, мс)
+        """
+        return self._query(
+            "SELECT date(timestamp, 'unixepoch', 'localtime') AS day, "
+            "COUNT(*), AVG(reaction_ms) FROM trials "
+            "WHERE mode = ? AND timestamp >= ? GROUP BY day ORDER BY day",
+            (mode, since)
+        )
+
+
+def open_trial_sink(backend: str = TRIALS["backend"]) -> TrialSink:
+    """
+    Создает хранилище попыток по настройке
+
+    :param backend: "sqlite" или "binary"
+    :return: Хранилище попыток
+    """
+    if backend == "binary":
+        from src.utils.trial_log import BinaryTrialLog
+        return BinaryTrialLog()
+    if backend == "sqlite":
+        return SqliteTrialStore()
+    raise ValueError(f"Неизвестное хранилище попыток: {backend}")